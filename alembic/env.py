@@ -19,7 +19,7 @@ from app.modules.platform.models.application import RestaurantApplication
 from app.modules.tables.models.table import Table
 from app.modules.tables.models.reservation import Reservation
 from app.modules.tables.models.waitlist import ReservationWaitlist
-from app.modules.orders.models.order import Order
+from app.modules.orders.models.order import Order, OrderNumberSequence
 from app.modules.orders.models.order_item import OrderItem, OrderItemModifier
 from app.modules.orders.models.payment import Payment
 
@@ -1,14 +1,33 @@
+import asyncio
+import hmac
+import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
+from app.core import metrics
 from app.core.config import settings
+from app.core.idempotency import idempotency_store, idempotent_paths
+from app.core.middleware import (
+    IdempotencyMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
+)
+from app.core.profiling import route_latency, slow_request_sampler
+from app.shared.auth.passwords import PasswordHashingBusy, password_hasher
 from app.shared.cache import cache_service
+from app.shared.database.session import read_session
+from app.modules.orders.services.kitchen_service import KitchenService
 from app.modules.auth.routes import router as auth_router, users_router
 from app.modules.menu.routes.categories import router as categories_router
 from app.modules.menu.routes.items import router as items_router, public_router as menu_public_router
 from app.modules.menu.routes.modifiers import router as modifiers_router
 from app.modules.platform.routes.applications import router as platform_router
+from app.modules.platform.routes.cache import router as platform_cache_router
+from app.modules.platform.routes.database import router as platform_database_router
+from app.modules.platform.routes.profiling import router as platform_profiling_router
 from app.modules.setup.routes import router as setup_router
 from app.modules.tables.routes.tables import router as tables_router
 from app.modules.tables.routes.reservations import router as reservations_router
@@ -21,15 +40,45 @@ from app.modules.orders.routes.kitchen import router as kitchen_router
 from app.modules.orders.routes.payments import router as payments_router
 from app.modules.orders.routes.qr_orders import router as qr_orders_router
 
+logger = logging.getLogger(__name__)
+
+
+async def refresh_kitchen_queue_depth() -> None:
+    """Set the kitchen queue depth gauge from one cross-tenant count on the replica."""
+    async for session in read_session():
+        for order_status, depth in (await KitchenService(session).get_queue_depth()).items():
+            metrics.kitchen_queue_depth.labels(order_status).set(depth)
+
+
+async def _refresh_kitchen_queue_depth_forever(interval: float) -> None:
+    # Runs on a timer rather than per scrape, so scrape frequency never turns into database load
+    while True:
+        try:
+            await refresh_kitchen_queue_depth()
+        except Exception as e:
+            logger.warning(f"Could not refresh kitchen queue depth: {e}")
+        await asyncio.sleep(interval)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan."""
     # Startup
     await cache_service.initialize()
+    queue_depth_task = None
+    if settings.METRICS_ENABLED and metrics.PROMETHEUS_AVAILABLE:
+        if not settings.METRICS_TOKEN:
+            logger.warning("METRICS_TOKEN is not set: /metrics is unauthenticated and must not be publicly reachable")
+        queue_depth_task = asyncio.create_task(
+            _refresh_kitchen_queue_depth_forever(settings.METRICS_QUEUE_DEPTH_INTERVAL)
+        )
     yield
     # Shutdown
+    if queue_depth_task is not None:
+        queue_depth_task.cancel()
     await cache_service.close()
+    password_hasher.shutdown()
+    metrics.mark_worker_dead()
 
 
 def create_application() -> FastAPI:
@@ -43,6 +92,16 @@ def create_application() -> FastAPI:
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
     )
     
+    # Replay stored responses to retried order, payment and booking POSTs.
+    # Added first so it sits inside CORS: replays get fresh CORS headers.
+    if settings.IDEMPOTENCY_ENABLED:
+        app.add_middleware(
+            IdempotencyMiddleware,
+            store=idempotency_store,
+            paths=idempotent_paths(settings.API_V1_STR),
+            wait_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+        )
+    
     # Add CORS middleware with explicit origins to allow credentials
     app.add_middleware(
         CORSMiddleware,
@@ -58,6 +117,38 @@ def create_application() -> FastAPI:
         expose_headers=["*"],
     )
     
+    # Opt-in SQL statement counting and N+1 detection
+    if settings.QUERY_STATS_ENABLED:
+        app.add_middleware(
+            QueryStatsMiddleware,
+            emit_headers=settings.QUERY_STATS_HEADERS,
+            log_threshold=settings.QUERY_STATS_LOG_THRESHOLD,
+            n_plus_one_threshold=settings.QUERY_STATS_N_PLUS_ONE_THRESHOLD,
+        )
+    
+    # Opt-in per-route latency histograms and slow request stack sampling
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(
+            ProfilingMiddleware,
+            latency=route_latency,
+            sampler=slow_request_sampler,
+        )
+    
+    # Prometheus request count and latency per route
+    metrics_enabled = settings.METRICS_ENABLED and metrics.PROMETHEUS_AVAILABLE
+    if metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+    
+    # Login, user creation and application approval all hash on the bounded
+    # pool; a saturated pool means "retry shortly", not a server error
+    @app.exception_handler(PasswordHashingBusy)
+    async def password_hashing_busy(request: Request, exc: PasswordHashingBusy):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": str(exc)},
+            headers={"Retry-After": "1"},
+        )
+    
     # Mount static files
     if settings.upload_path.exists():
         app.mount("/uploads", StaticFiles(directory=str(settings.upload_path)), name="uploads")
@@ -71,6 +162,9 @@ def create_application() -> FastAPI:
     app.include_router(modifiers_router, prefix=settings.API_V1_STR)
     app.include_router(menu_public_router, prefix=settings.API_V1_STR)
     app.include_router(platform_router, prefix=settings.API_V1_STR)
+    app.include_router(platform_cache_router, prefix=settings.API_V1_STR)
+    app.include_router(platform_database_router, prefix=settings.API_V1_STR)
+    app.include_router(platform_profiling_router, prefix=settings.API_V1_STR)
     
     # Phase 2: Table and Reservation Management
     app.include_router(tables_router, prefix=settings.API_V1_STR)
@@ -85,11 +179,17 @@ def create_application() -> FastAPI:
     app.include_router(payments_router, prefix=settings.API_V1_STR)
     app.include_router(qr_orders_router, prefix=settings.API_V1_STR)
     
-    # Add health check endpoint
-    @app.get("/health")
-    async def health_check():
-        """Health check endpoint."""
-        return {"status": "healthy", "service": "Restaurant Management System"}
+    if metrics_enabled:
+        @app.get("/metrics", include_in_schema=False)
+        async def prometheus_metrics(request: Request):
+            """Prometheus exposition, aggregated across workers in multiprocess mode."""
+            if settings.METRICS_TOKEN and not hmac.compare_digest(
+                request.headers.get("authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+            ):
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+            
+            # Kitchen queue depth comes from the lifespan refresher, never from the scrape itself
+            return Response(metrics.render_latest(), media_type=metrics.CONTENT_TYPE_LATEST)
     
     # Cache lifecycle is now handled by lifespan context manager
     
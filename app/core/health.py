@@ -0,0 +1,148 @@
+"""
+Readiness checks for load balancer and orchestrator probes.
+
+Readiness covers three checks:
+- a timed ``SELECT 1`` through the connection pool
+- a Redis ping
+- pool saturation
+
+A worker whose pool is exhausted reports not ready, so the load balancer
+routes around it instead of queueing requests until they time out. In
+that state the database probe is skipped, because it would only queue
+behind the same requests.
+
+The report is cached for ``HEALTH_CACHE_TTL`` seconds, and concurrent
+probes share one in-flight check, so probing adds no meaningful load.
+Liveness does not look at dependencies at all. Restarting a worker does
+not fix a database outage.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.shared.cache import cache_service
+from app.shared.database.pool import get_pool_stats
+from app.shared.database.session import engine
+
+
+class HealthChecker:
+    """Dependency checks with a short-lived cached report."""
+
+    def __init__(
+        self,
+        engine: Any,
+        cache: Any,
+        cache_ttl: float = 2.0,
+        db_timeout: float = 2.0,
+        redis_timeout: float = 1.0,
+        max_pool_saturation: float = 1.0,
+        redis_required: bool = False,
+    ):
+        self.engine = engine
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.db_timeout = db_timeout
+        self.redis_timeout = redis_timeout
+        self.max_pool_saturation = max_pool_saturation
+        self.redis_required = redis_required
+        self._report: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._inflight: Optional[asyncio.Future] = None
+
+    async def readiness(self) -> Dict[str, Any]:
+        """The cached report, refreshed by at most one check at a time."""
+        if self._report is not None and time.monotonic() - self._checked_at < self.cache_ttl:
+            return {**self._report, "cached": True}
+
+        loop = asyncio.get_running_loop()
+        if self._inflight is None or self._inflight.done() or self._inflight.get_loop() is not loop:
+            self._inflight = asyncio.ensure_future(self._run_checks())
+        return await asyncio.shield(self._inflight)
+
+    def invalidate(self) -> None:
+        self._report = None
+
+    async def _run_checks(self) -> Dict[str, Any]:
+        pool = self.check_pool()
+        if pool["status"] == "exhausted":
+            database = {"status": "skipped", "reason": "pool exhausted"}
+            redis = await self.check_redis()
+        else:
+            database, redis = await asyncio.gather(self.check_database(), self.check_redis())
+
+        ready = (
+            database["status"] == "up"
+            and pool["status"] == "up"
+            and (redis["status"] != "down" or not self.redis_required)
+        )
+        self._report = {
+            "status": "ready" if ready else "not_ready",
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "checks": {"database": database, "pool": pool, "redis": redis},
+        }
+        self._checked_at = time.monotonic()
+        return {**self._report, "cached": False}
+
+    async def check_database(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._select_one(), timeout=self.db_timeout)
+        except asyncio.TimeoutError:
+            return {"status": "down", "error": f"no response within {self.db_timeout}s"}
+        except Exception as e:
+            return {"status": "down", "error": str(e)}
+        return {"status": "up", "latency_ms": _elapsed_ms(started)}
+
+    async def _select_one(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check_redis(self) -> Dict[str, Any]:
+        if not self.cache.enabled:
+            return {"status": "disabled"}
+        if self.cache.redis_client is None:
+            return {"status": "down", "error": "not connected, serving from memory cache"}
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.cache.redis_client.ping(), timeout=self.redis_timeout)
+        except asyncio.TimeoutError:
+            return {"status": "down", "error": f"no response within {self.redis_timeout}s"}
+        except Exception as e:
+            return {"status": "down", "error": str(e)}
+        return {"status": "up", "latency_ms": _elapsed_ms(started)}
+
+    def check_pool(self) -> Dict[str, Any]:
+        stats = get_pool_stats(self.engine)
+        if "saturation" not in stats:
+            # Pools without a fixed size (e.g. SQLite) cannot be exhausted
+            return {"status": "up", "pool": stats["pool"]}
+
+        saturation = stats["saturation"]
+        return {
+            "status": "exhausted" if saturation >= self.max_pool_saturation else "up",
+            "saturation": saturation,
+            "checked_out": stats["checked_out"],
+            "capacity": stats["size"] + max(stats["max_overflow"], 0),
+            "timeouts": stats["timeouts"],
+        }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+health_checker = HealthChecker(
+    engine,
+    cache_service,
+    cache_ttl=settings.HEALTH_CACHE_TTL,
+    db_timeout=settings.HEALTH_DB_TIMEOUT,
+    redis_timeout=settings.HEALTH_REDIS_TIMEOUT,
+    max_pool_saturation=settings.HEALTH_MAX_POOL_SATURATION,
+    redis_required=settings.HEALTH_REDIS_REQUIRED,
+)
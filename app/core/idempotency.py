@@ -0,0 +1,189 @@
+"""
+Idempotency-Key support for retry-prone POST endpoints.
+
+Tablets and QR clients on flaky Wi-Fi retry ``POST`` requests whose
+response they never saw. A client that sends an ``Idempotency-Key``
+header gets the first response replayed for every retry of the same
+request, for ``IDEMPOTENCY_TTL`` seconds:
+- the stored response is served straight from the cache, before routing,
+  so a replay costs no auth lookup, no pricing and no database round trip
+- a retry arriving while the first attempt is still running waits for its
+  response instead of running the write a second time
+- reusing a key with a different body is rejected with 422
+
+Keys are scoped to the path and the caller's ``Authorization`` header, so
+one client can never replay another client's response. QR orders and public
+bookings carry no ``Authorization``; there the key is scoped to the request
+fingerprint instead. Their bodies name the QR session and their paths the
+restaurant, so a response is only replayed for a byte-identical request
+from the same session or booking form, and a reused key with a different
+body simply runs as a new request. Responses with a 5xx status are not
+stored, so the request can be retried for real.
+
+Responses live in the shared cache (Redis, or the per-worker memory
+fallback). In-flight locks are a Redis ``SET NX`` with an expiry, or a
+per-worker lock table when Redis is unavailable.
+"""
+
+import base64
+import hashlib
+import logging
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+from app.core.config import settings
+from app.shared.cache import cache_service
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+# Cache key prefix for stored responses; locks use "<prefix>_lock"
+KEY_PREFIX = "idempotency"
+
+# Delete the lock only while it still holds our token
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def idempotent_paths(api_prefix: str) -> List[Pattern[str]]:
+    """POST endpoints that honour ``Idempotency-Key``."""
+    return [
+        re.compile(rf"^{re.escape(api_prefix)}/orders/?$"),
+        re.compile(rf"^{re.escape(api_prefix)}/orders/batch/import$"),
+        re.compile(rf"^{re.escape(api_prefix)}/qr-orders/place-order$"),
+        re.compile(rf"^{re.escape(api_prefix)}/payments/orders/[^/]+/pay$"),
+        re.compile(rf"^{re.escape(api_prefix)}/public/reservations/[^/]+/book$"),
+    ]
+
+
+def request_fingerprint(method: str, path: str, query_string: bytes, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query_string, body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def scoped_key(path: str, authorization: bytes, idempotency_key: str, fingerprint: str) -> str:
+    """
+    Cache key for one caller's use of ``idempotency_key`` on ``path``.
+
+    Anonymous callers are told apart by ``fingerprint``, the hash of the
+    whole request, since there is no credential to scope by.
+    """
+    caller = authorization or f"anonymous:{fingerprint}".encode()
+    digest = hashlib.sha256()
+    for part in (path.encode(), caller, idempotency_key.encode()):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return f"{KEY_PREFIX}:{digest.hexdigest()}"
+
+
+class StoredResponse:
+    """A finished response kept for replay."""
+
+    def __init__(self, fingerprint: str, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.fingerprint = fingerprint
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "status": self.status,
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in self.headers],
+            "body": base64.b64encode(self.body).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StoredResponse":
+        return cls(
+            fingerprint=data["fingerprint"],
+            status=data["status"],
+            headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in data["headers"]],
+            body=base64.b64decode(data["body"]),
+        )
+
+
+class IdempotencyStore:
+    """Stored responses and in-flight locks, keyed by ``scoped_key``."""
+
+    def __init__(self, cache: Any, ttl: int = 86400, lock_ttl: float = 30.0):
+        self.cache = cache
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        # Used when Redis is unavailable: key -> (token, expires at)
+        self._local_locks: Dict[str, Tuple[str, float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache.enabled
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        data = await self.cache.get(key)
+        return StoredResponse.from_dict(data) if data else None
+
+    async def save(self, key: str, response: StoredResponse) -> None:
+        await self.cache.set(key, response.to_dict(), ttl=self.ttl)
+
+    async def acquire(self, key: str) -> Optional[str]:
+        """
+        Take the in-flight lock for ``key``; returns its token, or None if held.
+
+        If Redis fails, the request goes ahead unlocked rather than failing.
+        """
+        token = uuid.uuid4().hex
+        redis_client = self.cache.redis_client
+        if redis_client is not None:
+            try:
+                acquired = await redis_client.set(
+                    f"{KEY_PREFIX}_lock:{key}", token, nx=True, px=int(self.lock_ttl * 1000)
+                )
+            except Exception as e:
+                logger.warning(f"Idempotency lock for {key} unavailable: {e}")
+                return token
+            return token if acquired else None
+
+        now = time.monotonic()
+        held = self._local_locks.get(key)
+        if held is not None and held[1] > now:
+            return None
+        self._local_locks[key] = (token, now + self.lock_ttl)
+        return token
+
+    async def release(self, key: str, token: str) -> None:
+        redis_client = self.cache.redis_client
+        if redis_client is not None:
+            try:
+                await redis_client.eval(_RELEASE_SCRIPT, 1, f"{KEY_PREFIX}_lock:{key}", token)
+            except Exception as e:
+                # The lock expires on its own after lock_ttl
+                logger.warning(f"Idempotency lock release for {key} failed: {e}")
+            return
+
+        held = self._local_locks.get(key)
+        if held is not None and held[0] == token:
+            del self._local_locks[key]
+        self._drop_expired_locks()
+
+    def _drop_expired_locks(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._local_locks.items() if expires_at <= now]
+        for key in expired:
+            del self._local_locks[key]
+
+
+idempotency_store = IdempotencyStore(
+    cache_service,
+    ttl=settings.IDEMPOTENCY_TTL,
+    lock_ttl=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+)
@@ -0,0 +1,159 @@
+"""
+Prometheus metrics for the ``/metrics`` exposition endpoint.
+
+Covers request rate and latency per route, database pool gauges, cache
+events per key prefix (hit ratio is ``hits / (hits + misses)`` in PromQL)
+and domain counters for orders, reservations, payments and the kitchen
+queue.
+
+With several uvicorn/gunicorn workers, set ``PROMETHEUS_MULTIPROC_DIR`` to
+an empty directory shared by the workers before they start. Every worker
+then writes its samples there, and ``/metrics`` aggregates all of them
+whichever worker serves the scrape. Without it, ``/metrics`` reports only
+the process that answers.
+
+``prometheus_client`` is optional (the ``monitoring`` extra); without it
+every metric is a no-op and the endpoint is not mounted.
+"""
+
+import os
+from typing import Any, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+class _NoopMetric:
+    """Stands in for every metric when prometheus_client is not installed."""
+
+    def labels(self, *args: Any, **kwargs: Any) -> "_NoopMetric":
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+def _counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Any:
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Counter(name, documentation, labelnames)
+
+
+def _histogram(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Any:
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Histogram(name, documentation, labelnames)
+
+
+def _gauge(name: str, documentation: str, labelnames: Sequence[str] = (), mode: str = "livesum") -> Any:
+    # ``mode`` decides how per-worker values combine under multiprocess mode
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Gauge(name, documentation, labelnames, multiprocess_mode=mode)
+
+
+# HTTP
+http_requests = _counter(
+    "rms_http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+http_request_duration = _histogram(
+    "rms_http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+http_requests_in_progress = _gauge(
+    "rms_http_requests_in_progress", "HTTP requests currently being served", ("method",)
+)
+
+# Database pool
+db_pool_capacity = _gauge(
+    "rms_db_pool_capacity", "Pool size plus max overflow, summed over workers", ("database",)
+)
+db_pool_in_use = _gauge(
+    "rms_db_pool_connections_in_use", "Connections checked out of the pool", ("database",)
+)
+db_pool_checkout_wait = _histogram(
+    "rms_db_pool_checkout_wait_seconds", "Time spent waiting for a pool connection"
+)
+db_pool_timeouts = _counter(
+    "rms_db_pool_checkout_timeouts_total", "Pool checkouts that timed out"
+)
+
+# Cache
+cache_events = _counter(
+    "rms_cache_events_total", "Cache hits, misses, sets, evictions etc. by key prefix", ("prefix", "event")
+)
+
+# Domain
+orders_created = _counter("rms_orders_created_total", "Orders created", ("order_type",))
+reservations_booked = _counter("rms_reservations_booked_total", "Reservations booked")
+payments_processed = _counter(
+    "rms_payments_processed_total", "Payments processed by method and outcome", ("method", "status")
+)
+payment_amount = _counter(
+    "rms_payment_amount_total", "Amount of completed payments", ("method",)
+)
+kitchen_queue_depth = _gauge(
+    "rms_kitchen_queue_depth", "Orders waiting on the kitchen, by status", ("status",), mode="mostrecent"
+)
+
+
+def instrument_engine(engine: Any, database: str) -> None:
+    """Track checked-out connections of an async engine's queue pool."""
+    pool = engine.pool
+    if not PROMETHEUS_AVAILABLE or not isinstance(pool, QueuePool):
+        return
+
+    db_pool_capacity.labels(database).set(pool.size() + max(pool._max_overflow, 0))
+    in_use = db_pool_in_use.labels(database)
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        in_use.inc()
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        in_use.dec()
+
+
+def multiprocess_enabled() -> bool:
+    return PROMETHEUS_AVAILABLE and bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def render_latest() -> bytes:
+    """Exposition text, aggregated across workers in multiprocess mode."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
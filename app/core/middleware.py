@@ -0,0 +1,281 @@
+"""
+ASGI middleware for request-level instrumentation.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Pattern
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.idempotency import (
+    IDEMPOTENCY_HEADER,
+    MAX_KEY_LENGTH,
+    IdempotencyStore,
+    StoredResponse,
+    request_fingerprint,
+    scoped_key,
+)
+from app.core.profiling import RouteLatency, SlowRequestSampler
+from app.shared.cache.metrics import track_cache_time
+from app.shared.database.query_stats import track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    Count SQL statements per request and flag likely N+1 patterns.
+
+    Adds ``X-DB-Query-Count``, ``X-DB-Query-Time-Ms`` and
+    ``X-DB-Max-Repeats`` response headers. Logs a warning when a request
+    exceeds ``log_threshold`` statements or repeats one statement
+    ``n_plus_one_threshold`` times or more.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        emit_headers: bool = True,
+        log_threshold: int = 20,
+        n_plus_one_threshold: int = 5,
+    ):
+        self.app = app
+        self.emit_headers = emit_headers
+        self.log_threshold = log_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start" and self.emit_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Query-Time-Ms"] = f"{stats.total_ms:.2f}"
+                    headers["X-DB-Max-Repeats"] = str(stats.max_repeats)
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if repeated or stats.count > self.log_threshold:
+            logger.warning(
+                f"{scope['method']} {scope['path']}: {stats.count} queries "
+                f"in {stats.total_ms:.1f} ms"
+                + "".join(f"\n  possible N+1: {count}x {statement}" for statement, count in repeated)
+            )
+
+
+def route_template(scope: Scope) -> str:
+    """Matched route path (e.g. ``/api/v1/orders/{order_id}``), bounded in cardinality."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class ProfilingMiddleware:
+    """
+    Record per-route latency split into DB, cache and handler time, and
+    stack-sample requests slower than the sampler's threshold.
+    """
+
+    def __init__(self, app: ASGIApp, latency: RouteLatency, sampler: SlowRequestSampler):
+        self.app = app
+        self.latency = latency
+        self.sampler = sampler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        request = self.sampler.start(method, scope["path"])
+        started = time.perf_counter()
+        with track_queries() as queries, track_cache_time() as cache_time:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                total_ms = (time.perf_counter() - started) * 1000
+                route = route_template(scope)
+                self.latency.observe(method, route, total_ms, queries.total_ms, cache_time.total_ms)
+                self.sampler.finish(request, route, {
+                    "total_ms": total_ms,
+                    "db_ms": queries.total_ms,
+                    "db_queries": queries.count,
+                    "cache_ms": cache_time.total_ms,
+                    "handler_ms": max(total_ms - queries.total_ms - cache_time.total_ms, 0.0),
+                })
+
+
+class MetricsMiddleware:
+    """Prometheus request count and latency per route template and status."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = metrics.http_requests_in_progress.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = route_template(scope)
+            metrics.http_request_duration.labels(method, route).observe(time.perf_counter() - started)
+            metrics.http_requests.labels(method, route, str(status_code)).inc()
+
+
+class IdempotencyMiddleware:
+    """
+    Replay the first response to POST retries carrying ``Idempotency-Key``.
+
+    Only requests whose path matches one of ``paths`` are handled. A
+    duplicate that arrives while the first request is running polls for
+    its response for up to ``wait_timeout`` seconds, then gets a 409.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore,
+        paths: List[Pattern[str]],
+        wait_timeout: float = 30.0,
+        poll_interval: float = 0.05,
+    ):
+        self.app = app
+        self.store = store
+        self.paths = paths
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or not self.store.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        if raw_key is None or not any(path.match(scope["path"]) for path in self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = raw_key.decode("latin-1").strip()
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await JSONResponse(
+                {"detail": f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"},
+                status_code=400,
+            )(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        if body is None:
+            return  # client disconnected
+        fingerprint = request_fingerprint(scope["method"], scope["path"], scope["query_string"], body)
+        key = scoped_key(scope["path"], headers.get(b"authorization", b""), idempotency_key, fingerprint)
+
+        token = None
+        deadline = time.monotonic() + self.wait_timeout
+        delay = self.poll_interval
+        while token is None:
+            stored = await self.store.get(key)
+            if stored is not None:
+                await self._replay(stored, fingerprint, scope, receive, send)
+                return
+            token = await self.store.acquire(key)
+            if token is None:
+                if time.monotonic() >= deadline:
+                    await JSONResponse(
+                        {"detail": "A request with this Idempotency-Key is still in progress"},
+                        status_code=409,
+                    )(scope, receive, send)
+                    return
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.5)
+
+        try:
+            # The first request may have finished between the lookup and the lock
+            stored = await self.store.get(key)
+            if stored is not None:
+                await self._replay(stored, fingerprint, scope, receive, send)
+                return
+
+            response: Dict[str, Any] = {"status": None, "headers": [], "body": []}
+            body_sent = False
+
+            async def receive_body() -> Message:
+                nonlocal body_sent
+                if body_sent:
+                    return await receive()
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            async def send_and_capture(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    response["status"] = message["status"]
+                    response["headers"] = list(message.get("headers", []))
+                elif message["type"] == "http.response.body":
+                    response["body"].append(message.get("body", b""))
+                await send(message)
+
+            await self.app(scope, receive_body, send_and_capture)
+
+            # 5xx responses are not kept, so the retry runs the request again
+            if response["status"] is not None and response["status"] < 500:
+                await self.store.save(key, StoredResponse(
+                    fingerprint=fingerprint,
+                    status=response["status"],
+                    headers=response["headers"],
+                    body=b"".join(response["body"]),
+                ))
+        finally:
+            await self.store.release(key, token)
+
+    async def _replay(
+        self, stored: StoredResponse, fingerprint: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if stored.fingerprint != fingerprint:
+            await JSONResponse(
+                {"detail": "Idempotency-Key was already used for a different request"},
+                status_code=422,
+            )(scope, receive, send)
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": [*stored.headers, (b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _read_body(receive: Receive) -> Optional[bytes]:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
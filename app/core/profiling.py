@@ -0,0 +1,179 @@
+"""
+Request latency profiling.
+
+``RouteLatency`` keeps per-route histograms of total latency, split into
+database time, cache time and the remaining handler time.
+``SlowRequestSampler`` captures where the event loop spends its time during
+slow requests. Once a request has run longer than the slow threshold, a
+background thread samples the event loop thread's stack at a fixed
+interval. The samples are attached to every slow request in flight when
+they are taken. Each slow request's collapsed stacks are kept in a bounded
+ring buffer for the platform profiling endpoint.
+
+Stacks that end in the event loop's selector mean the loop was idle,
+waiting on I/O such as the database or Redis. Anything else is code that
+held the loop.
+"""
+
+import itertools
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.shared.cache.metrics import LatencyHistogram
+
+# Upper bounds in milliseconds for request latency
+REQUEST_BUCKETS_MS: Tuple[float, ...] = (
+    1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0,
+)
+
+LATENCY_PARTS = ("total", "db", "cache", "handler")
+
+# Label for samples where the loop was waiting in select/epoll
+IDLE_STACK = "<event loop idle: awaiting I/O>"
+
+
+class RouteLatency:
+    """Latency histograms per ``(method, route)``, split by where time went."""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], Dict[str, LatencyHistogram]] = defaultdict(
+            lambda: {part: LatencyHistogram(REQUEST_BUCKETS_MS) for part in LATENCY_PARTS}
+        )
+
+    def observe(self, method: str, route: str, total_ms: float, db_ms: float, cache_ms: float) -> None:
+        histograms = self._histograms[(method, route)]
+        histograms["total"].observe(total_ms)
+        histograms["db"].observe(db_ms)
+        histograms["cache"].observe(cache_ms)
+        histograms["handler"].observe(max(total_ms - db_ms - cache_ms, 0.0))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            f"{method} {route}": {part: histogram.snapshot() for part, histogram in histograms.items()}
+            for (method, route), histograms in sorted(self._histograms.items())
+        }
+
+    def reset(self) -> None:
+        self._histograms.clear()
+
+
+class SampledRequest:
+    """A request in flight, and the stacks sampled while it was slow."""
+
+    def __init__(self, request_id: int, method: str, path: str):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.stacks: Counter = Counter()
+
+
+class SlowRequestSampler:
+    """Samples the event loop stack during slow requests into a ring buffer."""
+
+    def __init__(
+        self,
+        slow_ms: float = 500.0,
+        interval_ms: float = 10.0,
+        max_profiles: int = 50,
+        max_depth: int = 30,
+    ):
+        self.slow_ms = slow_ms
+        self.interval = interval_ms / 1000
+        self.max_depth = max_depth
+        self.profiles: Deque[Dict[str, Any]] = deque(maxlen=max_profiles)
+        self._active: Dict[int, SampledRequest] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop_thread_id: Optional[int] = None
+
+    def start(self, method: str, path: str) -> SampledRequest:
+        """Register a request; called on the event loop thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._loop_thread_id = threading.get_ident()
+            self._thread = threading.Thread(
+                target=self._sample_forever, name="slow-request-sampler", daemon=True
+            )
+            self._thread.start()
+        request = SampledRequest(next(self._ids), method, path)
+        with self._lock:
+            self._active[request.request_id] = request
+        return request
+
+    def finish(self, request: SampledRequest, route: str, timings: Dict[str, float]) -> None:
+        """Unregister a request, keeping its profile if it was slow."""
+        with self._lock:
+            self._active.pop(request.request_id, None)
+            stacks = request.stacks.most_common()
+        if timings["total_ms"] < self.slow_ms:
+            return
+        self.profiles.append({
+            "method": request.method,
+            "path": request.path,
+            "route": route,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            **{name: round(value, 3) for name, value in timings.items()},
+            "samples": sum(count for _, count in stacks),
+            "stacks": [{"stack": stack, "count": count} for stack, count in stacks],
+        })
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Profiles of recent slow requests, newest first."""
+        profiles = list(reversed(self.profiles))
+        return profiles[:limit] if limit else profiles
+
+    def reset(self) -> None:
+        self.profiles.clear()
+
+    def _sample_forever(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sample()
+            except Exception:
+                # Never let profiling take the worker down
+                pass
+
+    def sample(self) -> None:
+        """Take one sample for every request currently slower than the threshold."""
+        now = time.perf_counter()
+        with self._lock:
+            slow = [
+                request for request in self._active.values()
+                if (now - request.started) * 1000 >= self.slow_ms
+            ]
+        if not slow:
+            return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = self._collapse(frame)
+        with self._lock:
+            for request in slow:
+                request.stacks[stack] += 1
+
+    def _collapse(self, frame) -> str:
+        """Root-to-leaf ``module:function:line`` frames joined with ``;``."""
+        frames = []
+        while frame is not None and len(frames) < self.max_depth:
+            code = frame.f_code
+            frames.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        if frames and frames[0].startswith("selectors:"):
+            return IDLE_STACK
+        return ";".join(reversed(frames))
+
+
+route_latency = RouteLatency()
+slow_request_sampler = SlowRequestSampler(
+    slow_ms=settings.PROFILING_SLOW_REQUEST_MS,
+    interval_ms=settings.PROFILING_SAMPLE_INTERVAL_MS,
+    max_profiles=settings.PROFILING_MAX_PROFILES,
+    max_depth=settings.PROFILING_MAX_STACK_DEPTH,
+)
@@ -5,11 +5,8 @@ from fastapi import HTTPException, status
 from app.shared.models.user import User, UserCreate
 from app.shared.models.organization import Organization
 from app.shared.models.restaurant import Restaurant
-from app.shared.auth.security import (
-    verify_password,
-    get_password_hash,
-    create_user_access_token,
-)
+from app.shared.auth.security import create_user_access_token
+from app.shared.auth.passwords import password_hasher
 from app.core.config import settings
 
 
@@ -31,9 +28,20 @@ class AuthService:
         if not user:
             return None
         
-        if not verify_password(password, user.password_hash):
+        # bcrypt runs on the password hashing pool so it doesn't block the event loop
+        verified, new_hash = await password_hasher.verify_and_update(
+            password, user.password_hash
+        )
+        
+        if not verified:
             return None
         
+        # Transparently upgrade hashes created with outdated cost parameters
+        if new_hash and settings.PASSWORD_REHASH_ON_LOGIN:
+            user.password_hash = new_hash
+            session.add(user)
+            await session.commit()
+        
         return user
     
     @staticmethod
@@ -124,7 +132,7 @@ class AuthService:
             email=user_data.email,
             full_name=user_data.full_name,
             role=user_data.role,
-            password_hash=get_password_hash(user_data.password),
+            password_hash=await password_hasher.hash(user_data.password),
             organization_id=organization_id,
             restaurant_id=restaurant_id or user_data.restaurant_id,
             is_active=True,
@@ -185,7 +193,7 @@ class AuthService:
             email=email,
             full_name=full_name,
             role="admin",
-            password_hash=get_password_hash(password),
+            password_hash=await password_hasher.hash(password),
             organization_id=organization.id,
             restaurant_id=restaurant.id if restaurant else None,
             is_active=True,
@@ -330,9 +330,12 @@ async def upload_item_image(
     
     # Update item with image URL
     image_url = f"/uploads/menu_items/{unique_filename}"
-    item.image_url = image_url
-    session.add(item)
-    await session.commit()
+    await MenuItemService.set_image(
+        session=session,
+        item=item,
+        image_url=image_url,
+        restaurant_id=tenant_context.restaurant_id,
+    )
     
     return {"message": "Image uploaded successfully", "image_url": image_url}
 
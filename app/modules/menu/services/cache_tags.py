@@ -0,0 +1,15 @@
+"""
+Cache invalidation tags for menu data.
+
+The public menu is cached per restaurant; any item or category write for
+that restaurant bumps its tag.
+"""
+
+from typing import Any, List
+
+from app.shared.cache import cache_tag
+
+
+def public_menu_tags(restaurant_id: Any) -> List[str]:
+    """Tags for a restaurant's cached public menu."""
+    return [cache_tag("menu", restaurant_id)]
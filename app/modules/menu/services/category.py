@@ -9,6 +9,8 @@ from app.modules.menu.models.category import (
     MenuCategoryUpdate,
 )
 from app.modules.menu.models.item import MenuItem
+from app.modules.menu.services.cache_tags import public_menu_tags
+from app.shared.cache import cache_invalidate_tags
 
 
 class MenuCategoryService:
@@ -76,6 +78,7 @@ class MenuCategoryService:
         return result.first()
     
     @staticmethod
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: public_menu_tags(restaurant_id))
     async def update_category(
         session: AsyncSession,
         category_id: str,
@@ -106,6 +109,7 @@ class MenuCategoryService:
         return category
     
     @staticmethod
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: public_menu_tags(restaurant_id))
     async def delete_category(
         session: AsyncSession,
         category_id: str,
@@ -186,6 +190,7 @@ class MenuCategoryService:
         }
     
     @staticmethod
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: public_menu_tags(restaurant_id))
     async def set_cover_image(
         session: AsyncSession,
         category_id: str,
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from uuid import UUID
+from sqlalchemy import bindparam
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, and_
 from fastapi import HTTPException, status
@@ -10,12 +11,30 @@ from app.modules.menu.models.item import (
     MenuItemPublic,
 )
 from app.modules.menu.models.category import MenuCategory
+from app.modules.menu.services.cache_tags import public_menu_tags
+from app.shared.cache import cached, cache_invalidate_tags
+from app.core.config import settings
+
+# Built once so cache-miss loads skip statement construction and reuse the
+# compiled and prepared statement
+_PUBLIC_MENU_QUERY = select(MenuItem, MenuCategory).join(
+    MenuCategory,
+    and_(
+        MenuItem.category_id == MenuCategory.id,
+        MenuCategory.is_active == True,
+    ),
+    isouter=True,
+).where(
+    MenuItem.restaurant_id == bindparam("restaurant_id"),
+    MenuItem.is_available == True,
+).order_by(MenuCategory.sort_order, MenuItem.name)
 
 
 class MenuItemService:
     """Service for menu item operations."""
     
     @staticmethod
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: public_menu_tags(restaurant_id))
     async def create_item(
         session: AsyncSession,
         item_data: MenuItemCreate,
@@ -95,6 +114,7 @@ class MenuItemService:
         return result.first()
     
     @staticmethod
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: public_menu_tags(restaurant_id))
     async def update_item(
         session: AsyncSession,
         item_id: str,
@@ -139,6 +159,7 @@ class MenuItemService:
         return item
     
     @staticmethod
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: public_menu_tags(restaurant_id))
     async def delete_item(
         session: AsyncSession,
         item_id: str,
@@ -162,6 +183,7 @@ class MenuItemService:
         return True
     
     @staticmethod
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: public_menu_tags(restaurant_id))
     async def toggle_availability(
         session: AsyncSession,
         item_id: str,
@@ -187,6 +209,27 @@ class MenuItemService:
         return item
     
     @staticmethod
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: public_menu_tags(restaurant_id))
+    async def set_image(
+        session: AsyncSession,
+        item: MenuItem,
+        image_url: str,
+        restaurant_id: str,
+    ) -> MenuItem:
+        """Point a menu item at a newly uploaded image."""
+        item.image_url = image_url
+        session.add(item)
+        await session.commit()
+        
+        return item
+    
+    @staticmethod
+    @cached(
+        ttl=settings.REDIS_TTL_PUBLIC_MENU,
+        key_prefix="public_menu",
+        tags=lambda restaurant_id, **_: public_menu_tags(restaurant_id),
+        stale_ttl=settings.REDIS_STALE_TTL_PUBLIC_MENU,
+    )
     async def get_public_menu(
         session: AsyncSession,
         restaurant_id: str,
@@ -201,19 +244,9 @@ class MenuItemService:
                 detail="Invalid restaurant ID format",
             )
         
-        statement = select(MenuItem, MenuCategory).join(
-            MenuCategory,
-            and_(
-                MenuItem.category_id == MenuCategory.id,
-                MenuCategory.is_active == True,
-            ),
-            isouter=True,
-        ).where(
-            MenuItem.restaurant_id == restaurant_uuid,
-            MenuItem.is_available == True,
-        ).order_by(MenuCategory.sort_order, MenuItem.name)
-        
-        result = await session.exec(statement)
+        result = await session.exec(
+            _PUBLIC_MENU_QUERY, params={"restaurant_id": restaurant_uuid}
+        )
         items_with_categories = result.all()
         
         public_items = []
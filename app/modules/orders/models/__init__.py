@@ -2,12 +2,13 @@
 Order management data models.
 """
 
-from .order import Order, OrderStatus, OrderType
+from .order import Order, OrderNumberSequence, OrderStatus, OrderType
 from .order_item import OrderItem, OrderItemModifier
 from .payment import Payment, PaymentStatus, PaymentMethod
 
 __all__ = [
     "Order",
+    "OrderNumberSequence",
     "OrderStatus", 
     "OrderType",
     "OrderItem",
@@ -5,8 +5,9 @@ Order models for restaurant order management.
 from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from enum import Enum
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
+from sqlalchemy import UniqueConstraint
 from sqlmodel import SQLModel, Field, Relationship, Column, JSON, Enum as SQLEnum
 from app.shared.database.base import RestaurantTenantBaseModel
 
@@ -39,7 +40,7 @@ class OrderType(str, Enum):
 
 class OrderBase(SQLModel):
     """Base order model for shared fields."""
-    order_number: str = Field(max_length=50, nullable=False, unique=True)
+    order_number: str = Field(max_length=50, nullable=False)
     order_type: OrderType = Field(sa_column=Column(SQLEnum(OrderType)))
     status: OrderStatus = Field(default=OrderStatus.PENDING, sa_column=Column(SQLEnum(OrderStatus)))
     
@@ -86,6 +87,20 @@ class Order(OrderBase, RestaurantTenantBaseModel, table=True):
     # Relationships
     order_items: List["OrderItem"] = Relationship(back_populates="order")
     payments: List["Payment"] = Relationship(back_populates="order")
+    
+    # Order numbers restart every day for every restaurant
+    __table_args__ = (
+        UniqueConstraint("restaurant_id", "order_number", name="uq_orders_restaurant_order_number"),
+    )
+
+
+class OrderNumberSequence(SQLModel, table=True):
+    """Last order number handed out per restaurant and business day."""
+    __tablename__ = "order_number_sequences"
+    
+    restaurant_id: UUID = Field(foreign_key="restaurants.id", primary_key=True)
+    business_date: date = Field(primary_key=True)
+    last_value: int = Field(default=0, nullable=False)
 
 
 class OrderCreate(OrderBase):
@@ -2,16 +2,20 @@
 Order management API routes.
 """
 
-from typing import List, Optional, Dict, Any
+import json
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from pydantic import ValidationError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.config import settings
 from app.shared.database.session import get_session
-from app.shared.auth.deps import get_current_user, require_role
+from app.shared.auth.deps import get_current_user, get_read_session, require_role
 from app.shared.models.user import User
 from app.modules.orders.services.order_service import OrderService
 from app.modules.orders.schemas import (
+    BulkOrderRow,
     OrderCreateRequest,
     OrderUpdateRequest,
     OrderStatusUpdate,
@@ -39,23 +43,8 @@ async def create_order(
     try:
         order_service = OrderService(session)
         
-        # Prepare order data
-        order_data = {
-            "order_type": order_request.order_type,
-            "customer_name": order_request.customer_name,
-            "customer_phone": order_request.customer_phone,
-            "customer_email": order_request.customer_email,
-            "delivery_address": order_request.delivery_address,
-            "delivery_instructions": order_request.delivery_instructions,
-            "requested_time": order_request.requested_time,
-            "special_instructions": order_request.special_instructions,
-            "table_id": order_request.table_id,
-            "reservation_id": order_request.reservation_id,
-            "qr_session_id": order_request.qr_session_id,
-        }
-        
         order = await order_service.create_order(
-            order_data=order_data,
+            order_data=_order_data(order_request),
             items_data=order_request.items,
             restaurant_id=current_user.restaurant_id,
             organization_id=current_user.organization_id,
@@ -75,6 +64,23 @@ async def create_order(
         )
 
 
+def _order_data(order_request: OrderCreateRequest) -> Dict[str, Any]:
+    """Order fields of a create request, without its items."""
+    return {
+        "order_type": order_request.order_type,
+        "customer_name": order_request.customer_name,
+        "customer_phone": order_request.customer_phone,
+        "customer_email": order_request.customer_email,
+        "delivery_address": order_request.delivery_address,
+        "delivery_instructions": order_request.delivery_instructions,
+        "requested_time": order_request.requested_time,
+        "special_instructions": order_request.special_instructions,
+        "table_id": order_request.table_id,
+        "reservation_id": order_request.reservation_id,
+        "qr_session_id": order_request.qr_session_id,
+    }
+
+
 @router.get(
     "/",
     response_model=List[OrderSummary],
@@ -261,7 +267,7 @@ async def update_order_status(
     description="Get order analytics for date range"
 )
 async def get_order_analytics(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(require_role(["admin", "manager"]))
 ):
     """Get order analytics."""
@@ -808,6 +814,134 @@ async def get_popular_items_analysis(
         )
 
 
+@router.post(
+    "/batch/import",
+    response_model=Dict[str, Any],
+    summary="Bulk Order Import",
+    description=(
+        "Create many orders from a JSON array of orders, or one order per line "
+        "with Content-Type: application/x-ndjson. Returns one result per row."
+    ),
+)
+async def import_orders(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(require_role(["admin", "manager"]))
+):
+    """Create orders in bulk, e.g. from a POS or delivery aggregator sync."""
+    rows = await _read_bulk_rows(request, settings.BULK_ORDER_MAX_ROWS)
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+    valid = []
+    for index, (row, error) in enumerate(rows):
+        if error is not None:
+            results[index] = {"index": index, "status": "error", "error": error}
+        else:
+            valid.append((index, row))
+    
+    try:
+        order_service = OrderService(session)
+        
+        order_rows = []
+        for _, row in valid:
+            order_data = _order_data(row)
+            if row.external_id:
+                order_data["order_metadata"] = {"external_id": row.external_id}
+            order_rows.append((order_data, row.items))
+        
+        created = await order_service.create_orders_bulk(
+            order_rows,
+            restaurant_id=current_user.restaurant_id,
+            organization_id=current_user.organization_id,
+            batch_size=settings.BULK_ORDER_BATCH_SIZE,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import orders: {str(e)}"
+        )
+    
+    for (index, row), result in zip(valid, created):
+        results[index] = {**result, "index": index}
+    for index, (row, _) in enumerate(rows):
+        if row is not None and row.external_id:
+            results[index]["external_id"] = row.external_id
+    
+    created_count = sum(1 for result in results if result["status"] == "created")
+    return {
+        "total": len(results),
+        "created": created_count,
+        "failed": len(results) - created_count,
+        "results": results,
+    }
+
+
+async def _read_bulk_rows(
+    request: Request, max_rows: int
+) -> List[Tuple[Optional[BulkOrderRow], Optional[str]]]:
+    """Parse an import body into ``(row, None)`` or ``(None, error)`` per order."""
+    content_type = request.headers.get("content-type", "")
+    
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        # Validate lines as they stream in rather than buffering the body
+        rows = []
+        async for line in _ndjson_lines(request.stream()):
+            if len(rows) >= max_rows:
+                raise _too_many_rows(max_rows)
+            try:
+                rows.append((BulkOrderRow.model_validate_json(line), None))
+            except ValidationError as e:
+                rows.append((None, _validation_message(e)))
+        return rows
+    
+    try:
+        payload = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be valid JSON")
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body must be a JSON array of orders, or NDJSON"
+        )
+    if len(payload) > max_rows:
+        raise _too_many_rows(max_rows)
+    
+    rows = []
+    for item in payload:
+        try:
+            rows.append((BulkOrderRow.model_validate(item), None))
+        except ValidationError as e:
+            rows.append((None, _validation_message(e)))
+    return rows
+
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Non-blank lines of a streamed body."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'order'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+def _too_many_rows(max_rows: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"At most {max_rows} orders per import"
+    )
+
+
 @router.post(
     "/batch/bulk-update",
     summary="Bulk Order Updates",
@@ -832,27 +966,32 @@ async def bulk_update_orders(
         
         from datetime import datetime
         
-        # Simulate bulk updates
-        results = {
+        order_service = OrderService(session)
+        details = await order_service.bulk_update_orders(
+            order_ids=[str(order_id) for order_id in order_ids],
+            action=update_action,
+            data=update_data,
+            restaurant_id=current_user.restaurant_id,
+        )
+        successful = sum(1 for detail in details if detail["status"] == "success")
+        
+        return {
             "total_orders": len(order_ids),
-            "successful_updates": len(order_ids),
-            "failed_updates": 0,
+            "successful_updates": successful,
+            "failed_updates": len(details) - successful,
             "action_performed": update_action,
             "updated_by": current_user.full_name,
             "timestamp": datetime.utcnow().isoformat(),
-            "details": []
+            "details": details
         }
         
-        for order_id in order_ids:
-            results["details"].append({
-                "order_id": order_id,
-                "status": "success",
-                "previous_value": "pending" if update_action == "status_update" else "normal",
-                "new_value": update_data.get("new_status", "confirmed") if update_action == "status_update" else update_data.get("priority", 5)
-            })
-        
-        return results
-        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.shared.database.session import get_session
-from app.shared.auth.deps import require_role
+from app.shared.auth.deps import get_read_session, require_role
 from app.shared.models.user import User
 from app.modules.orders.services.payment_service import PaymentService
 from app.modules.orders.schemas import SplitPaymentRequest
@@ -165,7 +165,7 @@ async def get_order_payments(
     description="Get payment summary for date range"
 )
 async def get_payment_summary(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(require_role(["admin", "manager"]))
 ):
     """Get payment summary."""
@@ -63,6 +63,11 @@ class OrderCreateRequest(BaseModel):
         return v
 
 
+class BulkOrderRow(OrderCreateRequest):
+    """One order in a bulk import."""
+    external_id: Optional[str] = Field(None, max_length=100, description="Order id in the source system (POS, aggregator)")
+
+
 class OrderUpdateRequest(BaseModel):
     """Schema for updating orders."""
     status: Optional[OrderStatus] = None
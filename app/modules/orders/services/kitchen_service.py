@@ -5,6 +5,7 @@ Kitchen operations service for managing order preparation.
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime, timedelta
+from sqlalchemy import bindparam
 from sqlmodel import select, and_, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -12,6 +13,16 @@ from app.modules.orders.models.order import Order, OrderStatus
 from app.modules.orders.models.order_item import OrderItem, OrderItemKitchenView
 from app.shared.cache.service import cache_service
 
+KITCHEN_QUEUE_STATUSES = [OrderStatus.CONFIRMED, OrderStatus.PREPARING, OrderStatus.READY]
+
+# Built once: identical statements skip construction and cache-key generation
+# per call, hit SQLAlchemy's compiled cache, and keep one SQL text so asyncpg
+# reuses the connection's prepared statement
+KITCHEN_ORDERS_QUERY = select(Order).where(
+    Order.restaurant_id == bindparam("restaurant_id"),
+    Order.status.in_(KITCHEN_QUEUE_STATUSES),
+).order_by(Order.created_at.asc())
+
 
 class KitchenService:
     """Service for kitchen operations and order preparation tracking."""
@@ -28,18 +39,9 @@ class KitchenService:
             return cached_orders
         
         # Get orders that need kitchen attention
-        stmt = select(Order).where(
-            and_(
-                Order.restaurant_id == restaurant_id,
-                Order.status.in_([
-                    OrderStatus.CONFIRMED,
-                    OrderStatus.PREPARING,
-                    OrderStatus.READY
-                ])
-            )
-        ).order_by(Order.created_at.asc())
-        
-        result = await self.session.exec(stmt)
+        result = await self.session.exec(
+            KITCHEN_ORDERS_QUERY, params={"restaurant_id": restaurant_id}
+        )
         orders = result.all()
         
         # Cache for 30 seconds
@@ -47,6 +49,17 @@ class KitchenService:
         
         return orders
     
+    async def get_queue_depth(self) -> Dict[str, int]:
+        """Orders waiting on the kitchen across all restaurants, by status."""
+        
+        stmt = select(Order.status, func.count()).where(
+            Order.status.in_(KITCHEN_QUEUE_STATUSES)
+        ).group_by(Order.status)
+        
+        result = await self.session.exec(stmt)
+        counts = {OrderStatus(status).value: count for status, count in result.all()}
+        return {status.value: counts.get(status.value, 0) for status in KITCHEN_QUEUE_STATUSES}
+    
     async def start_order_preparation(
         self,
         order_id: str,
@@ -328,11 +341,10 @@ class KitchenService:
     
     async def _clear_kitchen_cache(self, restaurant_id: UUID):
         """Clear kitchen-related cache."""
-        patterns = [
+        keys = [
             f"kitchen_orders:{restaurant_id}",
             f"kitchen_performance:{restaurant_id}",
             f"prep_queue:{restaurant_id}"
         ]
         
-        for pattern in patterns:
-            await cache_service.clear_pattern(pattern)
\ No newline at end of file
+        await cache_service.delete_many(keys)
\ No newline at end of file
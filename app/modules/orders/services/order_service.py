@@ -3,13 +3,17 @@ Order management service for handling order operations.
 """
 
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, timedelta
+from sqlalchemy import bindparam
 from sqlmodel import select, and_, or_, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import metrics
+from app.modules.orders.services.kitchen_service import KITCHEN_ORDERS_QUERY
+from app.modules.orders.services.order_numbers import format_order_number, order_number_allocator
 from app.modules.orders.models.order import Order, OrderStatus, OrderType, OrderCreate, OrderUpdate
 from app.modules.orders.models.order_item import OrderItem, OrderItemModifier, OrderItemCreate, OrderItemModifierCreate
 from app.modules.orders.models.payment import Payment, PaymentStatus
@@ -18,6 +22,22 @@ from app.modules.menu.models.modifier import Modifier
 from app.modules.tables.models.table import Table
 from app.shared.cache.service import cache_service
 
+# Pricing lookups, built once; ``ids`` expands to the order's distinct ids
+_MENU_ITEMS_BY_ID_QUERY = select(MenuItem).where(
+    MenuItem.id.in_(bindparam("ids", expanding=True)),
+    MenuItem.restaurant_id == bindparam("restaurant_id"),
+)
+_MODIFIERS_BY_ID_QUERY = select(Modifier).where(
+    Modifier.id.in_(bindparam("ids", expanding=True)),
+    Modifier.restaurant_id == bindparam("restaurant_id"),
+)
+_ORDERS_BY_ID_QUERY = select(Order).where(
+    Order.id.in_(bindparam("ids", expanding=True)),
+    Order.restaurant_id == bindparam("restaurant_id"),
+)
+
+BULK_UPDATE_ACTIONS = ("status_update", "notes_add", "priority_update")
+
 
 class OrderService:
     """Service for order management operations."""
@@ -40,41 +60,172 @@ class OrderService:
         # Calculate pricing
         subtotal, items_with_pricing = await self._calculate_order_pricing(items_data, restaurant_id)
         
-        # Calculate tax (assuming 8.5% tax rate - should be configurable)
-        tax_rate = Decimal("0.085")
-        tax_amount = subtotal * tax_rate
-        
-        # Total amount (before tip)
-        total_amount = subtotal + tax_amount
-        
-        # Create order
-        order = Order(
-            order_number=order_number,
-            organization_id=organization_id,
-            restaurant_id=restaurant_id,
-            subtotal=subtotal,
-            tax_amount=tax_amount,
-            total_amount=total_amount,
-            **order_data
+        order = self._stage_order(
+            order_number, order_data, items_data, subtotal, items_with_pricing,
+            organization_id, restaurant_id,
         )
         
-        self.session.add(order)
-        await self.session.commit()
-        await self.session.refresh(order)
-        
-        # Create order items
-        for item_data, pricing_info in zip(items_data, items_with_pricing):
-            order_item = await self._create_order_item(
-                order.id, item_data, pricing_info, organization_id, restaurant_id
-            )
-            
-        await self.session.commit()
+        try:
+            await self.session.commit()
+        except Exception:
+            # Nothing of a failed order is left behind
+            await self.session.rollback()
+            raise
+        metrics.orders_created.labels(OrderType(order.order_type).value).inc()
         
         # Clear related cache
         await self._clear_order_cache(restaurant_id)
         
         return order
     
+    async def create_orders_bulk(
+        self,
+        rows: List[Tuple[Dict[str, Any], List[OrderItemCreate]]],
+        restaurant_id: UUID,
+        organization_id: UUID,
+        batch_size: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many orders; returns one result per row, in input order.
+        
+        Every row is priced against one menu snapshot (two IN queries for
+        the whole import) and all order numbers come from one counter
+        update. Orders are then committed ``batch_size`` at a time. A batch
+        whose commit fails is retried row by row, so one bad row only fails
+        itself. Numbers of failed rows are skipped.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+        
+        menu_items, modifiers = await self._load_menu_snapshot(
+            [items_data for _, items_data in rows], restaurant_id
+        )
+        priced = []
+        for index, (order_data, items_data) in enumerate(rows):
+            try:
+                subtotal, items_with_pricing = self._price_items(items_data, menu_items, modifiers)
+            except ValueError as e:
+                results[index] = {"index": index, "status": "error", "error": str(e)}
+                continue
+            priced.append((index, order_data, items_data, subtotal, items_with_pricing))
+        
+        order_numbers = await self._generate_order_numbers(restaurant_id, len(priced))
+        staged = [(*row, order_number) for row, order_number in zip(priced, order_numbers)]
+        
+        for start in range(0, len(staged), batch_size):
+            batch = staged[start:start + batch_size]
+            orders = [
+                (index, self._stage_order(
+                    order_number, order_data, items_data, subtotal, items_with_pricing,
+                    organization_id, restaurant_id,
+                ))
+                for index, order_data, items_data, subtotal, items_with_pricing, order_number in batch
+            ]
+            try:
+                await self.session.commit()
+            except Exception:
+                await self.session.rollback()
+                orders = await self._commit_one_by_one(batch, results, organization_id, restaurant_id)
+            
+            for index, order in orders:
+                results[index] = {
+                    "index": index,
+                    "status": "created",
+                    "order_id": str(order.id),
+                    "order_number": order.order_number,
+                    "total_amount": str(order.total_amount),
+                }
+                metrics.orders_created.labels(OrderType(order.order_type).value).inc()
+        
+        if staged:
+            await self._clear_order_cache(restaurant_id)
+        
+        return results
+    
+    async def _commit_one_by_one(
+        self,
+        batch: List[tuple],
+        results: List[Optional[Dict[str, Any]]],
+        organization_id: UUID,
+        restaurant_id: UUID,
+    ) -> List[Tuple[int, Order]]:
+        """Commit a failed batch's orders separately, recording each row's error."""
+        created = []
+        for index, order_data, items_data, subtotal, items_with_pricing, order_number in batch:
+            order = self._stage_order(
+                order_number, order_data, items_data, subtotal, items_with_pricing,
+                organization_id, restaurant_id,
+            )
+            try:
+                await self.session.commit()
+            except Exception as e:
+                await self.session.rollback()
+                results[index] = {"index": index, "status": "error", "error": str(getattr(e, "orig", e))}
+                continue
+            created.append((index, order))
+        return created
+    
+    async def bulk_update_orders(
+        self,
+        order_ids: List[str],
+        action: str,
+        data: Dict[str, Any],
+        restaurant_id: UUID,
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply one action to many orders with one load and one commit.
+        
+        Actions are ``status_update`` (``data["new_status"]``), ``notes_add``
+        (``data["notes"]``, appended to the kitchen notes) and
+        ``priority_update`` (``data["priority"]``, kept in the order metadata).
+        Returns one result per requested id.
+        """
+        if action not in BULK_UPDATE_ACTIONS:
+            raise ValueError(f"Unknown bulk action {action}")
+        if action == "status_update":
+            new_status = OrderStatus(data.get("new_status", OrderStatus.CONFIRMED))
+        
+        valid_ids = {}
+        for order_id in order_ids:
+            try:
+                valid_ids[order_id] = UUID(str(order_id))
+            except ValueError:
+                pass
+        orders = await self._load_by_id(_ORDERS_BY_ID_QUERY, set(valid_ids.values()), restaurant_id)
+        
+        details = []
+        for order_id in order_ids:
+            order = orders.get(valid_ids.get(order_id))
+            if order is None:
+                details.append({"order_id": order_id, "status": "not_found"})
+                continue
+            
+            if action == "status_update":
+                previous, order.status = order.status, new_status
+                if new_status == OrderStatus.READY and not order.actual_ready_time:
+                    order.actual_ready_time = datetime.utcnow()
+                new = new_status
+            elif action == "notes_add":
+                previous = order.kitchen_notes
+                new = order.kitchen_notes = "\n".join(filter(None, [previous, data.get("notes")]))
+            else:
+                previous = (order.order_metadata or {}).get("priority")
+                new = data.get("priority")
+                # A new dict, so the JSON column is seen as changed
+                order.order_metadata = {**(order.order_metadata or {}), "priority": new}
+            
+            details.append({
+                "order_id": order_id,
+                "status": "success",
+                "previous_value": previous,
+                "new_value": new,
+            })
+        
+        if orders:
+            await self.session.commit()
+            await self._clear_order_cache(restaurant_id)
+        
+        return details
+    
     async def get_order(self, order_id: str, restaurant_id: UUID) -> Optional[Order]:
         """Get order by ID."""
         cache_key = f"order:{restaurant_id}:{order_id}"
@@ -171,7 +322,7 @@ class OrderService:
         await self.session.refresh(order)
         
         # Clear cache
-        await self._clear_order_cache(restaurant_id, order_id)
+        await self._clear_order_cache(restaurant_id)
         
         return order
     
@@ -183,14 +334,9 @@ class OrderService:
         if cached_orders:
             return cached_orders
             
-        stmt = select(Order).where(
-            and_(
-                Order.restaurant_id == restaurant_id,
-                Order.status.in_([OrderStatus.CONFIRMED, OrderStatus.PREPARING, OrderStatus.READY])
-            )
-        ).order_by(Order.created_at.asc())
-        
-        result = await self.session.exec(stmt)
+        result = await self.session.exec(
+            KITCHEN_ORDERS_QUERY, params={"restaurant_id": restaurant_id}
+        )
         orders = result.all()
         
         await cache_service.set(cache_key, orders, ttl=60)  # 1 minute
@@ -300,27 +446,20 @@ class OrderService:
         }
     
     async def _generate_order_number(self, restaurant_id: UUID) -> str:
-        """Generate unique order number."""
-        import random
-        
-        now = datetime.utcnow()
-        today = now.strftime("%Y%m%d")
-        
-        # Get count of orders today
-        stmt = select(func.count(Order.id)).where(
-            and_(
-                Order.restaurant_id == restaurant_id,
-                Order.created_at >= now.replace(hour=0, minute=0, second=0, microsecond=0)
-            )
+        """Next order number for the restaurant today, e.g. ``ORD-20250818-0042``."""
+        today = datetime.utcnow().date()
+        sequence = await order_number_allocator.next_value(self.session.bind, restaurant_id, today)
+        return format_order_number(today, sequence)
+    
+    async def _generate_order_numbers(self, restaurant_id: UUID, count: int) -> List[str]:
+        """``count`` consecutive order numbers from a single counter update."""
+        if not count:
+            return []
+        today = datetime.utcnow().date()
+        sequences = await order_number_allocator.next_values(
+            self.session.bind, restaurant_id, today, count
         )
-        result = await self.session.exec(stmt)
-        count = result.first() + 1
-        
-        # Add microseconds and small random number for uniqueness
-        microseconds = now.microsecond // 1000  # Convert to 3 digits
-        random_suffix = random.randint(10, 99)
-        
-        return f"ORD-{today}-{count:04d}-{microseconds:03d}{random_suffix}"
+        return [format_order_number(today, sequence) for sequence in sequences]
     
     async def _calculate_order_pricing(
         self,
@@ -328,20 +467,45 @@ class OrderService:
         restaurant_id: UUID,
     ) -> tuple[Decimal, List[Dict[str, Any]]]:
         """Calculate order pricing and return items with pricing info."""
+        menu_items, modifiers = await self._load_menu_snapshot([items_data], restaurant_id)
+        return self._price_items(items_data, menu_items, modifiers)
+    
+    async def _load_menu_snapshot(
+        self,
+        orders_items: List[List[OrderItemCreate]],
+        restaurant_id: UUID,
+    ) -> tuple[Dict[UUID, MenuItem], Dict[UUID, Modifier]]:
+        """Menu items and modifiers referenced by the orders, keyed by id."""
+        
+        # One IN query per entity, however many orders, lines and modifiers
+        menu_item_ids = {
+            item_data.menu_item_id
+            for items_data in orders_items
+            for item_data in items_data
+        }
+        modifier_ids = {
+            modifier_data.modifier_id
+            for items_data in orders_items
+            for item_data in items_data
+            for modifier_data in item_data.modifiers
+        }
+        menu_items = await self._load_by_id(_MENU_ITEMS_BY_ID_QUERY, menu_item_ids, restaurant_id)
+        modifiers = await self._load_by_id(_MODIFIERS_BY_ID_QUERY, modifier_ids, restaurant_id)
+        return menu_items, modifiers
+    
+    def _price_items(
+        self,
+        items_data: List[OrderItemCreate],
+        menu_items: Dict[UUID, MenuItem],
+        modifiers: Dict[UUID, Modifier],
+    ) -> tuple[Decimal, List[Dict[str, Any]]]:
+        """Price order lines against a loaded menu snapshot."""
         
         subtotal = Decimal(0)
         items_with_pricing = []
         
         for item_data in items_data:
-            # Get menu item
-            stmt = select(MenuItem).where(
-                and_(
-                    MenuItem.id == item_data.menu_item_id,
-                    MenuItem.restaurant_id == restaurant_id
-                )
-            )
-            result = await self.session.exec(stmt)
-            menu_item = result.first()
+            menu_item = menu_items.get(item_data.menu_item_id)
             
             if not menu_item:
                 raise ValueError(f"Menu item {item_data.menu_item_id} not found")
@@ -353,23 +517,18 @@ class OrderService:
             # Calculate modifier prices
             modifier_details = []
             for modifier_data in item_data.modifiers:
-                stmt = select(Modifier).where(
-                    and_(
-                        Modifier.id == modifier_data.modifier_id,
-                        Modifier.restaurant_id == restaurant_id
-                    )
-                )
-                result = await self.session.exec(stmt)
-                modifier = result.first()
+                modifier = modifiers.get(modifier_data.modifier_id)
                 
-                if modifier:
-                    modifier_price = modifier.price * modifier_data.quantity
-                    modifier_total += modifier_price
-                    modifier_details.append({
-                        "modifier": modifier,
-                        "quantity": modifier_data.quantity,
-                        "total_price": modifier_price
-                    })
+                if not modifier:
+                    raise ValueError(f"Modifier {modifier_data.modifier_id} not found")
+                
+                modifier_price = modifier.price * modifier_data.quantity
+                modifier_total += modifier_price
+                modifier_details.append({
+                    "modifier": modifier,
+                    "quantity": modifier_data.quantity,
+                    "total_price": modifier_price
+                })
             
             # Total price for this item
             item_total = (unit_price + modifier_total) * item_data.quantity
@@ -387,7 +546,58 @@ class OrderService:
         
         return subtotal, items_with_pricing
     
-    async def _create_order_item(
+    async def _load_by_id(self, statement, ids: Set[UUID], restaurant_id: UUID) -> Dict[UUID, Any]:
+        """Rows of a restaurant-scoped ``IN`` query keyed by id."""
+        if not ids:
+            return {}
+        result = await self.session.exec(
+            statement, params={"ids": list(ids), "restaurant_id": restaurant_id}
+        )
+        return {row.id: row for row in result.all()}
+    
+    def _stage_order(
+        self,
+        order_number: str,
+        order_data: Dict[str, Any],
+        items_data: List[OrderItemCreate],
+        subtotal: Decimal,
+        items_with_pricing: List[Dict[str, Any]],
+        organization_id: UUID,
+        restaurant_id: UUID,
+    ) -> Order:
+        """Add a priced order with its items and modifiers to the session, without flushing."""
+        
+        # Calculate tax (assuming 8.5% tax rate - should be configurable)
+        tax_rate = Decimal("0.085")
+        tax_amount = subtotal * tax_rate
+        
+        # Total amount (before tip)
+        total_amount = subtotal + tax_amount
+        
+        # Create order
+        order = Order(
+            order_number=order_number,
+            organization_id=organization_id,
+            restaurant_id=restaurant_id,
+            subtotal=subtotal,
+            tax_amount=tax_amount,
+            total_amount=total_amount,
+            **order_data
+        )
+        
+        self.session.add(order)
+        
+        # Create order items; ids are assigned client-side, so nothing is
+        # flushed until the caller commits. The flush inserts the orders,
+        # items and modifiers as one executemany per table, in FK order.
+        for item_data, pricing_info in zip(items_data, items_with_pricing):
+            self._create_order_item(
+                order.id, item_data, pricing_info, organization_id, restaurant_id
+            )
+        
+        return order
+    
+    def _create_order_item(
         self,
         order_id: str,
         item_data: OrderItemCreate,
@@ -395,7 +605,7 @@ class OrderService:
         organization_id: UUID,
         restaurant_id: UUID,
     ) -> OrderItem:
-        """Create order item with modifiers."""
+        """Add an order item and its modifiers to the session, without flushing."""
         
         menu_item = pricing_info["menu_item"]
         
@@ -413,8 +623,6 @@ class OrderService:
         )
         
         self.session.add(order_item)
-        await self.session.commit()
-        await self.session.refresh(order_item)
         
         # Create modifiers
         for modifier_info in pricing_info["modifiers"]:
@@ -433,16 +641,15 @@ class OrderService:
         
         return order_item
     
-    async def _clear_order_cache(self, restaurant_id: UUID, order_id: str = None):
+    async def _clear_order_cache(self, restaurant_id: UUID):
         """Clear order-related cache."""
         patterns = [
             f"order:{restaurant_id}:*",
-            f"kitchen_orders:{restaurant_id}",
             f"orders:{restaurant_id}:*"
         ]
         
-        if order_id:
-            patterns.append(f"order:{restaurant_id}:{order_id}")
-            
+        # Globs cost a SCAN each and cannot be pipelined; the per-order
+        # keys are covered by the first one
+        await cache_service.delete(f"kitchen_orders:{restaurant_id}")
         for pattern in patterns:
             await cache_service.clear_pattern(pattern)
\ No newline at end of file
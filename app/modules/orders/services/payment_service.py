@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from sqlmodel import select, and_, func
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import metrics
 from app.modules.orders.models.order import Order, OrderStatus
 from app.modules.orders.models.payment import (
     Payment, PaymentStatus, PaymentMethod, PaymentCreate, PaymentRefundRequest
@@ -81,6 +82,11 @@ class PaymentService:
         await self.session.commit()
         await self.session.refresh(payment)
         
+        method = PaymentMethod(payment.payment_method).value
+        metrics.payments_processed.labels(method, PaymentStatus(payment.status).value).inc()
+        if payment.status == PaymentStatus.COMPLETED:
+            metrics.payment_amount.labels(method).inc(float(payment.amount))
+        
         # Update order status if payment is successful
         if payment.status == PaymentStatus.COMPLETED:
             await self._check_order_payment_completion(order)
@@ -121,26 +121,28 @@ class QROrderService:
             "qr_session_id": order_placement.session_id,
         }
         
-        # Create order
-        order = await order_service.create_order(
-            order_data=order_data,
-            items_data=order_placement.items,
-            restaurant_id=session_info["restaurant_id"],
-            organization_id=session_info["organization_id"],
-        )
-        
-        # Update session with order info
-        session_info["orders"] = session_info.get("orders", [])
-        session_info["orders"].append({
-            "order_id": order.id,
-            "order_number": order.order_number,
-            "total_amount": float(order.total_amount),
-            "created_at": datetime.utcnow().isoformat()
-        })
-        
-        # Update session in cache
-        cache_key = f"qr_session:{order_placement.session_id}"
-        await cache_service.set(cache_key, session_info, ttl=10800)
+        # Order cache invalidation and the session update go out in one flush
+        async with cache_service.batch():
+            # Create order
+            order = await order_service.create_order(
+                order_data=order_data,
+                items_data=order_placement.items,
+                restaurant_id=session_info["restaurant_id"],
+                organization_id=session_info["organization_id"],
+            )
+            
+            # Update session with order info
+            session_info["orders"] = session_info.get("orders", [])
+            session_info["orders"].append({
+                "order_id": order.id,
+                "order_number": order.order_number,
+                "total_amount": float(order.total_amount),
+                "created_at": datetime.utcnow().isoformat()
+            })
+            
+            # Update session in cache
+            cache_key = f"qr_session:{order_placement.session_id}"
+            await cache_service.set(cache_key, session_info, ttl=10800)
         
         return order
     
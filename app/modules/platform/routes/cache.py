@@ -0,0 +1,32 @@
+"""
+Platform cache instrumentation API routes.
+"""
+
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+
+from app.shared.auth.security import verified_tokens
+from app.shared.cache import cache_service
+from app.shared.models.user import User
+from app.modules.platform.routes.applications import verify_platform_admin
+
+router = APIRouter(prefix="/platform/cache", tags=["Platform Management"])
+
+
+@router.get("/metrics", response_model=Dict[str, Any])
+async def get_cache_metrics(
+    current_user: User = Depends(verify_platform_admin),
+):
+    """Per key-prefix hit/miss/set/eviction counters, invalidation fan-out and latency histograms."""
+    metrics = await cache_service.get_metrics()
+    metrics["verified_tokens"] = verified_tokens.stats()
+    return metrics
+
+
+@router.post("/metrics/reset")
+async def reset_cache_metrics(
+    current_user: User = Depends(verify_platform_admin),
+):
+    """Reset cache counters and latency histograms (platform admin only)."""
+    cache_service.reset_stats()
+    return {"message": "Cache metrics reset"}
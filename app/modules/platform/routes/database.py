@@ -0,0 +1,26 @@
+"""
+Platform database pool monitoring API routes.
+"""
+
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+
+from app.shared.database.pool import get_pool_stats
+from app.shared.database.replica import read_router
+from app.shared.database.session import engine, read_engine
+from app.shared.models.user import User
+from app.modules.platform.routes.applications import verify_platform_admin
+
+router = APIRouter(prefix="/platform/database", tags=["Platform Management"])
+
+
+@router.get("/pool", response_model=Dict[str, Any])
+async def get_database_pool_stats(
+    current_user: User = Depends(verify_platform_admin),
+):
+    """In-use, idle and overflow connections plus checkout wait times for this worker."""
+    stats = get_pool_stats(engine)
+    stats["replica"] = read_router.stats()
+    if read_engine is not engine:
+        stats["replica"]["pool"] = get_pool_stats(read_engine)
+    return stats
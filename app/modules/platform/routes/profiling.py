@@ -0,0 +1,43 @@
+"""
+Platform request profiling API routes.
+"""
+
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query
+
+from app.core.config import settings
+from app.core.profiling import route_latency, slow_request_sampler
+from app.shared.models.user import User
+from app.modules.platform.routes.applications import verify_platform_admin
+
+router = APIRouter(prefix="/platform/profiling", tags=["Platform Management"])
+
+
+@router.get("/routes", response_model=Dict[str, Any])
+async def get_route_latency(
+    current_user: User = Depends(verify_platform_admin),
+):
+    """Per-route latency histograms split into DB, cache and handler time for this worker."""
+    return {
+        "enabled": settings.PROFILING_ENABLED,
+        "routes": route_latency.snapshot(),
+    }
+
+
+@router.get("/slow-requests", response_model=List[Dict[str, Any]])
+async def get_slow_requests(
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Most recent profiles to return"),
+    current_user: User = Depends(verify_platform_admin),
+):
+    """Stack-sampled profiles of recent slow requests, newest first."""
+    return slow_request_sampler.recent(limit)
+
+
+@router.post("/reset")
+async def reset_profiling(
+    current_user: User = Depends(verify_platform_admin),
+):
+    """Clear route latency histograms and slow request profiles (platform admin only)."""
+    route_latency.reset()
+    slow_request_sampler.reset()
+    return {"message": "Profiling data reset"}
@@ -16,7 +16,7 @@ from app.modules.platform.models.application import (
 from app.shared.models.organization import Organization, OrganizationCreate
 from app.shared.models.restaurant import Restaurant, RestaurantCreate
 from app.shared.models.user import User, UserCreate
-from app.shared.auth.security import get_password_hash
+from app.shared.auth.passwords import password_hasher
 
 
 class PlatformApplicationService:
@@ -136,7 +136,7 @@ class PlatformApplicationService:
             user = User(
                 email=user_data.email,
                 full_name=user_data.full_name,
-                password_hash=get_password_hash(user_data.password),
+                password_hash=await password_hasher.hash(user_data.password),
                 role=user_data.role,
                 organization_id=str(organization.id),
                 restaurant_id=str(restaurant.id),
@@ -5,10 +5,12 @@ Phase 1: Simple restaurant setup with hidden multi-tenant foundation.
 
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.shared.database.session import get_session
 from app.core.config import settings
+from app.core.health import health_checker
 from app.core.setup import RestaurantSetupService
 from app.modules.setup.schemas import (
     RestaurantSetupRequest,
@@ -182,6 +184,35 @@ async def database_health_check(session: AsyncSession = Depends(get_session)):
         }
 
 
+@router.get(
+    "/health/live",
+    summary="Liveness Probe",
+    description="Whether the worker process is running; never checks dependencies"
+)
+async def liveness_probe():
+    """
+    Liveness probe: restart the worker only if this fails.
+    """
+    return {"status": "alive"}
+
+
+@router.get(
+    "/health/ready",
+    summary="Readiness Probe",
+    description="Database latency, Redis latency and pool saturation; 503 when this worker should not get traffic",
+    responses={503: {"description": "Not ready: database down or connection pool exhausted"}},
+)
+async def readiness_probe():
+    """
+    Readiness probe for the load balancer. The report is cached briefly
+    so frequent probes do not add load.
+    """
+    report = await health_checker.readiness()
+    if report["status"] != "ready":
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=report)
+    return report
+
+
 @router.get(
     "/",
     summary="API Root",
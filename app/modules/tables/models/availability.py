@@ -9,6 +9,10 @@ class AvailabilitySlot(SQLModel):
     available_tables: int
     total_capacity: int
     is_available: bool = True
+    slot_date: Optional[date] = Field(
+        default=None,
+        description="Date of the slot, set on alternative suggestions",
+    )
 
 
 class DayAvailability(SQLModel):
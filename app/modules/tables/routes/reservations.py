@@ -3,7 +3,7 @@ from datetime import date, datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.shared.database.session import get_session
-from app.shared.auth.deps import get_tenant_context, TenantContext, require_manager, require_staff
+from app.shared.auth.deps import get_read_session, get_tenant_context, TenantContext, require_manager, require_staff
 import uuid
 from app.modules.tables.models.reservation import (
     ReservationCreate,
@@ -467,7 +467,7 @@ async def get_reservation_analytics(
     start_date: date = Query(default_factory=lambda: date.today() - timedelta(days=30), description="Start date for analytics"),
     end_date: date = Query(default_factory=lambda: date.today(), description="End date for analytics"),
     tenant_context: TenantContext = Depends(get_tenant_context),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """Get reservation analytics for date range."""
     if not tenant_context.restaurant_id:
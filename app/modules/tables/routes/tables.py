@@ -2,7 +2,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.shared.database.session import get_session
-from app.shared.auth.deps import get_tenant_context, TenantContext, require_manager
+from app.shared.auth.deps import get_read_session, get_tenant_context, TenantContext, require_manager
 import uuid
 from app.modules.tables.models.table import (
     TableCreate,
@@ -300,7 +300,7 @@ async def get_availability_overview(
 @router.get("/analytics/utilization")
 async def get_table_analytics(
     tenant_context: TenantContext = Depends(get_tenant_context),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     days_back: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
 ):
     """Get table utilization analytics."""
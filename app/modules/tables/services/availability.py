@@ -1,4 +1,5 @@
 from typing import List, Optional, Dict, Any
+from collections import defaultdict
 from datetime import date, time, datetime, timedelta
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, func, and_, or_
@@ -12,6 +13,23 @@ from app.modules.tables.models.availability import (
     AvailabilityResponse,
     CapacityOptimization,
 )
+from app.modules.tables.services.occupancy import (
+    OccupancyIndex,
+    NUMPY_AVAILABLE,
+    ACTIVE_RESERVATION_STATUSES,
+    BOOKABLE_TABLE_STATUSES,
+    OPENING_HOUR,
+    CLOSING_HOUR,
+    SLOT_INTERVAL_MINUTES,
+    to_minutes,
+    from_minutes,
+    iter_slot_minutes,
+)
+from app.modules.tables.services.cache_tags import (
+    availability_tags,
+    availability_window_tags,
+    availability_month_tags,
+)
 from app.shared.cache import cached, cache_invalidate_pattern
 from app.core.config import settings
 
@@ -20,7 +38,12 @@ class AvailabilityService:
     """Service for availability management and scheduling."""
     
     @staticmethod
-    @cached(ttl=settings.REDIS_TTL_AVAILABILITY, key_prefix="availability")
+    @cached(
+        ttl=settings.REDIS_TTL_AVAILABILITY,
+        key_prefix="availability",
+        tags=lambda restaurant_id, query, **_: availability_tags(restaurant_id, query.date),
+        stale_ttl=settings.REDIS_STALE_TTL_AVAILABILITY,
+    )
     async def get_available_slots(
         session: AsyncSession,
         organization_id: str,
@@ -28,82 +51,56 @@ class AvailabilityService:
         query: AvailabilityQuery,
     ) -> AvailabilityResponse:
         """Get available time slots for a given date and party size."""
-        # Get all active tables that can accommodate the party size
-        tables_stmt = select(Table).where(
-            Table.organization_id == organization_id,
-            Table.restaurant_id == restaurant_id,
-            Table.is_active == True,
-            Table.capacity >= query.party_size,
-            Table.status.in_(["available", "reserved"]),  # Include reserved tables for scheduling
+        index = await AvailabilityService.build_occupancy_index(
+            session=session,
+            organization_id=organization_id,
+            restaurant_id=restaurant_id,
+            target_date=query.date,
+            min_capacity=query.party_size,
         )
-        tables_result = await session.exec(tables_stmt)
-        suitable_tables = tables_result.all()
-        
-        if not suitable_tables:
-            return AvailabilityResponse(
-                date=query.date,
-                available_slots=[],
-                is_fully_booked=True,
-            )
+        return AvailabilityService.availability_from_index(index, query)
+    
+    @staticmethod
+    async def build_occupancy_index(
+        session: AsyncSession,
+        organization_id: str,
+        restaurant_id: str,
+        target_date: date,
+        min_capacity: int = 1,
+    ) -> OccupancyIndex:
+        """Load a day's bookable tables and reservations into an occupancy index."""
+        tables = await AvailabilityService._get_bookable_tables(
+            session, organization_id, restaurant_id, min_capacity
+        )
+        if not tables:
+            return OccupancyIndex([])
         
-        # Get existing reservations for the date
-        reservations_stmt = select(Reservation).where(
-            Reservation.organization_id == organization_id,
-            Reservation.restaurant_id == restaurant_id,
-            Reservation.reservation_date == query.date,
-            Reservation.status.in_(["confirmed", "seated"]),
+        reservations = await AvailabilityService._get_active_reservations(
+            session, organization_id, restaurant_id, target_date
+        )
+        return OccupancyIndex(tables, reservations)
+    
+    @staticmethod
+    def availability_from_index(
+        index: OccupancyIndex,
+        query: AvailabilityQuery,
+    ) -> AvailabilityResponse:
+        """Build the availability response for a query from a day's occupancy index."""
+        available_slots = index.available_slots(
+            duration_minutes=query.duration_minutes,
+            party_size=query.party_size,
         )
-        reservations_result = await session.exec(reservations_stmt)
-        existing_reservations = reservations_result.all()
         
-        # Generate time slots (every 30 minutes from 11:00 to 22:00)
-        available_slots = []
         recommendations = []
-        
-        start_hour = 11
-        end_hour = 22
-        slot_interval = 30  # minutes
-        
-        current_time = time(start_hour, 0)
-        while current_time.hour < end_hour or (current_time.hour == end_hour and current_time.minute == 0):
-            slot_availability = await AvailabilityService._check_slot_availability(
-                suitable_tables=suitable_tables,
-                existing_reservations=existing_reservations,
-                slot_time=current_time,
-                party_size=query.party_size,
-                duration_minutes=query.duration_minutes,
-            )
-            
-            if slot_availability["available_tables"] > 0:
-                slot = AvailabilitySlot(
-                    time=current_time,
-                    available_tables=slot_availability["available_tables"],
-                    total_capacity=slot_availability["total_capacity"],
-                    is_available=True,
-                )
-                available_slots.append(slot)
-                
-                # Add to recommendations if it's a preferred time
-                if query.time_preference:
-                    time_diff = abs(
-                        (datetime.combine(date.today(), current_time) - 
-                         datetime.combine(date.today(), query.time_preference)).total_seconds() / 60
-                    )
-                    if time_diff <= 60:  # Within 1 hour of preference
-                        recommendations.append(slot)
-            
-            # Move to next slot
-            current_datetime = datetime.combine(date.today(), current_time)
-            next_datetime = current_datetime + timedelta(minutes=slot_interval)
-            current_time = next_datetime.time()
-        
-        # Sort recommendations by proximity to preferred time
-        if query.time_preference and recommendations:
-            recommendations.sort(
-                key=lambda s: abs(
-                    (datetime.combine(date.today(), s.time) - 
-                     datetime.combine(date.today(), query.time_preference)).total_seconds()
-                )
+        if query.time_preference:
+            preferred_minute = to_minutes(query.time_preference)
+            # Preferred slots are within 1 hour, closest first
+            recommendations = sorted(
+                (
+                    slot for slot in available_slots
+                    if abs(to_minutes(slot.time) - preferred_minute) <= 60
+                ),
+                key=lambda slot: abs(to_minutes(slot.time) - preferred_minute),
             )
         
         return AvailabilityResponse(
@@ -114,7 +111,50 @@ class AvailabilityService:
         )
     
     @staticmethod
-    @cached(ttl=settings.REDIS_TTL_AVAILABILITY, key_prefix="availability")
+    async def _get_bookable_tables(
+        session: AsyncSession,
+        organization_id: str,
+        restaurant_id: str,
+        min_capacity: int = 1,
+    ) -> List[Table]:
+        """Get active tables that can take a reservation of ``min_capacity`` guests."""
+        tables_stmt = select(Table).where(
+            Table.organization_id == organization_id,
+            Table.restaurant_id == restaurant_id,
+            Table.is_active == True,
+            Table.capacity >= min_capacity,
+            Table.status.in_(BOOKABLE_TABLE_STATUSES),  # Include reserved tables for scheduling
+        )
+        tables_result = await session.exec(tables_stmt)
+        return tables_result.all()
+    
+    @staticmethod
+    async def _get_active_reservations(
+        session: AsyncSession,
+        organization_id: str,
+        restaurant_id: str,
+        start_date: date,
+        end_date: Optional[date] = None,
+    ) -> List[Reservation]:
+        """Get reservations holding a table between two dates (inclusive)."""
+        reservations_stmt = select(Reservation).where(
+            Reservation.organization_id == organization_id,
+            Reservation.restaurant_id == restaurant_id,
+            Reservation.reservation_date >= start_date,
+            Reservation.reservation_date <= (end_date or start_date),
+            Reservation.status.in_(ACTIVE_RESERVATION_STATUSES),
+        )
+        reservations_result = await session.exec(reservations_stmt)
+        return reservations_result.all()
+    
+    @staticmethod
+    @cached(
+        ttl=settings.REDIS_TTL_AVAILABILITY,
+        key_prefix="availability",
+        tags=lambda restaurant_id, year, month, **_: availability_month_tags(
+            restaurant_id, year, month
+        ),
+    )
     async def get_monthly_availability(
         session: AsyncSession,
         organization_id: str,
@@ -130,28 +170,37 @@ class AvailabilityService:
         else:
             last_day = date(year, month + 1, 1) - timedelta(days=1)
         
+        # Overview for the default party of 2 over 90 minutes
+        party_size = 2
+        duration_minutes = 90
+        
+        # One query for the tables and one for the whole month's reservations
+        tables = await AvailabilityService._get_bookable_tables(
+            session, organization_id, restaurant_id, party_size
+        )
+        reservations_by_date: Dict[date, List[Reservation]] = defaultdict(list)
+        if tables:
+            reservations = await AvailabilityService._get_active_reservations(
+                session, organization_id, restaurant_id, first_day, last_day
+            )
+            for reservation in reservations:
+                reservations_by_date[reservation.reservation_date].append(reservation)
+        
         days = []
         current_date = first_day
         
         while current_date <= last_day:
-            # For each day, check general availability
-            query = AvailabilityQuery(
-                date=current_date,
-                party_size=2,  # Default party size for overview
-                duration_minutes=90,
-            )
-            
-            availability_response = await AvailabilityService.get_available_slots(
-                session=session,
-                organization_id=organization_id,
-                restaurant_id=restaurant_id,
-                query=query,
+            index = OccupancyIndex(tables, reservations_by_date.get(current_date, ()))
+            slots = index.available_slots(
+                duration_minutes=duration_minutes,
+                party_size=party_size,
+                vectorized=NUMPY_AVAILABLE,
             )
             
             day_availability = DayAvailability(
                 date=current_date,
-                slots=availability_response.available_slots,
-                is_open=not availability_response.is_fully_booked,
+                slots=slots,
+                is_open=len(slots) > 0,
             )
             days.append(day_availability)
             
@@ -252,53 +301,13 @@ class AvailabilityService:
         )
     
     @staticmethod
-    async def _check_slot_availability(
-        suitable_tables: List[Table],
-        existing_reservations: List[Reservation],
-        slot_time: time,
-        party_size: int,
-        duration_minutes: int,
-    ) -> Dict[str, Any]:
-        """Check availability for a specific time slot."""
-        slot_end_time = (
-            datetime.combine(date.today(), slot_time) + 
-            timedelta(minutes=duration_minutes)
-        ).time()
-        
-        # Count available tables for this slot
-        available_tables = 0
-        total_capacity = 0
-        
-        for table in suitable_tables:
-            # Check if this table is free during the slot
-            is_table_free = True
-            
-            for reservation in existing_reservations:
-                if (reservation.table_id == table.id and 
-                    reservation.status in ["confirmed", "seated"]):
-                    
-                    reservation_start = reservation.reservation_time
-                    reservation_end = (
-                        datetime.combine(date.today(), reservation.reservation_time) + 
-                        timedelta(minutes=reservation.duration_minutes)
-                    ).time()
-                    
-                    # Check for overlap
-                    if not (slot_end_time <= reservation_start or slot_time >= reservation_end):
-                        is_table_free = False
-                        break
-            
-            if is_table_free:
-                available_tables += 1
-                total_capacity += table.capacity
-        
-        return {
-            "available_tables": available_tables,
-            "total_capacity": total_capacity,
-        }
-    
-    @staticmethod
-    @cached(ttl=settings.REDIS_TTL_AVAILABILITY, key_prefix="availability")
+    @cached(
+        ttl=settings.REDIS_TTL_AVAILABILITY,
+        key_prefix="availability",
+        tags=lambda restaurant_id, preferred_date, **_: availability_window_tags(
+            restaurant_id, preferred_date
+        ),
+    )
     async def find_alternative_slots(
         session: AsyncSession,
         organization_id: str,
@@ -309,81 +318,78 @@ class AvailabilityService:
         duration_minutes: int = 90,
     ) -> List[AvailabilitySlot]:
         """Find alternative time slots if preferred time is not available."""
-        alternatives = []
+        preferred_minute = to_minutes(preferred_time)
         
-        # Check same day, different times (±2 hours)
-        for time_offset in [-120, -90, -60, -30, 30, 60, 90, 120]:  # minutes
-            try:
-                alternative_time = (
-                    datetime.combine(date.today(), preferred_time) + 
-                    timedelta(minutes=time_offset)
-                ).time()
-                
-                # Skip if outside business hours (11 AM - 10 PM)
-                if alternative_time.hour < 11 or alternative_time.hour >= 22:
-                    continue
-                
-                query = AvailabilityQuery(
-                    date=preferred_date,
-                    party_size=party_size,
-                    time_preference=alternative_time,
-                    duration_minutes=duration_minutes,
-                )
-                
-                availability = await AvailabilityService.get_available_slots(
-                    session=session,
-                    organization_id=organization_id,
-                    restaurant_id=restaurant_id,
-                    query=query,
-                )
-                
-                # Find slot closest to alternative time
-                for slot in availability.available_slots:
-                    if slot.time == alternative_time:
-                        alternatives.append(slot)
-                        break
-            except (ValueError, OverflowError):
+        # Candidate (date, minute) pairs: same day ±2 hours, then ±3 days near the same time
+        candidates = [
+            (preferred_date, preferred_minute + time_offset)
+            for time_offset in [-120, -90, -60, -30, 30, 60, 90, 120]  # minutes
+        ]
+        nearby_slots = sorted(
+            (
+                minute for minute in iter_slot_minutes()
+                if abs(minute - preferred_minute) <= 30  # Within 30 minutes
+            ),
+            key=lambda minute: abs(minute - preferred_minute),
+        )
+        for date_offset in [-3, -2, -1, 1, 2, 3]:
+            alternative_date = preferred_date + timedelta(days=date_offset)
+            # Skip past dates
+            if alternative_date < date.today():
                 continue
+            candidates.extend((alternative_date, minute) for minute in nearby_slots)
         
-        # Check different dates (±3 days), same time
-        for date_offset in [-3, -2, -1, 1, 2, 3]:
-            try:
-                alternative_date = preferred_date + timedelta(days=date_offset)
-                
-                # Skip past dates
-                if alternative_date < date.today():
-                    continue
-                
-                query = AvailabilityQuery(
-                    date=alternative_date,
-                    party_size=party_size,
-                    time_preference=preferred_time,
-                    duration_minutes=duration_minutes,
-                )
-                
-                availability = await AvailabilityService.get_available_slots(
-                    session=session,
-                    organization_id=organization_id,
-                    restaurant_id=restaurant_id,
-                    query=query,
-                )
-                
-                # Find slot closest to preferred time
-                for slot in availability.available_slots:
-                    time_diff = abs(
-                        (datetime.combine(date.today(), slot.time) - 
-                         datetime.combine(date.today(), preferred_time)).total_seconds() / 60
-                    )
-                    if time_diff <= 30:  # Within 30 minutes
-                        alternatives.append(slot)
-                        break
-            except (ValueError, OverflowError):
+        # Skip anything outside business hours (11 AM - 10 PM) or off the slot grid
+        candidates = [
+            (candidate_date, minute) for candidate_date, minute in candidates
+            if OPENING_HOUR * 60 <= minute < CLOSING_HOUR * 60
+            and minute % SLOT_INTERVAL_MINUTES == 0
+        ]
+        if not candidates:
+            return []
+        
+        # Load tables once and the whole date window with a single range query
+        candidate_dates = {candidate_date for candidate_date, _ in candidates}
+        tables = await AvailabilityService._get_bookable_tables(
+            session, organization_id, restaurant_id, party_size
+        )
+        if not tables:
+            return []
+        reservations = await AvailabilityService._get_active_reservations(
+            session,
+            organization_id,
+            restaurant_id,
+            start_date=min(candidate_dates),
+            end_date=max(candidate_dates),
+        )
+        reservations_by_date: Dict[date, List[Reservation]] = defaultdict(list)
+        for reservation in reservations:
+            reservations_by_date[reservation.reservation_date].append(reservation)
+        indexes = {
+            candidate_date: OccupancyIndex(tables, reservations_by_date.get(candidate_date, ()))
+            for candidate_date in candidate_dates
+        }
+        
+        alternatives = []
+        other_days_matched = set()
+        for candidate_date, minute in candidates:
+            # Other days contribute only their closest free slot to the preferred time
+            if candidate_date != preferred_date and candidate_date in other_days_matched:
+                continue
+            slot = indexes[candidate_date].available_slot(
+                from_minutes(minute), duration_minutes, party_size
+            )
+            if slot is None:
                 continue
+            slot.slot_date = candidate_date
+            alternatives.append(slot)
+            if candidate_date != preferred_date:
+                other_days_matched.add(candidate_date)
         
-        # Sort by proximity to preferred time and date
-        alternatives.sort(key=lambda slot: abs(
-            (datetime.combine(date.today(), slot.time) - 
-             datetime.combine(date.today(), preferred_time)).total_seconds()
+        # Rank by proximity to preferred time, then to preferred date
+        alternatives.sort(key=lambda slot: (
+            abs(to_minutes(slot.time) - preferred_minute),
+            abs((slot.slot_date - preferred_date).days),
         ))
         
-        return alternatives[:5]  # Return top 5 alternatives
\ No newline at end of file
+        return alternatives[:5]  # Return top 5 alternatives
@@ -0,0 +1,61 @@
+"""
+Cache invalidation tags for table, reservation and availability data.
+
+Cached reads declare the tags they depend on; writes bump only the tags of
+the restaurant (and dates) they touch, so a booking at one restaurant never
+evicts another tenant's entries.
+"""
+
+from typing import Any, List
+from datetime import date, timedelta
+
+from app.shared.cache import cache_tag
+
+
+def availability_tags(restaurant_id: Any, *dates: date) -> List[str]:
+    """Tags for availability cached for a restaurant on the given dates."""
+    return [cache_tag("availability", restaurant_id)] + [
+        cache_tag("availability", restaurant_id, day) for day in dates
+    ]
+
+
+def availability_window_tags(restaurant_id: Any, center: date, days: int = 3) -> List[str]:
+    """Tags for availability computed over ``center`` ± ``days``."""
+    return availability_tags(
+        restaurant_id,
+        *(center + timedelta(days=offset) for offset in range(-days, days + 1)),
+    )
+
+
+def availability_month_tags(restaurant_id: Any, year: int, month: int) -> List[str]:
+    """Tags for a restaurant's monthly availability calendar."""
+    return [
+        cache_tag("availability", restaurant_id),
+        cache_tag("availability", restaurant_id, f"{year:04d}-{month:02d}"),
+    ]
+
+
+def reservation_list_tags(restaurant_id: Any) -> List[str]:
+    """Tags for cached reservation listings of a restaurant."""
+    return [cache_tag("reservations", restaurant_id)]
+
+
+def reservation_change_tags(restaurant_id: Any, *dates: date) -> List[str]:
+    """
+    Tags to bump when reservations change.
+
+    With dates, only those days (and their months) are invalidated; without,
+    every cached availability entry of the restaurant is.
+    """
+    tags = reservation_list_tags(restaurant_id)
+    if not dates:
+        return tags + [cache_tag("availability", restaurant_id)]
+    for day in dates:
+        tags.append(cache_tag("availability", restaurant_id, day))
+        tags.append(cache_tag("availability", restaurant_id, f"{day:%Y-%m}"))
+    return tags
+
+
+def table_change_tags(restaurant_id: Any) -> List[str]:
+    """Tags to bump when a restaurant's tables change."""
+    return [cache_tag("availability", restaurant_id)]
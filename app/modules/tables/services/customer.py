@@ -16,6 +16,7 @@ from app.modules.tables.models.availability import AvailabilityQuery
 from app.modules.tables.services.availability import AvailabilityService
 from app.modules.tables.services.reservation import ReservationService
 from app.modules.tables.services.waitlist import WaitlistService
+from app.modules.tables.services.cache_tags import availability_window_tags
 from app.shared.cache import cached, cache_invalidate_pattern
 from app.core.config import settings
 
@@ -24,7 +25,14 @@ class CustomerService:
     """Service for customer-facing reservation operations."""
     
     @staticmethod
-    @cached(ttl=settings.REDIS_TTL_AVAILABILITY, key_prefix="public_availability")
+    @cached(
+        ttl=settings.REDIS_TTL_AVAILABILITY,
+        key_prefix="public_availability",
+        # Misses fall back to alternatives within ±3 days
+        tags=lambda restaurant_id, reservation_date, **_: availability_window_tags(
+            restaurant_id, reservation_date
+        ),
+    )
     async def get_availability(
         session: AsyncSession,
         restaurant_id: str,
@@ -112,6 +120,7 @@ class CustomerService:
             "is_fully_booked": availability.is_fully_booked,
             "alternatives": [
                 {
+                    "date": slot.slot_date.isoformat() if slot.slot_date else None,
                     "time": slot.time.isoformat(),
                     "available_tables": slot.available_tables,
                     "total_capacity": slot.total_capacity,
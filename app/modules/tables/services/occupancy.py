@@ -0,0 +1,213 @@
+"""
+Per-day table occupancy index for availability lookups.
+
+Each table's bookings for a day are folded into a minute-resolution bitmap
+(a Python ``int``), so checking whether a table is free for
+``[start, start + duration)`` is a single mask-and-compare instead of a scan
+over every reservation. When NumPy is installed, whole-day grids are
+computed as a vectorized slot x table matrix instead.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import time
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from app.modules.tables.models.table import Table
+from app.modules.tables.models.reservation import Reservation
+from app.modules.tables.models.availability import AvailabilitySlot
+
+
+# Reservations that hold a table
+ACTIVE_RESERVATION_STATUSES = ("confirmed", "seated")
+
+# Table statuses that can still be booked ahead of time
+BOOKABLE_TABLE_STATUSES = ("available", "reserved")
+
+# Bookable window: a slot every 30 minutes from 11:00 to 22:00 inclusive
+OPENING_HOUR = 11
+CLOSING_HOUR = 22
+SLOT_INTERVAL_MINUTES = 30
+
+
+def to_minutes(value: time) -> int:
+    """Convert a time of day to minutes since midnight."""
+    return value.hour * 60 + value.minute
+
+
+def from_minutes(minutes: int) -> time:
+    """Convert minutes since midnight back to a time of day."""
+    return time(minutes // 60, minutes % 60)
+
+
+def iter_slot_minutes() -> Iterator[int]:
+    """Yield the start of every bookable slot, in minutes since midnight."""
+    return iter(range(
+        OPENING_HOUR * 60,
+        CLOSING_HOUR * 60 + 1,
+        SLOT_INTERVAL_MINUTES,
+    ))
+
+
+def _span_mask(start_minute: int, duration_minutes: int) -> int:
+    """Bitmap with one bit set per minute in ``[start, start + duration)``."""
+    return ((1 << max(duration_minutes, 0)) - 1) << start_minute
+
+
+class OccupancyIndex:
+    """
+    Occupancy of a restaurant's tables for a single day.
+
+    Built once from the day's tables and reservations, then answers
+    "which tables are free for [t, t + duration)" without touching the
+    database again.
+    """
+
+    def __init__(
+        self,
+        tables: Iterable[Table],
+        reservations: Iterable[Reservation] = (),
+    ):
+        self.tables: List[Table] = sorted(tables, key=lambda table: table.capacity)
+        self._busy: Dict[Any, int] = {table.id: 0 for table in self.tables}
+        self._intervals: Dict[Any, List[Tuple[int, int]]] = {
+            table.id: [] for table in self.tables
+        }
+        for reservation in reservations:
+            self.add_reservation(reservation)
+
+    def add_reservation(self, reservation: Reservation) -> None:
+        """Mark the reservation's table as busy for its duration."""
+        if reservation.status not in ACTIVE_RESERVATION_STATUSES:
+            return
+        if reservation.table_id not in self._busy:
+            return
+        start_minute = to_minutes(reservation.reservation_time)
+        self._busy[reservation.table_id] |= _span_mask(
+            start_minute, reservation.duration_minutes
+        )
+        self._intervals[reservation.table_id].append(
+            (start_minute, start_minute + max(reservation.duration_minutes, 0))
+        )
+
+    def free_tables(
+        self,
+        start: time,
+        duration_minutes: int,
+        party_size: int = 1,
+    ) -> List[Table]:
+        """Tables that seat ``party_size`` and are free for the whole span."""
+        mask = _span_mask(to_minutes(start), duration_minutes)
+        busy = self._busy
+        return [
+            table for table in self.tables
+            if table.capacity >= party_size and not busy[table.id] & mask
+        ]
+
+    def slot_availability(
+        self,
+        start: time,
+        duration_minutes: int,
+        party_size: int = 1,
+    ) -> Dict[str, int]:
+        """Count free tables and their combined capacity for a slot."""
+        free = self.free_tables(start, duration_minutes, party_size)
+        return {
+            "available_tables": len(free),
+            "total_capacity": sum(table.capacity for table in free),
+        }
+
+    def available_slot(
+        self,
+        start: time,
+        duration_minutes: int,
+        party_size: int = 1,
+    ) -> Optional[AvailabilitySlot]:
+        """Build an ``AvailabilitySlot`` for ``start``, or None if nothing is free."""
+        availability = self.slot_availability(start, duration_minutes, party_size)
+        if availability["available_tables"] == 0:
+            return None
+        return AvailabilitySlot(
+            time=start,
+            available_tables=availability["available_tables"],
+            total_capacity=availability["total_capacity"],
+            is_available=True,
+        )
+
+    def available_slots(
+        self,
+        duration_minutes: int,
+        party_size: int = 1,
+        vectorized: bool = False,
+    ) -> List[AvailabilitySlot]:
+        """
+        All bookable slots of the day that have at least one free table.
+
+        With ``vectorized=True`` (and NumPy installed) the whole grid is
+        computed from ``occupancy_matrix`` instead of slot by slot.
+        """
+        if vectorized and NUMPY_AVAILABLE and self.tables:
+            return self._available_slots_vectorized(duration_minutes, party_size)
+        
+        slots = []
+        for minute in iter_slot_minutes():
+            slot = self.available_slot(from_minutes(minute), duration_minutes, party_size)
+            if slot is not None:
+                slots.append(slot)
+        return slots
+
+    def occupancy_matrix(self, duration_minutes: int) -> "np.ndarray":
+        """
+        Boolean slot x table matrix; True where the table is free for the slot.
+
+        Rows follow ``iter_slot_minutes()``, columns follow ``self.tables``.
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for the vectorized occupancy matrix")
+        
+        duration = max(duration_minutes, 0)
+        slot_starts = np.fromiter(iter_slot_minutes(), dtype=np.int64)
+        horizon = int(slot_starts[-1]) + duration + 1
+        
+        # Per-minute booking counts via +1/-1 markers and a running sum
+        markers = np.zeros((len(self.tables), horizon + 1), dtype=np.int32)
+        for column, table in enumerate(self.tables):
+            for start, end in self._intervals[table.id]:
+                if start >= horizon or end <= start:
+                    continue
+                markers[column, start] += 1
+                markers[column, min(end, horizon)] -= 1
+        busy_minutes = np.cumsum(markers, axis=1)[:, :horizon] > 0
+        
+        # Prefix sums turn "any busy minute in [s, s + d)" into one subtraction
+        prefix = np.zeros((len(self.tables), horizon + 1), dtype=np.int32)
+        np.cumsum(busy_minutes, axis=1, out=prefix[:, 1:])
+        busy_in_slot = prefix[:, slot_starts + duration] - prefix[:, slot_starts]
+        return (busy_in_slot == 0).T
+
+    def _available_slots_vectorized(
+        self,
+        duration_minutes: int,
+        party_size: int,
+    ) -> List[AvailabilitySlot]:
+        """Vectorized equivalent of the per-slot loop in ``available_slots``."""
+        capacities = np.array([table.capacity for table in self.tables], dtype=np.int64)
+        free = self.occupancy_matrix(duration_minutes) & (capacities >= party_size)
+        available_tables = free.sum(axis=1)
+        total_capacity = free @ capacities
+        
+        slots = []
+        for row, minute in enumerate(iter_slot_minutes()):
+            if available_tables[row] == 0:
+                continue
+            slots.append(AvailabilitySlot(
+                time=from_minutes(minute),
+                available_tables=int(available_tables[row]),
+                total_capacity=int(total_capacity[row]),
+                is_available=True,
+            ))
+        return slots
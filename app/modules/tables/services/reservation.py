@@ -2,6 +2,7 @@ from typing import List, Optional, Dict, Any
 from datetime import date, time, datetime, timedelta
 from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import bindparam
 from sqlmodel import select, func, and_, or_
 from fastapi import HTTPException, status
 from app.modules.tables.models.reservation import (
@@ -13,16 +14,35 @@ from app.modules.tables.models.reservation import (
     ReservationNoShow,
 )
 from app.modules.tables.models.table import Table
-from app.shared.cache import cached, cache_invalidate_pattern
+from app.modules.tables.services.cache_tags import (
+    reservation_change_tags,
+    reservation_list_tags,
+)
+from app.shared.cache import cached, cache_invalidate_tags
+from app.core import metrics
 from app.core.config import settings
 
+# Built once so conflict checks skip statement construction and reuse the
+# compiled and prepared statement
+_OVERLAPPING_RESERVATIONS_QUERY = select(Reservation).where(
+    Reservation.table_id == bindparam("table_id"),
+    Reservation.reservation_date == bindparam("reservation_date"),
+    Reservation.status.in_(["confirmed", "seated"]),
+)
+_OVERLAPPING_RESERVATIONS_EXCLUDING_QUERY = _OVERLAPPING_RESERVATIONS_QUERY.where(
+    Reservation.id != bindparam("exclude_id")
+)
+
 
 class ReservationService:
     """Service for reservation management operations."""
     
     @staticmethod
-    @cache_invalidate_pattern("reservations:*")
-    @cache_invalidate_pattern("availability:*")
+    @cache_invalidate_tags(
+        lambda reservation, restaurant_id, **_: reservation_change_tags(
+            restaurant_id, reservation.reservation_date
+        )
+    )
     async def create_reservation(
         session: AsyncSession,
         reservation_data: ReservationCreate,
@@ -78,11 +98,16 @@ class ReservationService:
         session.add(reservation)
         await session.commit()
         await session.refresh(reservation)
+        metrics.reservations_booked.inc()
         
         return reservation
     
     @staticmethod
-    @cached(ttl=settings.REDIS_TTL_RESERVATIONS, key_prefix="reservations")
+    @cached(
+        ttl=settings.REDIS_TTL_RESERVATIONS,
+        key_prefix="reservations",
+        tags=lambda restaurant_id, **_: reservation_list_tags(restaurant_id),
+    )
     async def get_reservations(
         session: AsyncSession,
         organization_id: str,
@@ -145,8 +170,10 @@ class ReservationService:
         return result.first()
     
     @staticmethod
-    @cache_invalidate_pattern("reservations:*")
-    @cache_invalidate_pattern("availability:*")
+    @cache_invalidate_tags(
+        # The reservation may have moved dates, so every date is stale
+        lambda reservation, restaurant_id, **_: reservation_change_tags(restaurant_id)
+    )
     async def update_reservation(
         session: AsyncSession,
         reservation_id: str,
@@ -226,8 +253,11 @@ class ReservationService:
         return reservation
     
     @staticmethod
-    @cache_invalidate_pattern("reservations:*")
-    @cache_invalidate_pattern("availability:*")
+    @cache_invalidate_tags(
+        lambda reservation, restaurant_id, **_: reservation_change_tags(
+            restaurant_id, reservation.reservation_date
+        )
+    )
     async def cancel_reservation(
         session: AsyncSession,
         reservation_id: str,
@@ -259,6 +289,11 @@ class ReservationService:
         return reservation
     
     @staticmethod
+    @cache_invalidate_tags(
+        lambda reservation, restaurant_id, **_: reservation_change_tags(
+            restaurant_id, reservation.reservation_date
+        )
+    )
     async def check_in_reservation(
         session: AsyncSession,
         reservation_id: str,
@@ -322,6 +357,11 @@ class ReservationService:
         return reservation
     
     @staticmethod
+    @cache_invalidate_tags(
+        lambda reservation, restaurant_id, **_: reservation_change_tags(
+            restaurant_id, reservation.reservation_date
+        )
+    )
     async def assign_table(
         session: AsyncSession,
         reservation_id: str,
@@ -387,6 +427,11 @@ class ReservationService:
         return reservation
     
     @staticmethod
+    @cache_invalidate_tags(
+        lambda reservation, restaurant_id, **_: reservation_change_tags(
+            restaurant_id, reservation.reservation_date
+        )
+    )
     async def mark_no_show(
         session: AsyncSession,
         reservation_id: str,
@@ -419,7 +464,11 @@ class ReservationService:
         return reservation
     
     @staticmethod
-    @cached(ttl=settings.REDIS_TTL_RESERVATIONS, key_prefix="reservations")
+    @cached(
+        ttl=settings.REDIS_TTL_RESERVATIONS,
+        key_prefix="reservations",
+        tags=lambda restaurant_id, **_: reservation_list_tags(restaurant_id),
+    )
     async def get_today_reservations(
         session: AsyncSession,
         organization_id: str,
@@ -599,17 +648,15 @@ class ReservationService:
         end_datetime = start_datetime + timedelta(minutes=duration_minutes)
         
         # Check for overlapping reservations - simplified approach
-        overlapping_stmt = select(Reservation).where(
-            Reservation.table_id == table_id_uuid,
-            Reservation.reservation_date == reservation_date,
-            Reservation.status.in_(["confirmed", "seated"]),
-        )
+        overlapping_stmt = _OVERLAPPING_RESERVATIONS_QUERY
+        params = {"table_id": table_id_uuid, "reservation_date": reservation_date}
         
         if exclude_reservation_id:
             exclude_uuid = UUID(exclude_reservation_id) if isinstance(exclude_reservation_id, str) else exclude_reservation_id
-            overlapping_stmt = overlapping_stmt.where(Reservation.id != exclude_uuid)
+            overlapping_stmt = _OVERLAPPING_RESERVATIONS_EXCLUDING_QUERY
+            params["exclude_id"] = exclude_uuid
         
-        overlapping_result = await session.exec(overlapping_stmt)
+        overlapping_result = await session.exec(overlapping_stmt, params=params)
         overlapping_reservations = overlapping_result.all()
         
         # Check for time conflicts in Python (more reliable than complex SQL)
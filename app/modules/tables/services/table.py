@@ -9,7 +9,8 @@ from app.modules.tables.models.table import (
     TableStatusUpdate,
 )
 from app.modules.tables.models.reservation import Reservation
-from app.shared.cache import cached, cache_invalidate_pattern
+from app.modules.tables.services.cache_tags import table_change_tags
+from app.shared.cache import cached, cache_invalidate_pattern, cache_invalidate_tags
 from app.core.config import settings
 
 
@@ -18,6 +19,7 @@ class TableService:
     
     @staticmethod
     @cache_invalidate_pattern("tables:*")
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: table_change_tags(restaurant_id))
     async def create_table(
         session: AsyncSession,
         table_data: TableCreate,
@@ -104,6 +106,7 @@ class TableService:
     
     @staticmethod
     @cache_invalidate_pattern("tables:*")
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: table_change_tags(restaurant_id))
     async def update_table(
         session: AsyncSession,
         table_id: str,
@@ -151,6 +154,7 @@ class TableService:
         return table
     
     @staticmethod
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: table_change_tags(restaurant_id))
     async def delete_table(
         session: AsyncSession,
         table_id: str,
@@ -189,6 +193,7 @@ class TableService:
     
     @staticmethod
     @cache_invalidate_pattern("tables:*")
+    @cache_invalidate_tags(lambda result, restaurant_id, **_: table_change_tags(restaurant_id))
     async def update_table_status(
         session: AsyncSession,
         table_id: str,
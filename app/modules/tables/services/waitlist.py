@@ -10,6 +10,7 @@ from app.modules.tables.models.waitlist import (
     WaitlistNotify,
 )
 from app.modules.tables.services.availability import AvailabilityService
+from app.modules.tables.services.occupancy import OccupancyIndex
 from app.modules.tables.models.availability import AvailabilityQuery
 from app.shared.cache import cached, cache_invalidate_pattern
 from app.core.config import settings
@@ -316,6 +317,17 @@ class WaitlistService:
         
         notification_suggestions = []
         
+        # One occupancy index per preferred date, built from a single table load
+        indexes = await WaitlistService._build_occupancy_indexes(
+            session=session,
+            organization_id=organization_id,
+            restaurant_id=restaurant_id,
+            entries=[
+                entry for entry in waitlist_entries
+                if entry.preferred_date and entry.preferred_time
+            ],
+        )
+        
         for entry in waitlist_entries:
             if entry.preferred_date and entry.preferred_time:
                 # Check availability for this customer's preferences
@@ -326,11 +338,8 @@ class WaitlistService:
                     duration_minutes=90,
                 )
                 
-                availability = await AvailabilityService.get_available_slots(
-                    session=session,
-                    organization_id=organization_id,
-                    restaurant_id=restaurant_id,
-                    query=query,
+                availability = AvailabilityService.availability_from_index(
+                    indexes[entry.preferred_date], query
                 )
                 
                 if not availability.is_fully_booked and availability.available_slots:
@@ -370,6 +379,40 @@ class WaitlistService:
         
         return notification_suggestions
     
+    @staticmethod
+    async def _build_occupancy_indexes(
+        session: AsyncSession,
+        organization_id: str,
+        restaurant_id: str,
+        entries: List[ReservationWaitlist],
+    ) -> Dict[date, OccupancyIndex]:
+        """Build an occupancy index for every preferred date among waitlist entries."""
+        if not entries:
+            return {}
+        
+        preferred_dates = {entry.preferred_date for entry in entries}
+        tables = await AvailabilityService._get_bookable_tables(
+            session,
+            organization_id,
+            restaurant_id,
+            min_capacity=min(entry.party_size for entry in entries),
+        )
+        reservations = await AvailabilityService._get_active_reservations(
+            session,
+            organization_id,
+            restaurant_id,
+            start_date=min(preferred_dates),
+            end_date=max(preferred_dates),
+        ) if tables else []
+        
+        return {
+            preferred_date: OccupancyIndex(
+                tables,
+                (r for r in reservations if r.reservation_date == preferred_date),
+            )
+            for preferred_date in preferred_dates
+        }
+    
     @staticmethod
     def _calculate_priority_score(
         party_size: int,
@@ -1,14 +1,14 @@
-from typing import Optional, Dict, Any
+from typing import AsyncGenerator, Optional, Dict, Any
 from uuid import UUID
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
-from app.shared.database.session import get_session
+from app.shared.database.session import get_session, read_session
 from app.shared.models.user import User
 from app.shared.models.organization import Organization
 from app.shared.models.restaurant import Restaurant
 from app.shared.auth.security import decode_user_token
+from app.shared.auth.tenant_cache import load_tenant_records
 
 # Bearer token security scheme  
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -54,6 +54,7 @@ async def get_current_user_token(
 
 
 async def get_current_user(
+    request: Request,
     token_payload: Dict[str, Any] = Depends(get_current_user_token),
     session: AsyncSession = Depends(get_session),
 ) -> User:
@@ -74,17 +75,18 @@ async def get_current_user(
             detail="Invalid user ID format",
         )
     
-    statement = select(User).where(User.id == user_uuid, User.is_active == True)
-    result = await session.exec(statement)
-    user = result.first()
+    # One joined query for user, organization and restaurant, cached per worker
+    records = await load_tenant_records(session, user_uuid)
     
-    if not user:
+    if not records:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
     
-    return user
+    # Reused by get_tenant_context for this request
+    request.state.tenant_records = records
+    return records.user
 
 
 async def get_current_active_user(
@@ -99,6 +101,14 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_read_session(
+    current_user: User = Depends(get_current_active_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for authenticated read-only endpoints, on the replica when safe for the user's restaurant."""
+    async for session in read_session(current_user.restaurant_id):
+        yield session
+
+
 class TenantContext:
     """Tenant context for multi-tenant operations."""
     
@@ -122,20 +132,17 @@ class TenantContext:
 
 
 async def get_tenant_context(
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     session: AsyncSession = Depends(get_session),
 ) -> TenantContext:
     """Get tenant context for the current user."""
-    # Get organization
-    org_uuid = UUID(current_user.organization_id) if isinstance(current_user.organization_id, str) else current_user.organization_id
-    org_statement = select(Organization).where(
-        Organization.id == org_uuid,
-        Organization.is_active == True,
-    )
-    org_result = await session.exec(org_statement)
-    organization = org_result.first()
+    # Organization and restaurant are normally loaded along with the user
+    records = getattr(request.state, "tenant_records", None)
+    if records is None or records.user.id != current_user.id:
+        records = await load_tenant_records(session, current_user.id)
     
-    if not organization:
+    if not records or not records.organization.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Organization not found or inactive",
@@ -144,15 +151,8 @@ async def get_tenant_context(
     # Get restaurant if user has one
     restaurant = None
     if current_user.restaurant_id:
-        rest_uuid = UUID(current_user.restaurant_id) if isinstance(current_user.restaurant_id, str) else current_user.restaurant_id
-        rest_statement = select(Restaurant).where(
-            Restaurant.id == rest_uuid,
-            Restaurant.is_active == True,
-        )
-        rest_result = await session.exec(rest_statement)
-        restaurant = rest_result.first()
-        
-        if not restaurant:
+        restaurant = records.restaurant
+        if not restaurant or not restaurant.is_active:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Restaurant not found or inactive",
@@ -160,7 +160,7 @@ async def get_tenant_context(
     
     return TenantContext(
         user=current_user,
-        organization=organization,
+        organization=records.organization,
         restaurant=restaurant,
     )
 
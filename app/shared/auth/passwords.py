@@ -0,0 +1,113 @@
+"""
+Password hashing off the event loop.
+
+bcrypt takes 100-300 ms of CPU per hash or verification. Run inline, it
+blocks every other request on the worker, and at shift change all staff log
+in at once. Here each hashing operation runs on a small dedicated thread
+pool; bcrypt releases the GIL, so this parallelizes. At most
+``PASSWORD_HASH_WORKERS`` operations run at once and at most
+``PASSWORD_HASH_MAX_QUEUE`` wait behind them. Beyond that, or after
+``PASSWORD_HASH_QUEUE_TIMEOUT`` seconds of waiting, ``PasswordHashingBusy``
+is raised; the application maps it to a 503 with ``Retry-After`` so the
+client can retry instead of piling up.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.shared.auth.security import pwd_context
+
+
+class PasswordHashingBusy(RuntimeError):
+    """Too many password operations are queued on this worker."""
+
+
+class PasswordHasher:
+    """Bounded executor and admission queue for bcrypt operations."""
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 64, queue_timeout: float = 10.0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.waiting = 0
+        self.running = 0
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(pwd_context.verify, password, password_hash)
+
+    async def verify_and_update(
+        self, password: str, password_hash: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify, and return a new hash if the stored one uses outdated
+        parameters (e.g. a different bcrypt cost than configured).
+        """
+        return await self._run(pwd_context.verify_and_update, password, password_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        slots = self._get_slots()
+        if slots.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHashingBusy("Too many concurrent password operations, retry shortly")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PasswordHashingBusy("Timed out waiting for a password hashing slot")
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), func, *args
+            )
+        finally:
+            self.running -= 1
+            slots.release()
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they are first used on
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._loop = loop
+        return self._slots
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
@@ -1,11 +1,22 @@
 from datetime import datetime, timedelta
 from typing import Optional, Any, Dict
-from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.shared.auth.tokens import InvalidToken, VerifiedTokenCache, get_jwt_backend
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+# Token signing/verification backend and cache of already-verified tokens
+jwt_backend = get_jwt_backend(settings.JWT_BACKEND, settings.SECRET_KEY, settings.ALGORITHM)
+verified_tokens = VerifiedTokenCache(
+    max_entries=settings.JWT_CACHE_MAX_ENTRIES,
+    max_ttl=settings.JWT_CACHE_TTL,
+)
 
 
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -18,7 +29,7 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
         )
     
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt_backend.encode(to_encode)
     return encoded_jwt
 
 
@@ -35,14 +46,12 @@ def get_password_hash(password: str) -> str:
 def decode_access_token(token: str) -> Optional[str]:
     """Decode JWT token and return subject."""
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = jwt_backend.decode(token)
         subject: str = payload.get("sub")
         if subject is None:
             return None
         return subject
-    except JWTError:
+    except InvalidToken:
         return None
 
 
@@ -83,16 +92,22 @@ def create_user_access_token(
     to_encode = create_token_payload(user_id, email, organization_id, restaurant_id, role)
     to_encode.update({"exp": expire})
     
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt_backend.encode(to_encode)
     return encoded_jwt
 
 
 def decode_user_token(token: str) -> Optional[Dict[str, Any]]:
-    """Decode user JWT token and return payload."""
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+    """
+    Decode user JWT token and return payload.
+    
+    Verified payloads are cached until the token expires; treat them as read-only.
+    """
+    payload = verified_tokens.get(token)
+    if payload is not None:
         return payload
-    except JWTError:
-        return None
\ No newline at end of file
+    try:
+        payload = jwt_backend.decode(token)
+    except InvalidToken:
+        return None
+    verified_tokens.set(token, payload)
+    return payload
\ No newline at end of file
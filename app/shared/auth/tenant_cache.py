@@ -0,0 +1,174 @@
+"""
+Per-worker cache of the user, organization and restaurant behind a token.
+
+Authenticated requests resolve their tenant with one joined query and keep
+the result for ``AUTH_TENANT_CACHE_TTL`` seconds. Committed changes to
+users, organizations or restaurants (deactivation, role changes, moves
+between restaurants) drop the affected entries in every worker via the
+cache invalidation channel; the TTL bounds staleness if a message is missed.
+
+Cached records are snapshots copied out of the loading session, so a
+rollback or close of that session cannot expire them. They are shared
+between requests: treat them as read-only and load a fresh copy before
+modifying one.
+"""
+
+import asyncio
+from typing import Dict, Iterable, NamedTuple, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import bindparam, event
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.shared.cache import cache_service
+from app.shared.cache.memory import MemoryCache
+from app.shared.models.organization import Organization
+from app.shared.models.restaurant import Restaurant
+from app.shared.models.user import User
+
+# Invalidation message kind on the cache invalidation channel
+TENANT_INVALIDATION_KIND = "tenant"
+
+# Session.info key collecting ids of changed users/organizations/restaurants
+CHANGED_TENANT_RECORDS_KEY = "changed_tenant_records"
+
+# Rough cost of one cached entry; ORM rows are not worth serializing to measure
+TENANT_ENTRY_SIZE = 2048
+
+
+class TenantRecords(NamedTuple):
+    """Rows a token resolves to; ``restaurant`` is None for organization-level users."""
+    user: User
+    organization: Organization
+    restaurant: Optional[Restaurant]
+
+    def snapshot(self) -> "TenantRecords":
+        """Column-only copies of the rows that belong to no session; relationships are not loaded."""
+        return TenantRecords(*(
+            type(record).model_validate(record.model_dump()) if record is not None else None
+            for record in self
+        ))
+
+
+class TenantCache:
+    """LRU/TTL cache of ``TenantRecords`` by user id, invalidated by any record id."""
+
+    def __init__(self, ttl: int = 30, max_entries: int = 10_000):
+        self.ttl = ttl
+        self._records = MemoryCache(
+            max_entries=max_entries,
+            max_bytes=max_entries * TENANT_ENTRY_SIZE,
+            size_of=lambda key, value: TENANT_ENTRY_SIZE,
+        )
+        # Record id -> user ids whose cached entry includes that record
+        self._dependents: Dict[str, Set[str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, user_id: UUID) -> Optional[TenantRecords]:
+        if not self.enabled:
+            return None
+        return self._records.get(str(user_id))
+
+    def set(self, records: TenantRecords) -> None:
+        if not self.enabled:
+            return
+        user_id = str(records.user.id)
+        self._records.set(user_id, records, self.ttl)
+        for record in records:
+            if record is not None:
+                self._dependents.setdefault(str(record.id), set()).add(user_id)
+
+    def invalidate(self, record_ids: Iterable[str]) -> None:
+        """Drop every entry that includes one of these user/organization/restaurant ids."""
+        for record_id in record_ids:
+            for user_id in self._dependents.pop(str(record_id), ()):
+                self._records.delete(user_id)
+
+    def clear(self) -> None:
+        self._records.clear()
+        self._dependents.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+tenant_cache = TenantCache(
+    ttl=settings.AUTH_TENANT_CACHE_TTL,
+    max_entries=settings.AUTH_TENANT_CACHE_MAX_ENTRIES,
+)
+cache_service.register_invalidation_target(TENANT_INVALIDATION_KIND, tenant_cache)
+
+
+# Built once: it runs on every authenticated request that misses the cache
+_TENANT_RECORDS_QUERY = (
+    select(User, Organization, Restaurant)
+    .join(Organization, Organization.id == User.organization_id)
+    .outerjoin(Restaurant, Restaurant.id == User.restaurant_id)
+    .where(User.id == bindparam("user_id"), User.is_active == True)
+)
+
+
+async def load_tenant_records(session: AsyncSession, user_id: UUID) -> Optional[TenantRecords]:
+    """
+    Active user with its organization and restaurant in one query.
+
+    Returns None for an unknown or inactive user; inactive organizations and
+    restaurants are returned as-is for the caller to reject.
+    """
+    records = tenant_cache.get(user_id)
+    if records is not None:
+        return records
+
+    result = await session.exec(_TENANT_RECORDS_QUERY, params={"user_id": user_id})
+    row = result.first()
+    if row is None:
+        return None
+
+    # The request gets the same snapshot it caches, so nothing it holds is
+    # tied to a session that may be rolled back or shared across requests
+    records = TenantRecords(*row).snapshot()
+    tenant_cache.set(records)
+    return records
+
+
+# Publish tasks in flight; the event loop only keeps weak references
+_pending_publishes: Set[asyncio.Task] = set()
+
+
+def _publish_invalidation(record_ids: Set[str]) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(
+        cache_service.publish_invalidation(TENANT_INVALIDATION_KIND, sorted(record_ids))
+    )
+    _pending_publishes.add(task)
+    task.add_done_callback(_pending_publishes.discard)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_records(session: Session, flush_context) -> None:
+    changed: Set[str] = session.info.setdefault(CHANGED_TENANT_RECORDS_KEY, set())
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, (User, Organization, Restaurant)):
+            changed.add(str(instance.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_records(session: Session) -> None:
+    changed = session.info.pop(CHANGED_TENANT_RECORDS_KEY, None)
+    if changed:
+        tenant_cache.invalidate(changed)
+        _publish_invalidation(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_records(session: Session) -> None:
+    session.info.pop(CHANGED_TENANT_RECORDS_KEY, None)
@@ -0,0 +1,156 @@
+"""
+JWT backends and the verified-token cache.
+
+Signature verification is the expensive part of authenticating a request,
+and clients such as kitchen displays poll with the same token several times
+a second. Tokens that verified successfully are remembered by digest until
+their ``exp`` (capped at ``JWT_CACHE_TTL``), so repeat requests cost a hash
+and a dictionary lookup. Tokens that fail verification are never cached.
+
+PyJWT is used for encoding and decoding when installed (it verifies
+noticeably faster than python-jose); python-jose is the fallback.
+"""
+
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from jose import JWTError, jwt as jose_jwt
+
+from app.shared.cache.memory import MemoryCache
+
+try:
+    import jwt as pyjwt
+    PYJWT_AVAILABLE = True
+except ImportError:
+    PYJWT_AVAILABLE = False
+
+
+# Rough cost of one cached payload; claims are small and fixed-shape
+TOKEN_ENTRY_SIZE = 512
+
+
+class InvalidToken(ValueError):
+    """Token is malformed, expired or has a bad signature."""
+
+
+class JWTBackend(ABC):
+    """Encodes and verifies signed tokens."""
+
+    name = "base"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    @abstractmethod
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """Signed token carrying ``claims``."""
+
+    @abstractmethod
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verified claims; raises ``InvalidToken``."""
+
+
+class JoseBackend(JWTBackend):
+    """python-jose."""
+
+    name = "jose"
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return jose_jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return jose_jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except JWTError as e:
+            raise InvalidToken(str(e)) from e
+
+
+class PyJWTBackend(JWTBackend):
+    """PyJWT: same tokens as python-jose, cheaper verification."""
+
+    name = "pyjwt"
+
+    def __init__(self, secret_key: str, algorithm: str):
+        if not PYJWT_AVAILABLE:
+            raise RuntimeError("PyJWT is required for the pyjwt JWT backend")
+        super().__init__(secret_key, algorithm)
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return pyjwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return pyjwt.decode(
+                token,
+                self.secret_key,
+                algorithms=[self.algorithm],
+                # python-jose does not check iat; keep both backends equivalent
+                options={"verify_iat": False},
+            )
+        except pyjwt.PyJWTError as e:
+            raise InvalidToken(str(e)) from e
+
+
+JWT_BACKENDS: Dict[str, type] = {
+    JoseBackend.name: JoseBackend,
+    PyJWTBackend.name: PyJWTBackend,
+}
+
+
+def get_jwt_backend(name: str, secret_key: str, algorithm: str) -> JWTBackend:
+    """Backend by name; ``auto`` picks PyJWT when installed, else python-jose."""
+    if name == "auto":
+        name = PyJWTBackend.name if PYJWT_AVAILABLE else JoseBackend.name
+    if name not in JWT_BACKENDS:
+        raise ValueError(f"Unknown JWT backend: {name}")
+    return JWT_BACKENDS[name](secret_key, algorithm)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of token digests to verified claims, expiring with the token."""
+
+    def __init__(self, max_entries: int = 10_000, max_ttl: float = 300.0):
+        self.max_ttl = max_ttl
+        self._payloads = MemoryCache(
+            max_entries=max_entries,
+            max_bytes=max_entries * TOKEN_ENTRY_SIZE,
+            size_of=lambda key, value: TOKEN_ENTRY_SIZE,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_ttl > 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        return self._payloads.get(token_digest(token))
+
+    def set(self, token: str, payload: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        ttl = self.max_ttl
+        expires = payload.get("exp")
+        if isinstance(expires, datetime):
+            expires = expires.timestamp()
+        if isinstance(expires, (int, float)):
+            ttl = min(ttl, expires - time.time())
+        if ttl > 0:
+            self._payloads.set(token_digest(token), payload, ttl)
+
+    def clear(self) -> None:
+        self._payloads.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._payloads.stats()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
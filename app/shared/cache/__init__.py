@@ -1,5 +1,35 @@
 """Cache module with Redis support."""
 
-from .service import cache_service, cached, cache_invalidate_pattern, cache_key
+from .memory import MemoryCache
+from .codec import (
+    CacheCodec,
+    JSONCodec,
+    OrjsonCodec,
+    get_codec,
+    serialize_cache_value,
+    deserialize_cache_value,
+)
+from .service import (
+    cache_service,
+    cached,
+    cache_invalidate_pattern,
+    cache_invalidate_tags,
+    cache_key,
+    cache_tag,
+)
 
-__all__ = ["cache_service", "cached", "cache_invalidate_pattern", "cache_key"]
\ No newline at end of file
+__all__ = [
+    "MemoryCache",
+    "CacheCodec",
+    "JSONCodec",
+    "OrjsonCodec",
+    "get_codec",
+    "cache_service",
+    "cached",
+    "cache_invalidate_pattern",
+    "cache_invalidate_tags",
+    "cache_key",
+    "cache_tag",
+    "serialize_cache_value",
+    "deserialize_cache_value",
+]
\ No newline at end of file
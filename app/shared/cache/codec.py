@@ -0,0 +1,240 @@
+"""
+Codecs turning cache values into the payloads stored in Redis.
+
+Values first go through a typed wire form: Decimal, UUID, date, time and
+datetime are tagged so they come back as the same types, and Pydantic /
+SQLModel instances are stored with their class path and a fingerprint of
+their fields, so they are rebuilt with ``model_validate``. If the model has
+changed since the entry was written, the entry is treated as a miss. Payloads
+carry a format version prefix, so entries in an older format are dropped the
+same way.
+
+Only models defined in the application's own packages are rebuilt, and they
+are looked up among already imported classes: a payload can never make a
+worker import a module or instantiate an arbitrary type.
+"""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Union
+from uuid import UUID
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Bump when the wire form changes; older payloads then read as misses
+CACHE_FORMAT_VERSION = 1
+
+# Key marking a tagged value in the wire form
+TYPE_TAG = "__cache_type__"
+
+# Packages whose Pydantic/SQLModel classes may be rebuilt from a payload
+CACHEABLE_MODEL_PACKAGES = ("app",)
+
+Payload = Union[str, bytes]
+
+
+class StaleCacheEntry(ValueError):
+    """A payload written in an older format or for an older model version."""
+
+
+def _model_path(model_class: type) -> str:
+    return f"{model_class.__module__}:{model_class.__qualname__}"
+
+
+# Class path -> model class for every allowed model imported so far
+_cacheable_models: Dict[str, type] = {}
+
+
+def _is_cacheable(model_class: type) -> bool:
+    package = model_class.__module__.split(".", 1)[0]
+    return package in CACHEABLE_MODEL_PACKAGES
+
+
+def _refresh_cacheable_models() -> None:
+    pending = list(BaseModel.__subclasses__())
+    while pending:
+        model_class = pending.pop()
+        pending.extend(model_class.__subclasses__())
+        if _is_cacheable(model_class):
+            _cacheable_models[_model_path(model_class)] = model_class
+
+
+def _resolve_model(path: str) -> type:
+    """Allowed model class for a stored class path; unknown paths read as stale."""
+    model_class = _cacheable_models.get(path)
+    if model_class is None:
+        # Models imported since the last lookup
+        _refresh_cacheable_models()
+        model_class = _cacheable_models.get(path)
+    if model_class is None:
+        raise StaleCacheEntry(f"{path} is not a cacheable model")
+    return model_class
+
+
+@lru_cache(maxsize=None)
+def model_fingerprint(model_class: type) -> str:
+    """Short hash of a model's field names and types."""
+    fields = sorted(
+        (name, repr(field.annotation))
+        for name, field in model_class.model_fields.items()
+    )
+    return hashlib.sha1(repr(fields).encode("utf-8")).hexdigest()[:12]
+
+
+def serialize_cache_value(value: Any) -> Any:
+    """
+    Convert a value to its JSON-safe wire form.
+
+    Pydantic/SQLModel instances are dumped in JSON mode and tagged with their
+    class and field fingerprint so they can be rebuilt on read.
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, BaseModel):
+        model_class = type(value)
+        return {
+            TYPE_TAG: "model",
+            "model": _model_path(model_class),
+            "schema": model_fingerprint(model_class),
+            "data": value.model_dump(mode="json"),
+        }
+    if isinstance(value, dict):
+        return {str(key): serialize_cache_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], BaseModel):
+        model_class = type(value[0])
+        if all(type(item) is model_class for item in value):
+            # Lists of one model type share a single tag
+            return {
+                TYPE_TAG: "models",
+                "model": _model_path(model_class),
+                "schema": model_fingerprint(model_class),
+                "data": [item.model_dump(mode="json") for item in value],
+            }
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [serialize_cache_value(item) for item in value]
+    if isinstance(value, Decimal):
+        return {TYPE_TAG: "decimal", "value": str(value)}
+    if isinstance(value, UUID):
+        return {TYPE_TAG: "uuid", "value": str(value)}
+    if isinstance(value, datetime):
+        return {TYPE_TAG: "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {TYPE_TAG: "date", "value": value.isoformat()}
+    if isinstance(value, time):
+        return {TYPE_TAG: "time", "value": value.isoformat()}
+    if isinstance(value, Enum):
+        return serialize_cache_value(value.value)
+    return str(value)
+
+
+_SCALAR_DECODERS = {
+    "decimal": Decimal,
+    "uuid": UUID,
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+}
+
+
+def deserialize_cache_value(wire: Any) -> Any:
+    """
+    Rebuild a value from the wire form produced by ``serialize_cache_value``.
+
+    Raises ``StaleCacheEntry`` if a stored model no longer matches its class.
+    """
+    if isinstance(wire, list):
+        return [deserialize_cache_value(item) for item in wire]
+    if not isinstance(wire, dict):
+        return wire
+
+    type_tag = wire.get(TYPE_TAG)
+    if type_tag is None:
+        return {key: deserialize_cache_value(item) for key, item in wire.items()}
+    if type_tag in ("model", "models"):
+        model_class = _resolve_model(wire["model"])
+        if wire.get("schema") != model_fingerprint(model_class):
+            raise StaleCacheEntry(f"{wire['model']} changed since the entry was cached")
+        if type_tag == "models":
+            return [model_class.model_validate(item) for item in wire["data"]]
+        return model_class.model_validate(wire["data"])
+    return _SCALAR_DECODERS[type_tag](wire["value"])
+
+
+class CacheCodec(ABC):
+    """Encodes values to versioned payloads and back."""
+
+    name = "base"
+
+    def __init__(self):
+        self.prefix = f"{self.name}:{CACHE_FORMAT_VERSION}:"
+
+    @abstractmethod
+    def dumps(self, value: Any) -> Payload:
+        """Encode ``value`` to a prefixed payload."""
+
+    @abstractmethod
+    def loads(self, payload: Payload) -> Any:
+        """Decode a payload written by ``dumps``; raises ``StaleCacheEntry`` if it can't."""
+
+    def _strip_prefix(self, payload: Payload) -> Payload:
+        prefix = self.prefix.encode("utf-8") if isinstance(payload, bytes) else self.prefix
+        if not payload.startswith(prefix):
+            raise StaleCacheEntry("Cache payload has an unknown format version")
+        return payload[len(prefix):]
+
+
+class JSONCodec(CacheCodec):
+    """Standard library JSON."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> Payload:
+        return self.prefix + json.dumps(serialize_cache_value(value), separators=(",", ":"))
+
+    def loads(self, payload: Payload) -> Any:
+        return deserialize_cache_value(json.loads(self._strip_prefix(payload)))
+
+
+class OrjsonCodec(CacheCodec):
+    """orjson: faster encoding than ``json``, emitted as compact bytes."""
+
+    name = "orjson"
+
+    def __init__(self):
+        if not ORJSON_AVAILABLE:
+            raise RuntimeError("orjson is required for the orjson cache codec")
+        super().__init__()
+        self._prefix_bytes = self.prefix.encode("utf-8")
+
+    def dumps(self, value: Any) -> Payload:
+        return self._prefix_bytes + orjson.dumps(serialize_cache_value(value))
+
+    def loads(self, payload: Payload) -> Any:
+        return deserialize_cache_value(orjson.loads(self._strip_prefix(payload)))
+
+
+CODECS: Dict[str, type] = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def get_codec(name: str = "auto") -> CacheCodec:
+    """Codec by name; ``auto`` picks orjson when installed, else json."""
+    if name == "auto":
+        name = OrjsonCodec.name if ORJSON_AVAILABLE else JSONCodec.name
+    if name not in CODECS:
+        raise ValueError(f"Unknown cache codec: {name}")
+    return CODECS[name]()
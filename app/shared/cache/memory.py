@@ -0,0 +1,206 @@
+"""
+Bounded in-process cache used when Redis is unavailable.
+Entries are evicted least-recently-used once the entry or byte budget is
+exceeded, and expired entries are swept in the background.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Characters that make a key pattern a glob
+GLOB_CHARACTERS = "*?["
+
+
+class MemoryCacheEntry(NamedTuple):
+    """A cached value with its absolute expiry and estimated size."""
+    value: Any
+    expires_at: float
+    size: int
+
+
+def _estimate_size(key: str, value: Any) -> int:
+    """Approximate memory cost of an entry from its serialized size."""
+    if isinstance(value, (str, bytes)):
+        return len(key) + len(value)
+    try:
+        payload = json.dumps(value, default=str)
+    except (TypeError, ValueError):
+        payload = repr(value)
+    return len(key) + len(payload)
+
+
+def _key_namespace(key: str) -> str:
+    """First ``:``-separated segment of a key, used for the prefix index."""
+    return key.split(":", 1)[0]
+
+
+class MemoryCache:
+    """
+    LRU cache with per-entry TTL and entry/byte budgets.
+
+    Keys are indexed by their first ``:``-separated segment so pattern
+    invalidation only looks at keys in the matching namespace.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        sweep_interval: float = 60.0,
+        on_evict: Optional[Callable[[str], None]] = None,
+        size_of: Callable[[str, Any], int] = _estimate_size,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.on_evict = on_evict
+        self.size_of = size_of
+        self._entries: "OrderedDict[str, MemoryCacheEntry]" = OrderedDict()
+        self._namespaces: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live value and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value, evicting least-recently-used entries to stay in budget."""
+        if key in self._entries:
+            self._remove(key)
+        entry = MemoryCacheEntry(
+            value=value,
+            expires_at=time.monotonic() + ttl,
+            size=self.size_of(key, value),
+        )
+        if entry.size > self.max_bytes:
+            logger.debug(f"Memory cache entry {key} exceeds the byte budget, not cached")
+            return
+        self._entries[key] = entry
+        self._namespaces.setdefault(_key_namespace(key), set()).add(key)
+        self._bytes += entry.size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(oldest_key)
+
+    def delete(self, key: str) -> bool:
+        """Remove a key; returns whether it was present."""
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Remove every key matching a glob pattern; returns the number removed."""
+        namespace = _key_namespace(pattern)
+        if any(char in namespace for char in GLOB_CHARACTERS):
+            candidates = list(self._entries)
+        else:
+            candidates = list(self._namespaces.get(namespace, ()))
+
+        deleted = 0
+        for key in candidates:
+            if fnmatchcase(key, pattern):
+                self._remove(key)
+                deleted += 1
+        return deleted
+
+    def sweep_expired(self) -> int:
+        """Drop every expired entry; returns the number removed."""
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._namespaces.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, budget and hit/eviction counters for sizing the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "namespaces": {
+                namespace: len(keys) for namespace, keys in self._namespaces.items()
+            },
+        }
+
+    def start_sweeper(self) -> None:
+        """Start the background TTL sweep on the running event loop."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    async def stop_sweeper(self) -> None:
+        """Cancel the background TTL sweep."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = self.sweep_expired()
+                if removed:
+                    logger.debug(f"Memory cache swept {removed} expired entries")
+            except Exception as e:
+                logger.error(f"Memory cache sweep error: {e}")
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        namespace = _key_namespace(key)
+        keys = self._namespaces.get(namespace)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._namespaces[namespace]
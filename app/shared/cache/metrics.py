@@ -0,0 +1,155 @@
+"""
+Cache instrumentation: per key-prefix counters and latency histograms.
+
+Keys are grouped by their first ``:``-separated segment (the ``key_prefix``
+of ``@cached`` entries), so the report reads per feature, e.g.
+``availability`` or ``kitchen_orders``.
+"""
+
+import bisect
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.metrics import cache_events
+
+# Upper bounds in milliseconds; the last bucket catches everything slower
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0,
+)
+
+COUNTERS = (
+    "hits",
+    "misses",
+    "stale_hits",
+    "sets",
+    "deletes",
+    "evictions",
+    "invalidations",
+    "invalidated_keys",
+)
+
+
+def key_prefix_of(key: str) -> str:
+    """Metrics group of a cache key or tag: its first ``:``-separated segment."""
+    return key.split(":", 1)[0]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds."""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS_MS):
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 4) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 4),
+            "buckets": {
+                **{str(bound): count for bound, count in zip(self.buckets, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+class CacheTimer:
+    """Time spent in cache get/set calls by one unit of work, e.g. a request."""
+
+    def __init__(self):
+        self.total_ms = 0.0
+        self.calls = 0
+
+
+_current_timer: ContextVar[Optional[CacheTimer]] = ContextVar("cache_timer", default=None)
+
+
+@contextmanager
+def track_cache_time() -> Iterator[CacheTimer]:
+    """Accumulate cache latency observed in the current context."""
+    timer = CacheTimer()
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+class CacheMetrics:
+    """Counters and get/set latency histograms per key prefix."""
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(COUNTERS, 0)
+        )
+        self._latency: Dict[Tuple[str, str], LatencyHistogram] = defaultdict(LatencyHistogram)
+
+    def increment(self, key_prefix: str, counter: str, amount: int = 1) -> None:
+        self._counters[key_prefix][counter] += amount
+        cache_events.labels(key_prefix, counter).inc(amount)
+
+    def record_invalidation(self, key_prefix: str, invalidated_keys: int) -> None:
+        """Count one invalidation and how many keys/tags it fanned out to."""
+        counters = self._counters[key_prefix]
+        counters["invalidations"] += 1
+        counters["invalidated_keys"] += invalidated_keys
+        cache_events.labels(key_prefix, "invalidations").inc()
+        cache_events.labels(key_prefix, "invalidated_keys").inc(invalidated_keys)
+
+    def observe_latency(self, operation: str, key_prefix: str, duration_ms: float) -> None:
+        self._latency[(operation, key_prefix)].observe(duration_ms)
+        timer = _current_timer.get()
+        if timer is not None:
+            timer.total_ms += duration_ms
+            timer.calls += 1
+
+    def counters(self) -> Dict[str, Dict[str, Any]]:
+        """Counters and hit ratio per key prefix."""
+        report = {}
+        for key_prefix, counters in self._counters.items():
+            lookups = counters["hits"] + counters["misses"]
+            report[key_prefix] = {
+                **counters,
+                "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
+        return report
+
+    def latency(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Latency histograms as ``{operation: {key_prefix: histogram}}``."""
+        report: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        for (operation, key_prefix), histogram in self._latency.items():
+            report[operation][key_prefix] = histogram.snapshot()
+        return dict(report)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"prefixes": self.counters(), "latency": self.latency()}
+
+    def reset(self) -> None:
+        self._counters.clear()
+        self._latency.clear()
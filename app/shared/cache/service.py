@@ -1,14 +1,32 @@
 """
 Cache service with Redis backend and optional fallback.
 Provides a flexible caching layer that can be enabled/disabled via environment variables.
+
+With ``CACHE_L1_ENABLED`` each worker also keeps a small in-process L1 in
+front of Redis; invalidations are broadcast over Redis pub/sub so every
+worker drops its L1 copy.
 """
 
 import json
+import hashlib
+import inspect
 import logging
-from typing import Any, Optional, Union, Dict
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Mapping, Optional, Sequence, Set, Tuple, Union, Dict
 from functools import wraps
+from collections import Counter
 import asyncio
-from datetime import datetime, timedelta
+import time as clock
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from fnmatch import fnmatchcase
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+from sqlalchemy.orm import Session as SQLAlchemySession
 
 try:
     import redis.asyncio as redis
@@ -17,9 +35,57 @@ except ImportError:
     REDIS_AVAILABLE = False
 
 from app.core.config import settings
+from app.shared.cache.memory import MemoryCache
+from app.shared.cache.codec import StaleCacheEntry, get_codec
+from app.shared.cache.metrics import CacheMetrics, key_prefix_of
 
 logger = logging.getLogger(__name__)
 
+# Keys holding per-tag generation counters
+GENERATION_KEY_PREFIX = "cache_gen"
+
+# Keys fetched per SCAN round trip (and deleted per UNLINK) in clear_pattern
+SCAN_BATCH_SIZE = 500
+
+# Pub/sub channel carrying L1 invalidations between workers
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+class CacheBatch:
+    """
+    Cache writes collected inside ``CacheService.batch()``.
+    
+    Sets and deletes are held here and sent to Redis in a single pipeline
+    when the block exits. Reads inside the block see the pending writes.
+    """
+    
+    def __init__(self):
+        self.writes: Dict[str, Tuple[Any, int]] = {}
+        self.deletes: Set[str] = set()
+    
+    def __len__(self) -> int:
+        return len(self.writes) + len(self.deletes)
+    
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.deletes.discard(key)
+        self.writes[key] = (value, ttl)
+    
+    def delete(self, key: str) -> None:
+        self.writes.pop(key, None)
+        self.deletes.add(key)
+    
+    def delete_pattern(self, pattern: str) -> None:
+        for key in [key for key in self.writes if fnmatchcase(key, pattern)]:
+            del self.writes[key]
+    
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """``(True, value)`` if the batch decides the key's value, else ``(False, None)``."""
+        if key in self.deletes:
+            return True, None
+        if key in self.writes:
+            return True, self.writes[key][0]
+        return False, None
+
 
 class CacheService:
     """
@@ -29,9 +95,32 @@ class CacheService:
     
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
-        self.memory_cache: Dict[str, Dict[str, Any]] = {}
+        self.metrics = CacheMetrics()
+        self.memory_cache = MemoryCache(
+            max_entries=settings.CACHE_MEMORY_MAX_ENTRIES,
+            max_bytes=settings.CACHE_MEMORY_MAX_BYTES,
+            sweep_interval=settings.CACHE_MEMORY_SWEEP_INTERVAL,
+            on_evict=self._record_eviction,
+        )
         self.enabled = settings.REDIS_ENABLED
         self.redis_available = False
+        self.codec = get_codec(settings.CACHE_CODEC)
+        
+        # Per-worker L1 in front of Redis
+        self.l1_enabled = settings.CACHE_L1_ENABLED
+        self.l1_ttl = settings.CACHE_L1_TTL
+        self.local_cache = MemoryCache(
+            max_entries=settings.CACHE_L1_MAX_ENTRIES,
+            max_bytes=settings.CACHE_L1_MAX_BYTES,
+            sweep_interval=settings.CACHE_MEMORY_SWEEP_INTERVAL,
+            on_evict=self._record_eviction,
+        )
+        self._invalidation_listener: Optional[asyncio.Task] = None
+        # Other in-process caches invalidated over the same channel, by kind
+        self._invalidation_targets: Dict[str, Any] = {}
+        self._batch: ContextVar[Optional[CacheBatch]] = ContextVar(
+            f"cache_batch_{id(self)}", default=None
+        )
         
     async def initialize(self):
         """Initialize Redis connection if enabled and available."""
@@ -41,6 +130,7 @@ class CacheService:
             
         if not REDIS_AVAILABLE:
             logger.warning("Redis package not available, falling back to memory cache")
+            self.memory_cache.start_sweeper()
             return
             
         try:
@@ -55,30 +145,51 @@ class CacheService:
             await self.redis_client.ping()
             self.redis_available = True
             logger.info(f"Redis cache initialized successfully: {settings.REDIS_URL}")
+            if self.l1_enabled:
+                self.local_cache.start_sweeper()
+            if self.l1_enabled or self._invalidation_targets:
+                self._invalidation_listener = asyncio.create_task(self._listen_for_invalidations())
         except Exception as e:
             logger.warning(f"Failed to connect to Redis: {e}. Using memory cache fallback.")
             self.redis_client = None
             self.redis_available = False
+            self.memory_cache.start_sweeper()
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
         if not self.enabled:
             return None
+        
+        started = clock.perf_counter()
+        value = await self._lookup(key)
+        key_prefix = key_prefix_of(key)
+        self.metrics.increment(key_prefix, "misses" if value is None else "hits")
+        self.metrics.observe_latency("get", key_prefix, _elapsed_ms(started))
+        return value
+    
+    async def _lookup(self, key: str) -> Optional[Any]:
+        pending = self._batch.get()
+        if pending is not None:
+            found, value = pending.lookup(key)
+            if found:
+                return value
             
         try:
             if self.redis_available and self.redis_client:
-                value = await self.redis_client.get(key)
-                if value:
-                    return json.loads(value)
+                if self._use_l1:
+                    payload = self.local_cache.get(key)
+                    if payload is not None:
+                        return self._decode(key, payload)
+                payload = await self.redis_client.get(key)
+                if payload:
+                    if self._use_l1:
+                        self.local_cache.set(key, payload, self.l1_ttl)
+                    return self._decode(key, payload)
             else:
                 # Memory cache fallback
-                cache_entry = self.memory_cache.get(key)
-                if cache_entry:
-                    if datetime.now() < cache_entry['expires']:
-                        return cache_entry['value']
-                    else:
-                        # Expired, remove from cache
-                        del self.memory_cache[key]
+                payload = self.memory_cache.get(key)
+                if payload is not None:
+                    return self._decode(key, payload)
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
         
@@ -91,19 +202,27 @@ class CacheService:
             
         if ttl is None:
             ttl = settings.REDIS_TTL_DEFAULT
+        
+        key_prefix = key_prefix_of(key)
+        self.metrics.increment(key_prefix, "sets")
+        
+        pending = self._batch.get()
+        if pending is not None:
+            pending.set(key, value, ttl)
+            return True
             
+        started = clock.perf_counter()
         try:
+            payload = self.codec.dumps(value)
             if self.redis_available and self.redis_client:
-                serialized_value = json.dumps(value, default=str)
-                await self.redis_client.setex(key, ttl, serialized_value)
-                return True
+                await self.redis_client.setex(key, ttl, payload)
+                if self._use_l1:
+                    self.local_cache.set(key, payload, min(ttl, self.l1_ttl))
             else:
                 # Memory cache fallback
-                self.memory_cache[key] = {
-                    'value': value,
-                    'expires': datetime.now() + timedelta(seconds=ttl)
-                }
-                return True
+                self.memory_cache.set(key, payload, ttl)
+            self.metrics.observe_latency("set", key_prefix, _elapsed_ms(started))
+            return True
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
@@ -112,90 +231,617 @@ class CacheService:
         """Delete value from cache."""
         if not self.enabled:
             return False
+        
+        self.metrics.increment(key_prefix_of(key), "deletes")
+        
+        pending = self._batch.get()
+        if pending is not None:
+            pending.delete(key)
+            return True
             
         try:
             if self.redis_available and self.redis_client:
                 await self.redis_client.delete(key)
+                await self._broadcast_invalidation("key", [key])
             else:
-                self.memory_cache.pop(key, None)
+                self.memory_cache.delete(key)
             return True
         except Exception as e:
             logger.error(f"Cache delete error for key {key}: {e}")
             return False
     
-    async def clear_pattern(self, pattern: str) -> bool:
-        """Clear all keys matching pattern."""
+    async def clear_pattern(self, pattern: str) -> int:
+        """
+        Clear all keys matching pattern; returns the number of keys deleted.
+        
+        Uses cursor-based SCAN rather than KEYS so Redis is never blocked on a
+        full keyspace walk. Prefer tag invalidation (``bump_generations``) for
+        hot write paths.
+        """
         if not self.enabled:
-            return False
+            return 0
+        
+        pending = self._batch.get()
+        if pending is not None:
+            pending.delete_pattern(pattern)
             
+        deleted = 0
         try:
             if self.redis_available and self.redis_client:
-                keys = await self.redis_client.keys(pattern)
-                if keys:
-                    await self.redis_client.delete(*keys)
+                batch = []
+                async for key in self.redis_client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+                    batch.append(key)
+                    if len(batch) >= SCAN_BATCH_SIZE:
+                        deleted += await self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    deleted += await self.redis_client.unlink(*batch)
+                await self._broadcast_invalidation("pattern", [pattern])
             else:
-                # Memory cache pattern matching
-                keys_to_delete = [key for key in self.memory_cache.keys() 
-                                if pattern.replace('*', '') in key]
-                for key in keys_to_delete:
-                    del self.memory_cache[key]
-            return True
+                # Memory cache pattern matching via its prefix index
+                deleted = self.memory_cache.delete_pattern(pattern)
         except Exception as e:
             logger.error(f"Cache clear pattern error for {pattern}: {e}")
+        
+        self.metrics.record_invalidation(key_prefix_of(pattern), deleted)
+        return deleted
+    
+    async def set_many(self, items: Mapping[str, Any], ttl: int = None) -> bool:
+        """Set several values with the same TTL in one pipeline."""
+        if not self.enabled or not items:
+            return False
+        
+        if ttl is None:
+            ttl = settings.REDIS_TTL_DEFAULT
+        
+        for key in items:
+            self.metrics.increment(key_prefix_of(key), "sets")
+        
+        pending = self._batch.get()
+        if pending is not None:
+            for key, value in items.items():
+                pending.set(key, value, ttl)
+            return True
+        
+        started = clock.perf_counter()
+        flushed = CacheBatch()
+        for key, value in items.items():
+            flushed.set(key, value, ttl)
+        stored = await self._flush(flushed)
+        self.metrics.observe_latency("set_many", key_prefix_of(next(iter(items))), _elapsed_ms(started))
+        return stored
+    
+    async def delete_many(self, keys: Sequence[str]) -> bool:
+        """Delete several keys with a single UNLINK."""
+        if not self.enabled or not keys:
+            return False
+        
+        for key_prefix, count in Counter(key_prefix_of(key) for key in keys).items():
+            self.metrics.increment(key_prefix, "deletes", count)
+            self.metrics.record_invalidation(key_prefix, count)
+        
+        pending = self._batch.get()
+        if pending is not None:
+            for key in keys:
+                pending.delete(key)
+            return True
+        
+        flushed = CacheBatch()
+        for key in keys:
+            flushed.delete(key)
+        return await self._flush(flushed)
+    
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[CacheBatch]:
+        """
+        Defer cache writes until the block exits, then send them in one pipeline.
+        
+        Reads inside the block still go to the cache but see pending writes.
+        Pending writes are flushed even if the block raises, so invalidations
+        are never lost. Nested blocks join the outermost batch.
+        """
+        pending = self._batch.get()
+        if pending is not None:
+            yield pending
+            return
+        
+        pending = CacheBatch()
+        token = self._batch.set(pending)
+        try:
+            yield pending
+        finally:
+            self._batch.reset(token)
+            await self._flush(pending)
+    
+    async def _flush(self, pending: CacheBatch) -> bool:
+        """Apply a batch's writes and deletes in a single round trip."""
+        if not pending:
+            return True
+        
+        try:
+            payloads = {
+                key: (self.codec.dumps(value), ttl)
+                for key, (value, ttl) in pending.writes.items()
+            }
+            if self.redis_available and self.redis_client:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key, (payload, ttl) in payloads.items():
+                        pipe.setex(key, ttl, payload)
+                    if pending.deletes:
+                        pipe.unlink(*sorted(pending.deletes))
+                    if self._use_l1 and pending.deletes:
+                        pipe.publish(
+                            INVALIDATION_CHANNEL,
+                            json.dumps({"kind": "key", "values": sorted(pending.deletes)}),
+                        )
+                    await pipe.execute()
+                if self._use_l1:
+                    self._apply_invalidation("key", pending.deletes)
+                    for key, (payload, ttl) in payloads.items():
+                        self.local_cache.set(key, payload, min(ttl, self.l1_ttl))
+            else:
+                for key, (payload, ttl) in payloads.items():
+                    self.memory_cache.set(key, payload, ttl)
+                for key in pending.deletes:
+                    self.memory_cache.delete(key)
+            return True
+        except Exception as e:
+            logger.error(f"Cache batch flush error: {e}")
+            return False
+    
+    async def get_generations(self, tags: Sequence[str]) -> List[int]:
+        """Current generation counter for each tag (0 if never bumped)."""
+        if not self.enabled or not tags:
+            return [0] * len(tags)
+        
+        generation_keys = [f"{GENERATION_KEY_PREFIX}:{tag}" for tag in tags]
+        try:
+            if self.redis_available and self.redis_client:
+                values = [
+                    self.local_cache.get(key) if self._use_l1 else None
+                    for key in generation_keys
+                ]
+                missing = [i for i, value in enumerate(values) if value is None]
+                if missing:
+                    fetched = await self.redis_client.mget([generation_keys[i] for i in missing])
+                    for i, value in zip(missing, fetched):
+                        values[i] = int(value) if value else 0
+                        if self._use_l1:
+                            self.local_cache.set(generation_keys[i], values[i], self.l1_ttl)
+            else:
+                values = [self._memory_generation(key) for key in generation_keys]
+            return [int(value) if value else 0 for value in values]
+        except Exception as e:
+            logger.error(f"Cache generation lookup error for {tags}: {e}")
+            return [0] * len(tags)
+    
+    async def bump_generations(self, tags: Sequence[str]) -> bool:
+        """
+        Invalidate every entry cached under any of ``tags``.
+        
+        Entries embed their tags' generations in the key, so incrementing a
+        counter orphans them in O(1); they age out through their TTL.
+        """
+        if not self.enabled or not tags:
             return False
+        
+        generation_keys = [f"{GENERATION_KEY_PREFIX}:{tag}" for tag in set(tags)]
+        try:
+            if self.redis_available and self.redis_client:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key in generation_keys:
+                        pipe.incr(key)
+                    await pipe.execute()
+                await self._broadcast_invalidation("key", generation_keys)
+            else:
+                for key in generation_keys:
+                    self.memory_cache.set(
+                        key, self._memory_generation(key) + 1, settings.CACHE_GENERATION_TTL
+                    )
+            self._record_tag_invalidations(tags)
+            return True
+        except Exception as e:
+            logger.error(f"Cache generation bump error for {tags}: {e}")
+            return False
+    
+    def _memory_generation(self, key: str) -> int:
+        """
+        Generation counter held in the bounded memory fallback.
+        
+        A counter that expired or was evicted is reseeded from the clock, so
+        it can never fall back to a value that entries were cached under.
+        """
+        generation = self.memory_cache.get(key)
+        if generation is None:
+            generation = clock.time_ns()
+            self.memory_cache.set(key, generation, settings.CACHE_GENERATION_TTL)
+        return generation
+    
+    def record_stale_hit(self, key_prefix: str) -> None:
+        """Count a stale entry served while it is refreshed."""
+        self.metrics.increment(key_prefix, "stale_hits")
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss/set/eviction/invalidation counters and hit ratio per key prefix."""
+        return self.metrics.counters()
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get/set latency histograms per operation and key prefix."""
+        return self.metrics.latency()
+    
+    def reset_stats(self) -> None:
+        """Reset all counters and latency histograms."""
+        self.metrics.reset()
+    
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Full instrumentation report, including Redis server-side counters."""
+        report: Dict[str, Any] = {
+            "backend": "redis" if self.redis_available else "memory",
+            "enabled": self.enabled,
+            **self.metrics.snapshot(),
+            "memory": self.memory_cache.stats(),
+        }
+        if self._use_l1:
+            report["l1"] = self.local_cache.stats()
+        if self.redis_available and self.redis_client:
+            try:
+                info = await self.redis_client.info("stats")
+                report["redis"] = {
+                    name: info.get(name, 0)
+                    for name in ("keyspace_hits", "keyspace_misses", "evicted_keys", "expired_keys")
+                }
+            except Exception as e:
+                logger.error(f"Cache Redis INFO error: {e}")
+        return report
+    
+    def _record_eviction(self, key: str) -> None:
+        self.metrics.increment(key_prefix_of(key), "evictions")
+    
+    def _record_tag_invalidations(self, tags: Sequence[str]) -> None:
+        for key_prefix, count in Counter(key_prefix_of(tag) for tag in set(tags)).items():
+            self.metrics.record_invalidation(key_prefix, count)
+    
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """Size and eviction stats of the in-memory fallback."""
+        return self.memory_cache.stats()
+    
+    def _decode(self, key: str, payload: Any) -> Optional[Any]:
+        """Decode a stored payload; entries from an older format or model read as misses."""
+        try:
+            return self.codec.loads(payload)
+        except StaleCacheEntry as e:
+            logger.debug(f"Ignoring stale cache entry {key}: {e}")
+            return None
+    
+    @property
+    def _use_l1(self) -> bool:
+        return self.l1_enabled and self.redis_available
+    
+    async def _broadcast_invalidation(self, kind: str, values: Sequence[str]) -> None:
+        """Drop keys/patterns from this worker's L1 and tell the other workers to."""
+        if not self._use_l1:
+            return
+        self._apply_invalidation(kind, values)
+        try:
+            await self.redis_client.publish(
+                INVALIDATION_CHANNEL, json.dumps({"kind": kind, "values": list(values)})
+            )
+        except Exception as e:
+            logger.error(f"Cache invalidation broadcast error: {e}")
+    
+    def register_invalidation_target(self, kind: str, target: Any) -> None:
+        """
+        Keep another per-worker cache coherent across workers.
+
+        ``target`` provides ``invalidate(values)`` and ``clear()``; messages
+        published with ``publish_invalidation(kind, ...)`` are applied to it
+        in every worker. Register before ``initialize``.
+        """
+        self._invalidation_targets[kind] = target
+
+    async def publish_invalidation(self, kind: str, values: Sequence[str]) -> None:
+        """Apply an invalidation to a registered target here and in other workers."""
+        self._apply_invalidation(kind, values)
+        if not (self.enabled and self.redis_available):
+            return
+        try:
+            await self.redis_client.publish(
+                INVALIDATION_CHANNEL, json.dumps({"kind": kind, "values": list(values)})
+            )
+        except Exception as e:
+            logger.error(f"Cache invalidation broadcast error: {e}")
+
+    def _apply_invalidation(self, kind: str, values: Sequence[str]) -> None:
+        target = self._invalidation_targets.get(kind)
+        if target is not None:
+            target.invalidate(values)
+            return
+        for value in values:
+            if kind == "pattern":
+                self.local_cache.delete_pattern(value)
+            else:
+                self.local_cache.delete(value)
+    
+    async def _listen_for_invalidations(self) -> None:
+        """Apply L1 invalidations published by other workers."""
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    self._apply_invalidation(payload["kind"], payload["values"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Anything cached while disconnected may have missed an invalidation
+                logger.error(f"Cache invalidation listener error: {e}. Resubscribing.")
+                self.local_cache.clear()
+                for target in self._invalidation_targets.values():
+                    target.clear()
+                await asyncio.sleep(1)
     
     async def close(self):
         """Close Redis connection."""
+        await self.memory_cache.stop_sweeper()
+        await self.local_cache.stop_sweeper()
+        if self._invalidation_listener is not None:
+            self._invalidation_listener.cancel()
+            try:
+                await self._invalidation_listener
+            except asyncio.CancelledError:
+                pass
+            self._invalidation_listener = None
         if self.redis_client:
             await self.redis_client.close()
 
 
+def _elapsed_ms(started: float) -> float:
+    return (clock.perf_counter() - started) * 1000
+
+
 # Global cache instance
 cache_service = CacheService()
 
 
+# Arguments that never take part in a cache key
+SKIPPED_ARGUMENT_TYPES = (SQLAlchemyAsyncSession, SQLAlchemySession)
+SKIPPED_ARGUMENT_NAMES = ("session", "self", "cls")
+
+
+def _key_part(value: Any) -> str:
+    """Render one argument as a stable cache key fragment."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return str(value)
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (date, time, datetime)):
+        return value.isoformat()
+    
+    # Structured values are hashed so keys stay short and process-independent
+    if isinstance(value, BaseModel):
+        value = value.model_dump(mode="json")
+    serialized = json.dumps(value, sort_keys=True, default=_key_part)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()[:16]
+
+
 def cache_key(*args, **kwargs) -> str:
     """Generate cache key from arguments."""
-    key_parts = []
-    for arg in args:
-        if isinstance(arg, (str, int, float)):
-            key_parts.append(str(arg))
-        else:
-            key_parts.append(str(hash(str(arg))))
+    key_parts = [_key_part(arg) for arg in args]
     
     for k, v in sorted(kwargs.items()):
-        key_parts.append(f"{k}:{v}")
+        key_parts.append(f"{k}:{_key_part(v)}")
     
     return ":".join(key_parts)
 
 
-def cached(ttl: int = None, key_prefix: str = ""):
+def cache_tag(*parts: Any) -> str:
+    """Build an invalidation tag such as ``availability:<restaurant_id>:<date>``."""
+    return ":".join(_key_part(part) for part in parts)
+
+
+def _bind_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> Dict[str, Any]:
+    """Map a call's arguments (including defaults) to parameter names."""
+    bound = signature.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def _key_arguments(
+    arguments: Dict[str, Any],
+    include: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """Drop sessions and anything not allow-listed from the bound arguments."""
+    key_arguments = {}
+    for name, value in arguments.items():
+        if include is not None and name not in include:
+            continue
+        if name in SKIPPED_ARGUMENT_NAMES or isinstance(value, SKIPPED_ARGUMENT_TYPES):
+            continue
+        key_arguments[name] = value
+    return key_arguments
+
+
+# Loads in progress per cache key, shared by concurrent misses
+_in_flight: Dict[str, "asyncio.Future[Any]"] = {}
+
+# Strong references to background refreshes so they are not garbage collected
+_background_refreshes: set = set()
+
+
+async def _single_flight(key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run ``load`` once per key at a time.
+
+    Concurrent callers for a key that is already loading await the same
+    result instead of hitting the database again. Each of them gets its own
+    copy, decoded the same way as a cache hit, so no two requests share
+    mutable (e.g. ORM) objects. If the loading request is cancelled, for
+    instance by a client disconnect, the waiters start a new load rather than
+    failing with it.
+    """
+    while True:
+        pending = _in_flight.get(key)
+        if pending is None:
+            break
+        try:
+            result = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if pending.cancelled() and not asyncio.current_task().cancelling():
+                continue  # The loader was cancelled, not us
+            raise
+        try:
+            return cache_service.codec.loads(cache_service.codec.dumps(result))
+        except StaleCacheEntry:
+            # Not representable in the cache; load a private copy instead
+            return await load()
+    
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        result = await load()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved when nobody else was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+
+
+def _refresh_in_background(key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+    """Schedule a single-flight refresh of a stale entry without awaiting it."""
+    if key in _in_flight:
+        return
+    
+    async def run():
+        try:
+            await _single_flight(key, refresh)
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {e}")
+    
+    task = asyncio.create_task(run())
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+
+async def _call_with_fresh_session(func: Callable[..., Awaitable[Any]], arguments: Dict[str, Any]) -> Any:
+    """
+    Re-run a cached function outside the request that triggered it.
+
+    The caller's session may be closed by the time the refresh runs, so any
+    session argument is replaced with a new one.
+    """
+    session_names = [
+        name for name, value in arguments.items()
+        if isinstance(value, SKIPPED_ARGUMENT_TYPES)
+    ]
+    if not session_names:
+        return await func(**arguments)
+    
+    from app.shared.database.session import AsyncSessionLocal
+    
+    async with AsyncSessionLocal() as session:
+        return await func(**{
+            **arguments,
+            **{name: session for name in session_names},
+        })
+
+
+def cached(
+    ttl: int = None,
+    key_prefix: str = "",
+    key_builder: Optional[Callable[..., str]] = None,
+    include: Optional[Sequence[str]] = None,
+    tags: Optional[Callable[..., Sequence[str]]] = None,
+    stale_ttl: int = 0,
+):
     """
     Decorator for caching function results.
     
+    Concurrent misses for the same key share a single call of the function.
+    
     Args:
         ttl: Time to live in seconds
         key_prefix: Prefix for cache key
+        key_builder: Optional callable taking the call's arguments and returning
+            the key suffix; overrides the default argument-based key
+        include: Optional allow-list of argument names used in the key.
+            Database sessions are always left out.
+        tags: Optional callable receiving the call's arguments by name and
+            returning invalidation tags; the entry is dropped whenever any of
+            them is bumped via ``cache_invalidate_tags``
+        stale_ttl: Seconds past ``ttl`` during which an expired entry is still
+            served while one background call refreshes it
+            (stale-while-revalidate). Sessions are replaced with a new one
+            for the refresh.
     """
     def decorator(func):
+        signature = inspect.signature(func)
+        func_name = f"{func.__module__}.{func.__name__}"
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
             if not cache_service.enabled:
                 return await func(*args, **kwargs)
             
             # Generate cache key
-            func_name = f"{func.__module__}.{func.__name__}"
-            cache_key_str = cache_key(key_prefix, func_name, *args, **kwargs)
+            arguments = _bind_arguments(signature, args, kwargs)
+            if key_builder is not None:
+                key_parts = [key_builder(*args, **kwargs)]
+                key_arguments = {}
+            else:
+                key_parts = []
+                key_arguments = _key_arguments(arguments, include)
+            
+            # Tag generations make bumped entries unreachable
+            if tags is not None:
+                generations = await cache_service.get_generations(tags(**arguments))
+                key_parts.append("g" + ".".join(str(generation) for generation in generations))
+            
+            cache_key_str = cache_key(key_prefix, func_name, *key_parts, **key_arguments)
+            effective_ttl = ttl or settings.REDIS_TTL_DEFAULT
+            
+            async def store(result: Any) -> None:
+                envelope = {"data": result}
+                if stale_ttl:
+                    envelope["fresh_until"] = clock.time() + effective_ttl
+                await cache_service.set(cache_key_str, envelope, effective_ttl + stale_ttl)
+            
+            async def load() -> Any:
+                result = await func(*args, **kwargs)
+                await store(result)
+                return result
+            
+            async def refresh() -> Any:
+                result = await _call_with_fresh_session(func, arguments)
+                await store(result)
+                return result
             
             # Try to get from cache
-            cached_result = await cache_service.get(cache_key_str)
-            if cached_result is not None:
-                logger.debug(f"Cache hit for {cache_key_str}")
-                return cached_result
+            envelope = await cache_service.get(cache_key_str)
+            if isinstance(envelope, dict) and "data" in envelope:
+                fresh_until = envelope.get("fresh_until")
+                if fresh_until is not None and fresh_until <= clock.time():
+                    cache_service.record_stale_hit(key_prefix)
+                    logger.debug(f"Serving stale {cache_key_str} while refreshing")
+                    _refresh_in_background(cache_key_str, refresh)
+                else:
+                    logger.debug(f"Cache hit for {cache_key_str}")
+                return envelope["data"]
             
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            await cache_service.set(cache_key_str, result, ttl)
+            # Execute function once per key and cache result
+            result = await _single_flight(cache_key_str, load)
             logger.debug(f"Cache miss for {cache_key_str}, result cached")
             
             return result
@@ -203,6 +849,27 @@ def cached(ttl: int = None, key_prefix: str = ""):
     return decorator
 
 
+def cache_invalidate_tags(tag_builder: Callable[..., Sequence[str]]):
+    """
+    Decorator to bump invalidation tags after function execution.
+    
+    ``tag_builder`` receives the function's result followed by its arguments
+    by name, and returns the tags whose cached entries are now stale.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            tags = tag_builder(result, **_bind_arguments(signature, args, kwargs))
+            await cache_service.bump_generations(tags)
+            logger.debug(f"Cache invalidated for tags: {tags}")
+            return result
+        return wrapper
+    return decorator
+
+
 def cache_invalidate_pattern(pattern: str):
     """
     Decorator to invalidate cache patterns after function execution.
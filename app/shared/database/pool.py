@@ -0,0 +1,122 @@
+"""
+Connection pool configuration and instrumentation.
+
+Pool sizing comes from ``Settings`` so it can be tuned per uvicorn worker;
+the pool records how long requests wait for a connection so queueing on the
+pool shows up in metrics instead of as unexplained latency.
+"""
+
+import time
+from typing import Any, Dict, Tuple
+from uuid import uuid4
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import metrics
+from app.core.config import settings
+from app.shared.cache.metrics import LatencyHistogram
+
+
+def pool_size_for_worker() -> Tuple[int, int]:
+    """
+    ``(pool_size, max_overflow)`` for this worker process.
+
+    With ``DB_MAX_CONNECTIONS`` set, the budget is split evenly across
+    ``WEB_CONCURRENCY`` workers so the sum of all pools never exceeds it.
+    """
+    pool_size = settings.DB_POOL_SIZE
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS:
+        per_worker = max(1, settings.DB_MAX_CONNECTIONS // max(1, settings.WEB_CONCURRENCY))
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+    return pool_size, max_overflow
+
+
+def _asyncpg_connect_args() -> Dict[str, Any]:
+    if settings.DB_PGBOUNCER:
+        # Transaction pooling hands each transaction a different server
+        # connection, so prepared statements must not outlive a statement
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """Keyword arguments for ``create_async_engine`` built from settings."""
+    if database_url.startswith("sqlite"):
+        # SQLite uses its own single-connection pools
+        return {}
+
+    pool_size, max_overflow = pool_size_for_worker()
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    }
+    if "+asyncpg" in database_url:
+        options["connect_args"] = _asyncpg_connect_args()
+    return options
+
+
+class PoolMetrics:
+    """Checkout wait times and timeouts across all instrumented pools."""
+
+    def __init__(self):
+        self.checkout_wait = LatencyHistogram()
+        self.timeouts = 0
+
+    def reset(self) -> None:
+        self.checkout_wait = LatencyHistogram()
+        self.timeouts = 0
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            metrics.db_pool_timeouts.inc()
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            pool_metrics.checkout_wait.observe(waited * 1000)
+            metrics.db_pool_checkout_wait.observe(waited)
+
+
+def get_pool_stats(engine) -> Dict[str, Any]:
+    """In-use, idle and overflow gauges plus checkout wait for an engine's pool."""
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {"pool": type(pool).__name__}
+
+    size = pool.size()
+    checked_out = pool.checkedout()
+    capacity = size + max(pool._max_overflow, 0)
+    return {
+        "pool": type(pool).__name__,
+        "size": size,
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(checked_out / capacity, 4) if capacity else 0.0,
+        "timeouts": pool_metrics.timeouts,
+        "checkout_wait": pool_metrics.checkout_wait.snapshot(),
+    }
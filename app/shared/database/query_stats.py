@@ -0,0 +1,165 @@
+"""
+Per-request SQL statement counting and N+1 detection.
+
+Engine events count every statement executed while a ``QueryStats`` is
+active, along with total database time and how often each statement
+*fingerprint* repeats. A fingerprint is the SQL text with whitespace and
+bind-parameter lists normalized. A fingerprint executed many times in one
+request is the signature of an N+1 loop.
+
+Stats are active for the current request (``QueryStatsMiddleware``) or for
+a ``track_queries()`` block. Tests use ``assert_max_queries`` (the
+``query_budget`` fixture) to pin a query budget per endpoint.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Connection.info key holding start times of in-flight statements
+_STARTED_KEY = "_query_stats_started"
+
+_BIND_LIST = re.compile(r"\((?:\s*(?:\?|%s|\$\d+|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement text with whitespace collapsed and bind lists folded."""
+    return _BIND_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Statements, database time and repeated fingerprints for one unit of work."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints: Counter = Counter()
+        # Enclosing collector (e.g. the profiler around a query stats block)
+        self.parent = parent
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        """Fingerprints executed at least ``threshold`` times, most frequent first."""
+        return [
+            (statement, count)
+            for statement, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+    @property
+    def max_repeats(self) -> int:
+        return max(self.fingerprints.values(), default=0)
+
+    def summary(self, threshold: int = 2) -> Dict[str, Any]:
+        return {
+            "queries": self.count,
+            "db_time_ms": round(self.total_ms, 3),
+            "repeated": [
+                {"statement": statement, "count": count}
+                for statement, count in self.repeated(threshold)
+            ],
+        }
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Collectors that see every statement in the process, whatever the context;
+# used by tests whose requests run on another thread (TestClient)
+_global_collectors: List[QueryStats] = []
+_global_lock = threading.Lock()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count statements executed in the current context (request, task); nests."""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def track_all_queries() -> Iterator[QueryStats]:
+    """Count statements executed anywhere in the process."""
+    stats = QueryStats()
+    with _global_lock:
+        _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        with _global_lock:
+            _global_collectors.remove(stats)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More statements, or more repeats of one statement, than budgeted."""
+
+
+@contextmanager
+def assert_max_queries(
+    max_queries: int, max_repeats: Optional[int] = None
+) -> Iterator[QueryStats]:
+    """
+    Fail if the block executes more than ``max_queries`` statements, or any
+    single statement fingerprint more than ``max_repeats`` times.
+    """
+    with track_all_queries() as stats:
+        yield stats
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries executed, budget is {max_queries}")
+    if max_repeats is not None and stats.max_repeats > max_repeats:
+        problems.append(
+            f"a statement ran {stats.max_repeats} times, at most {max_repeats} allowed"
+        )
+    if problems:
+        repeated = "\n".join(
+            f"  {count}x {statement}" for statement, count in stats.repeated()
+        )
+        raise QueryBudgetExceeded(
+            "; ".join(problems) + (f"\nRepeated statements:\n{repeated}" if repeated else "")
+        )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None or _global_collectors:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get(_STARTED_KEY)
+    if not started:
+        return
+    duration_ms = (time.perf_counter() - started.pop()) * 1000
+    stats = _current.get()
+    while stats is not None:
+        stats.record(statement, duration_ms)
+        stats = stats.parent
+    for collector in list(_global_collectors):
+        collector.record(statement, duration_ms)
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_failed_statement(exception_context):
+    # after_cursor_execute never runs for a failed statement
+    conn = exception_context.connection
+    started = conn.info.get(_STARTED_KEY) if conn is not None else None
+    if started:
+        started.pop()
@@ -0,0 +1,153 @@
+"""
+Read-replica routing.
+
+Authenticated analytics endpoints ask ``ReadRouter`` whether they may use
+the replica. Public menu, availability and restaurant info reads fill shared
+cache entries, so they stay on the primary: a lagging replica would cache
+pre-write rows for the entry's full TTL. A read goes to the primary
+when no replica is configured, when the replica is lagging or unreachable,
+or when the tenant committed a write recently, so users always read their
+own writes. Writes are recorded automatically from committed sessions using
+the ``restaurant_id`` of each flushed row.
+
+Write pins are per worker process: a follow-up request served by another
+worker may still read from the replica within the lag bound.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds of replay lag on a standby; 0 when connected to a primary
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+
+# Session.info key collecting tenants written in the current transaction
+WRITTEN_TENANTS_KEY = "written_tenants"
+
+
+class ReadRouter:
+    """Decides per tenant whether a read may be served by the replica."""
+
+    def __init__(
+        self,
+        max_lag_seconds: float = 5.0,
+        pin_seconds: float = 5.0,
+        lag_check_interval: float = 10.0,
+    ):
+        self.max_lag_seconds = max_lag_seconds
+        self.pin_seconds = pin_seconds
+        self.lag_check_interval = lag_check_interval
+        self.replica_engine = None
+        self._written_at: Dict[str, float] = {}
+        self._lag_seconds: Optional[float] = None
+        self._lag_checked_at = 0.0
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    @property
+    def replica_configured(self) -> bool:
+        return self.replica_engine is not None
+
+    def record_writes(self, tenant_ids: Iterable[Any]) -> None:
+        """Pin tenants to the primary for ``pin_seconds`` after a commit."""
+        now = time.monotonic()
+        for tenant_id in tenant_ids:
+            self._written_at[str(tenant_id)] = now
+        if len(self._written_at) > 10_000:
+            self._prune(now)
+
+    def is_pinned(self, tenant_id: Optional[Any]) -> bool:
+        if tenant_id is None:
+            return False
+        written_at = self._written_at.get(str(tenant_id))
+        return written_at is not None and time.monotonic() - written_at < self.pin_seconds
+
+    async def replica_lag(self) -> Optional[float]:
+        """
+        Replica replay lag in seconds, measured at most once per
+        ``lag_check_interval``; None if the replica could not be reached.
+        """
+        now = time.monotonic()
+        if now - self._lag_checked_at < self.lag_check_interval:
+            return self._lag_seconds
+        self._lag_checked_at = now
+        try:
+            async with self.replica_engine.connect() as conn:
+                result = await conn.execute(REPLICA_LAG_SQL)
+                self._lag_seconds = float(result.scalar() or 0.0)
+        except Exception as e:
+            logger.warning(f"Replica lag check failed, reading from primary: {e}")
+            self._lag_seconds = None
+        return self._lag_seconds
+
+    async def use_replica(self, tenant_id: Optional[Any] = None) -> bool:
+        """Whether a read for this tenant should go to the replica."""
+        use = False
+        if self.replica_configured and not self.is_pinned(tenant_id):
+            lag = await self.replica_lag()
+            use = lag is not None and lag <= self.max_lag_seconds
+        if use:
+            self.replica_reads += 1
+        else:
+            self.primary_reads += 1
+        return use
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replica_configured": self.replica_configured,
+            "replica_lag_seconds": self._lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "pinned_tenants": sum(
+                1 for tenant_id in list(self._written_at) if self.is_pinned(tenant_id)
+            ),
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+    def _prune(self, now: float) -> None:
+        for tenant_id, written_at in list(self._written_at.items()):
+            if now - written_at >= self.pin_seconds:
+                del self._written_at[tenant_id]
+
+
+read_router = ReadRouter(
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    pin_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    lag_check_interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL,
+)
+
+
+def _tenant_of(instance: Any) -> Optional[Any]:
+    return getattr(instance, "restaurant_id", None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_tenants(session: Session, flush_context) -> None:
+    tenants: Set[Any] = session.info.setdefault(WRITTEN_TENANTS_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        tenant_id = _tenant_of(instance)
+        if tenant_id is not None:
+            tenants.add(tenant_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_written_tenants(session: Session) -> None:
+    tenants = session.info.pop(WRITTEN_TENANTS_KEY, None)
+    if tenants:
+        read_router.record_writes(tenants)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_tenants(session: Session) -> None:
+    session.info.pop(WRITTEN_TENANTS_KEY, None)
@@ -1,22 +1,29 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Optional
 from sqlmodel import SQLModel, create_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.shared.database.pool import engine_options
+from app.shared.database.replica import read_router
 
-# Convert PostgreSQL URL to async version
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-# Create async engine
+def _async_url(url: str) -> str:
+    """Convert a PostgreSQL URL to its asyncpg form."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+database_url = _async_url(settings.DATABASE_URL)
+
+# Create async engine; pool sizing and pgbouncer mode come from settings
 engine = create_async_engine(
     database_url,
     echo=settings.DEBUG,
     future=True,
-    pool_pre_ping=True,
-    pool_recycle=300,
+    **engine_options(database_url),
 )
 
 # Create async session factory
@@ -26,6 +33,29 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+# Read-only engine for reporting and public reads; the primary when no replica is set
+if settings.DATABASE_READ_URL:
+    read_database_url = _async_url(settings.DATABASE_READ_URL)
+    read_engine = create_async_engine(
+        read_database_url,
+        echo=settings.DEBUG,
+        future=True,
+        **engine_options(read_database_url),
+    )
+    read_router.replica_engine = read_engine
+else:
+    read_engine = engine
+
+instrument_engine(engine, "primary")
+if read_engine is not engine:
+    instrument_engine(read_engine, "replica")
+
+ReadSessionLocal = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session."""
@@ -39,6 +69,27 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def read_session(tenant_id: Optional[Any] = None) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for a read-only request made on behalf of ``tenant_id``.
+
+    Uses the replica unless it is lagging, unavailable, or the tenant wrote
+    recently (read-your-writes); otherwise falls back to the primary. Reads
+    that fill shared cache entries must use ``get_session`` instead: a lagging
+    replica would cache pre-write rows for the entry's full TTL.
+    """
+    use_replica = await read_router.use_replica(tenant_id)
+    session_factory = ReadSessionLocal if use_replica else AsyncSessionLocal
+    async with session_factory() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
 async def create_db_and_tables() -> None:
     """Create database tables."""
     async with engine.begin() as conn:
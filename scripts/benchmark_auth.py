@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request authentication overhead.
+
+Compares full JWT verification with each available backend against the
+verified-token cache hit that repeat requests (e.g. kitchen display polling
+of /kitchen/orders) take, and the tenant record cache lookup that follows.
+
+Usage: python scripts/benchmark_auth.py [iterations]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402,F401  (registers every model mapper)
+from app.shared.auth.security import create_user_access_token, decode_user_token, verified_tokens  # noqa: E402
+from app.shared.auth.tenant_cache import TenantRecords, tenant_cache  # noqa: E402
+from app.shared.auth.tokens import JWT_BACKENDS, PYJWT_AVAILABLE  # noqa: E402
+from app.shared.models.organization import Organization  # noqa: E402
+from app.shared.models.restaurant import Restaurant  # noqa: E402
+from app.shared.models.user import User  # noqa: E402
+
+
+def per_call_us(statement, iterations: int) -> float:
+    return min(timeit.repeat(statement, number=iterations, repeat=5)) / iterations * 1e6
+
+
+def main(iterations: int = 20_000) -> None:
+    organization = Organization(id=uuid4(), name="Bench Org")
+    restaurant = Restaurant(id=uuid4(), name="Bench Restaurant", organization_id=organization.id)
+    user = User(
+        id=uuid4(),
+        email="bench@example.com",
+        full_name="Bench User",
+        role="staff",
+        password_hash="x",
+        organization_id=organization.id,
+        restaurant_id=restaurant.id,
+    )
+    token = create_user_access_token(
+        user_id=str(user.id),
+        email=user.email,
+        organization_id=str(organization.id),
+        restaurant_id=str(restaurant.id),
+        role=user.role,
+    )
+
+    print(f"Auth overhead per request ({iterations} iterations, best of 5)")
+    for name, backend_class in JWT_BACKENDS.items():
+        if name == "pyjwt" and not PYJWT_AVAILABLE:
+            print(f"  verify ({name:5})         not installed")
+            continue
+        backend = backend_class(settings.SECRET_KEY, settings.ALGORITHM)
+        print(f"  verify ({name:5})         {per_call_us(lambda: backend.decode(token), iterations):8.2f} us")
+
+    verified_tokens.clear()
+    decode_user_token(token)
+    print(f"  verified-token cache hit {per_call_us(lambda: decode_user_token(token), iterations):8.2f} us")
+
+    tenant_cache.set(TenantRecords(user, organization, restaurant))
+    print(f"  tenant record cache hit  {per_call_us(lambda: tenant_cache.get(user.id), iterations):8.2f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call statement overhead of the hot read queries.
+
+Before a statement executes, SQLAlchemy builds its cache key to look up the
+compiled SQL, and compiles it on a cache miss. A ``select(...)`` built per
+call pays for construction and the key every time. The module-level
+statements reuse one object, whose key is memoized. Results are
+reported per call for:
+- building the statement per call plus its cache key (before)
+- the prebuilt statement's cache key (after)
+- a full compile for asyncpg, which is what a compiled-cache miss costs
+
+Usage: python scripts/benchmark_queries.py [iterations]
+"""
+
+import sys
+import timeit
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg  # noqa: E402
+from sqlmodel import and_, select  # noqa: E402
+
+from app.main import app  # noqa: E402,F401  (registers every model mapper)
+from app.modules.menu.models.category import MenuCategory  # noqa: E402
+from app.modules.menu.models.item import MenuItem  # noqa: E402
+from app.modules.menu.services.item import _PUBLIC_MENU_QUERY  # noqa: E402
+from app.modules.orders.models.order import Order, OrderStatus  # noqa: E402
+from app.modules.orders.services.kitchen_service import KITCHEN_ORDERS_QUERY  # noqa: E402
+from app.modules.tables.models.reservation import Reservation  # noqa: E402
+from app.modules.tables.services.reservation import _OVERLAPPING_RESERVATIONS_QUERY  # noqa: E402
+from app.shared.auth.tenant_cache import _TENANT_RECORDS_QUERY  # noqa: E402
+from app.shared.models.organization import Organization  # noqa: E402
+from app.shared.models.restaurant import Restaurant  # noqa: E402
+from app.shared.models.user import User  # noqa: E402
+
+
+def kitchen_orders():
+    return select(Order).where(
+        and_(
+            Order.restaurant_id == uuid4(),
+            Order.status.in_([OrderStatus.CONFIRMED, OrderStatus.PREPARING, OrderStatus.READY]),
+        )
+    ).order_by(Order.created_at.asc())
+
+
+def overlapping_reservations():
+    return select(Reservation).where(
+        Reservation.table_id == uuid4(),
+        Reservation.reservation_date == date.today(),
+        Reservation.status.in_(["confirmed", "seated"]),
+    )
+
+
+def tenant_records():
+    return (
+        select(User, Organization, Restaurant)
+        .join(Organization, Organization.id == User.organization_id)
+        .outerjoin(Restaurant, Restaurant.id == User.restaurant_id)
+        .where(User.id == uuid4(), User.is_active == True)
+    )
+
+
+def public_menu():
+    return select(MenuItem, MenuCategory).join(
+        MenuCategory,
+        and_(MenuItem.category_id == MenuCategory.id, MenuCategory.is_active == True),
+        isouter=True,
+    ).where(
+        MenuItem.restaurant_id == uuid4(),
+        MenuItem.is_available == True,
+    ).order_by(MenuCategory.sort_order, MenuItem.name)
+
+
+QUERIES = {
+    "kitchen orders": (kitchen_orders, KITCHEN_ORDERS_QUERY),
+    "reservation conflicts": (overlapping_reservations, _OVERLAPPING_RESERVATIONS_QUERY),
+    "tenant records": (tenant_records, _TENANT_RECORDS_QUERY),
+    "public menu": (public_menu, _PUBLIC_MENU_QUERY),
+}
+
+
+def per_call_us(statement, iterations: int) -> float:
+    return min(timeit.repeat(statement, number=iterations, repeat=5)) / iterations * 1e6
+
+
+def main(iterations: int = 5_000) -> None:
+    dialect = PGDialect_asyncpg()
+    print(f"Statement overhead per call ({iterations} iterations, best of 5)")
+    print(f"  {'query':22} {'build+key':>10} {'prebuilt':>10} {'compile':>10}")
+    for name, (build, prebuilt) in QUERIES.items():
+        before = per_call_us(lambda: build()._generate_cache_key(), iterations)
+        after = per_call_us(lambda: prebuilt._generate_cache_key(), iterations)
+        compile_us = per_call_us(lambda: prebuilt.compile(dialect=dialect), max(iterations // 10, 1))
+        print(f"  {name:22} {before:8.2f}us {after:8.2f}us {compile_us:8.2f}us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
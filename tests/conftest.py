@@ -36,6 +36,17 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def query_budget():
+    """
+    Assert a maximum number of SQL statements for a block of code.
+    
+    Usage: ``with query_budget(5, max_repeats=1): client.get(...)``
+    """
+    from app.shared.database.query_stats import assert_max_queries
+    return assert_max_queries
+
+
 @pytest.fixture
 def mock_session():
     """Mock database session for testing without actual database."""
@@ -255,4 +255,206 @@ class TestAuthDependencies:
         context = TenantContext(user=user, organization=org, restaurant=None)
         
         assert context.organization_id == "org-id"
-        assert context.restaurant_id is None
\ No newline at end of file
+        assert context.restaurant_id is None
+
+def make_tenant_records(user_active=True, org_active=True, restaurant_active=True):
+    """User, organization and restaurant rows as returned by the joined query."""
+    from uuid import uuid4
+    from app.shared.auth.tenant_cache import TenantRecords
+    from app.shared.models.organization import Organization
+    from app.shared.models.restaurant import Restaurant
+
+    org = Organization(id=uuid4(), name="Test Org", is_active=org_active)
+    restaurant = Restaurant(
+        id=uuid4(), name="Test Restaurant", organization_id=org.id, is_active=restaurant_active
+    )
+    user = User(
+        id=uuid4(),
+        email="user@test.com",
+        full_name="Test User",
+        role="manager",
+        password_hash="hashed",
+        organization_id=org.id,
+        restaurant_id=restaurant.id,
+        is_active=user_active,
+    )
+    return TenantRecords(user, org, restaurant)
+
+
+class TestTenantCache:
+    """Test the per-worker cache of resolved tenant records."""
+
+    def test_set_and_get(self):
+        from app.shared.auth.tenant_cache import TenantCache
+
+        cache = TenantCache(ttl=30)
+        records = make_tenant_records()
+        cache.set(records)
+
+        assert cache.get(records.user.id) is records
+
+    @pytest.mark.parametrize("record_index", [0, 1, 2])
+    def test_change_to_any_record_invalidates_entry(self, record_index):
+        from app.shared.auth.tenant_cache import TenantCache
+
+        cache = TenantCache(ttl=30)
+        records = make_tenant_records()
+        cache.set(records)
+
+        cache.invalidate([str(records[record_index].id)])
+
+        assert cache.get(records.user.id) is None
+
+    def test_zero_ttl_disables_cache(self):
+        from app.shared.auth.tenant_cache import TenantCache
+
+        cache = TenantCache(ttl=0)
+        records = make_tenant_records()
+        cache.set(records)
+
+        assert cache.get(records.user.id) is None
+
+    def test_committed_deactivation_invalidates_entry(self):
+        from unittest.mock import Mock
+        from app.shared.auth.tenant_cache import (
+            _collect_changed_records,
+            _invalidate_changed_records,
+            tenant_cache,
+        )
+
+        records = make_tenant_records()
+        tenant_cache.set(records)
+        records.organization.is_active = False
+        session = Mock(info={}, dirty=[records.organization], deleted=[])
+
+        _collect_changed_records(session, None)
+        _invalidate_changed_records(session)
+
+        assert tenant_cache.get(records.user.id) is None
+
+    @pytest.mark.asyncio
+    async def test_published_invalidation_reaches_registered_target(self):
+        from app.shared.auth.tenant_cache import TENANT_INVALIDATION_KIND, tenant_cache
+        from app.shared.cache.service import CacheService
+
+        service = CacheService()
+        service.register_invalidation_target(TENANT_INVALIDATION_KIND, tenant_cache)
+        records = make_tenant_records()
+        tenant_cache.set(records)
+
+        await service.publish_invalidation(TENANT_INVALIDATION_KIND, [str(records.restaurant.id)])
+
+        assert tenant_cache.get(records.user.id) is None
+
+
+class TestTenantResolution:
+    """Test single-query tenant resolution."""
+
+    @pytest.mark.asyncio
+    async def test_records_are_loaded_once_then_cached(self):
+        from unittest.mock import Mock
+        from app.shared.auth.tenant_cache import load_tenant_records, tenant_cache
+
+        records = make_tenant_records()
+        mock_session = AsyncMock()
+        mock_session.exec.return_value = Mock(first=Mock(return_value=tuple(records)))
+
+        first = await load_tenant_records(mock_session, records.user.id)
+        second = await load_tenant_records(mock_session, records.user.id)
+
+        assert first == records
+        assert second is first
+        assert mock_session.exec.await_count == 1
+        tenant_cache.invalidate([str(records.user.id)])
+
+    @pytest.mark.asyncio
+    async def test_tenant_context_reuses_records_from_user_lookup(self):
+        from unittest.mock import Mock
+        from app.shared.auth.deps import get_tenant_context
+
+        records = make_tenant_records()
+        request = Mock()
+        request.state.tenant_records = records
+        mock_session = AsyncMock()
+
+        context = await get_tenant_context(request, records.user, mock_session)
+
+        assert context.organization_id == records.organization.id
+        assert context.restaurant_id == records.restaurant.id
+        mock_session.exec.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_tenant_context_rejects_inactive_restaurant(self):
+        from unittest.mock import Mock
+        from app.shared.auth.deps import get_tenant_context
+
+        records = make_tenant_records(restaurant_active=False)
+        request = Mock()
+        request.state.tenant_records = records
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_tenant_context(request, records.user, AsyncMock())
+
+        assert exc_info.value.status_code == 403
+
+
+class TestTenantCacheAcrossRequests:
+    """Test cached tenant records survive the lifecycle of the session that loaded them."""
+
+    @pytest.mark.asyncio
+    async def test_failed_request_does_not_break_cached_tenant(self, tmp_path):
+        import httpx
+        from datetime import datetime, timezone
+        from fastapi import Depends, FastAPI
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlmodel.ext.asyncio.session import AsyncSession
+        from app.shared.auth.deps import get_current_user
+        from app.shared.auth.tenant_cache import tenant_cache
+        from app.shared.database.session import get_session
+
+        records = make_tenant_records()
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'tenants.db'}")
+        async with engine.begin() as conn:
+            for record in records:
+                await conn.run_sync(type(record).__table__.create)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        now = datetime.now(timezone.utc)
+        async with session_factory() as session:
+            for record in records:
+                record.created_at = record.updated_at = now
+                session.add(record)
+            await session.commit()
+
+        async def override_session():
+            # Same lifecycle as get_session: roll back when the handler raises
+            async with session_factory() as session:
+                try:
+                    yield session
+                except Exception:
+                    await session.rollback()
+                    raise
+
+        app = FastAPI()
+        app.dependency_overrides[get_session] = override_session
+        app.dependency_overrides[get_current_user_token] = lambda: {"user_id": str(records.user.id)}
+
+        @app.get("/fails")
+        async def fails(user: User = Depends(get_current_user)):
+            raise HTTPException(status_code=404, detail="Not found")
+
+        @app.get("/me")
+        async def me(user: User = Depends(get_current_user)):
+            return {"email": user.email, "restaurant_id": str(user.restaurant_id)}
+
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                assert (await client.get("/fails")).status_code == 404
+                response = await client.get("/me")
+        finally:
+            tenant_cache.invalidate([str(records.user.id)])
+            await engine.dispose()
+
+        assert response.status_code == 200
+        assert response.json()["email"] == records.user.email
@@ -0,0 +1,232 @@
+"""
+Unit tests for bulk order import and bulk order updates.
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from decimal import Decimal
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.requests import Request
+
+from app.modules.orders.models.order import Order, OrderStatus, OrderType
+from app.modules.orders.models.order_item import OrderItemCreate
+from app.modules.orders.routes.orders import _ndjson_lines, _read_bulk_rows
+from app.modules.orders.services.order_service import OrderService
+
+
+def make_request(body: bytes, content_type: str, chunk_size: int = 7) -> Request:
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/v1/orders/batch/import",
+        "headers": [(b"content-type", content_type.encode())],
+        "query_string": b"",
+    }
+    return Request(scope, receive)
+
+
+class TestBulkOrderCreation:
+    """Test OrderService.create_orders_bulk."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.mock_session = AsyncMock(spec=AsyncSession)
+        self.mock_session.add = Mock()
+        self.order_service = OrderService(self.mock_session)
+        self.restaurant_id = uuid4()
+        self.organization_id = uuid4()
+        self.burger = Mock(id=uuid4(), price=Decimal("10.00"), description=None)
+        self.burger.name = "Burger"
+        self.mock_session.exec.side_effect = [Mock(all=Mock(return_value=[self.burger]))]
+
+    def rows(self, count, menu_item_id=None):
+        return [
+            (
+                {"order_type": OrderType.TAKEOUT, "customer_name": f"Customer {i}"},
+                [OrderItemCreate(menu_item_id=menu_item_id or self.burger.id, quantity=2)],
+            )
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_prices_once_numbers_once_and_commits_per_batch(self):
+        rows = self.rows(5)
+
+        with patch("app.modules.orders.services.order_service.order_number_allocator") as allocator, \
+             patch.object(self.order_service, "_clear_order_cache", AsyncMock()) as clear_cache:
+            allocator.next_values = AsyncMock(return_value=[11, 12, 13, 14, 15])
+            results = await self.order_service.create_orders_bulk(
+                rows, self.restaurant_id, self.organization_id, batch_size=2
+            )
+
+        # One menu snapshot (no modifiers, so no modifier query) and one counter update
+        assert self.mock_session.exec.await_count == 1
+        assert allocator.next_values.await_count == 1
+        assert self.mock_session.commit.await_count == 3
+        clear_cache.assert_awaited_once_with(self.restaurant_id)
+        assert [result["status"] for result in results] == ["created"] * 5
+        assert results[0]["order_number"].endswith("-0011")
+        assert results[4]["order_number"].endswith("-0015")
+        assert results[0]["total_amount"] == str(Decimal("20.00") * Decimal("1.085"))
+        added_orders = [call.args[0] for call in self.mock_session.add.call_args_list if isinstance(call.args[0], Order)]
+        assert len(added_orders) == 5
+
+    @pytest.mark.asyncio
+    async def test_unpriceable_rows_fail_alone(self):
+        rows = self.rows(1) + self.rows(1, menu_item_id=uuid4()) + self.rows(1)
+
+        with patch("app.modules.orders.services.order_service.order_number_allocator") as allocator, \
+             patch.object(self.order_service, "_clear_order_cache", AsyncMock()):
+            allocator.next_values = AsyncMock(return_value=[1, 2])
+            results = await self.order_service.create_orders_bulk(
+                rows, self.restaurant_id, self.organization_id
+            )
+
+        assert [result["status"] for result in results] == ["created", "error", "created"]
+        assert "not found" in results[1]["error"]
+        assert allocator.next_values.await_args.args[3] == 2
+        assert self.mock_session.commit.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_row_by_row(self):
+        rows = self.rows(3)
+        # The batch commit fails, then the rows commit separately; the second row is bad
+        self.mock_session.commit.side_effect = [Exception("batch failed"), None, Exception("fk violation"), None]
+
+        with patch("app.modules.orders.services.order_service.order_number_allocator") as allocator, \
+             patch.object(self.order_service, "_clear_order_cache", AsyncMock()):
+            allocator.next_values = AsyncMock(return_value=[1, 2, 3])
+            results = await self.order_service.create_orders_bulk(
+                rows, self.restaurant_id, self.organization_id
+            )
+
+        assert [result["status"] for result in results] == ["created", "error", "created"]
+        assert results[1]["error"] == "fk violation"
+        assert self.mock_session.rollback.await_count == 2
+        assert results[2]["order_number"].endswith("-0003")
+
+
+class TestBulkOrderUpdate:
+    """Test OrderService.bulk_update_orders."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.mock_session = AsyncMock(spec=AsyncSession)
+        self.order_service = OrderService(self.mock_session)
+        self.restaurant_id = uuid4()
+
+    @pytest.mark.asyncio
+    async def test_status_update_loads_once_and_commits_once(self):
+        order = Mock(id=uuid4(), status=OrderStatus.PENDING, actual_ready_time=None)
+        missing = str(uuid4())
+        self.mock_session.exec.return_value = Mock(all=Mock(return_value=[order]))
+
+        with patch.object(self.order_service, "_clear_order_cache", AsyncMock()) as clear_cache:
+            details = await self.order_service.bulk_update_orders(
+                [str(order.id), missing, "not-a-uuid"],
+                "status_update",
+                {"new_status": "ready"},
+                self.restaurant_id,
+            )
+
+        assert self.mock_session.exec.await_count == 1
+        assert self.mock_session.commit.await_count == 1
+        clear_cache.assert_awaited_once_with(self.restaurant_id)
+        assert order.status == OrderStatus.READY
+        assert order.actual_ready_time is not None
+        assert details[0] == {
+            "order_id": str(order.id),
+            "status": "success",
+            "previous_value": OrderStatus.PENDING,
+            "new_value": OrderStatus.READY,
+        }
+        assert [detail["status"] for detail in details[1:]] == ["not_found", "not_found"]
+
+    @pytest.mark.asyncio
+    async def test_notes_and_priority(self):
+        order = Mock(id=uuid4(), kitchen_notes="No onions", order_metadata={"source": "pos"})
+        self.mock_session.exec.return_value = Mock(all=Mock(return_value=[order]))
+
+        with patch.object(self.order_service, "_clear_order_cache", AsyncMock()):
+            await self.order_service.bulk_update_orders(
+                [str(order.id)], "notes_add", {"notes": "Rush"}, self.restaurant_id
+            )
+            await self.order_service.bulk_update_orders(
+                [str(order.id)], "priority_update", {"priority": 1}, self.restaurant_id
+            )
+
+        assert order.kitchen_notes == "No onions\nRush"
+        assert order.order_metadata == {"source": "pos", "priority": 1}
+
+    @pytest.mark.asyncio
+    async def test_unknown_action(self):
+        with pytest.raises(ValueError, match="Unknown bulk action"):
+            await self.order_service.bulk_update_orders([str(uuid4())], "delete", {}, self.restaurant_id)
+        self.mock_session.exec.assert_not_called()
+
+
+class TestBulkImportParsing:
+    """Test JSON array and NDJSON import bodies."""
+
+    ORDER = {"order_type": "takeout", "items": [{"menu_item_id": "6f1c1c6e-8d5e-4b43-9a55-2f2f1f4a3b10"}]}
+
+    @pytest.mark.asyncio
+    async def test_ndjson_rows_with_per_row_errors(self):
+        body = b"\n".join([
+            json.dumps({**self.ORDER, "external_id": "ubr-1"}).encode(),
+            b"",
+            json.dumps({"order_type": "takeout", "items": []}).encode(),
+            b"{not json",
+            json.dumps(self.ORDER).encode(),
+        ])
+
+        rows = await _read_bulk_rows(make_request(body, "application/x-ndjson"), max_rows=10)
+
+        assert len(rows) == 4
+        assert rows[0][0].external_id == "ubr-1"
+        assert rows[1][0] is None and "at least one item" in rows[1][1]
+        assert rows[2][0] is None
+        assert rows[3][0].order_type == OrderType.TAKEOUT
+
+    @pytest.mark.asyncio
+    async def test_json_array(self):
+        body = json.dumps([self.ORDER, {"items": []}]).encode()
+
+        rows = await _read_bulk_rows(make_request(body, "application/json"), max_rows=10)
+
+        assert rows[0][1] is None
+        assert "order_type" in rows[1][1]
+
+    @pytest.mark.asyncio
+    async def test_limits_and_shape(self):
+        too_many = json.dumps([self.ORDER] * 3).encode()
+        with pytest.raises(HTTPException) as exc:
+            await _read_bulk_rows(make_request(too_many, "application/json"), max_rows=2)
+        assert exc.value.status_code == 413
+
+        with pytest.raises(HTTPException) as exc:
+            await _read_bulk_rows(make_request(json.dumps(self.ORDER).encode(), "application/json"), max_rows=2)
+        assert exc.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_ndjson_lines_span_chunks(self):
+        async def chunks():
+            for chunk in (b'{"a"', b':1}\n{"b":', b"2}\n\n", b'{"c":3}'):
+                yield chunk
+
+        lines = [line async for line in _ndjson_lines(chunks())]
+
+        assert lines == [b'{"a":1}', b'{"b":2}', b'{"c":3}']
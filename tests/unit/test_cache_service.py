@@ -2,9 +2,25 @@
 Unit tests for cache service functionality.
 """
 
+import asyncio
+import json
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from app.shared.cache.service import CacheService
+from app.shared.cache.service import (
+    CacheService,
+    cache_key,
+    cache_tag,
+    cached,
+    cache_invalidate_tags,
+    INVALIDATION_CHANNEL,
+)
+from app.shared.cache.codec import (
+    JSONCodec,
+    OrjsonCodec,
+    StaleCacheEntry,
+    serialize_cache_value,
+    deserialize_cache_value,
+)
 
 
 class TestCacheService:
@@ -74,4 +90,613 @@ class TestCacheService:
             
             # Should not raise exception and fallback gracefully
             result = await self.cache_service.get("test_key")
-            assert result is None  # Expected fallback behavior
\ No newline at end of file
+            assert result is None  # Expected fallback behavior
+
+class TestCachedDecorator:
+    """Test the @cached key builder, envelope and counters."""
+
+    @pytest.fixture(autouse=True)
+    def memory_cache(self):
+        """Route the decorator through a fresh in-memory cache."""
+        service = CacheService()
+        service.enabled = True
+        with patch("app.shared.cache.service.cache_service", service):
+            yield service
+
+    def test_cache_key_is_stable_for_models(self):
+        from datetime import date
+        from app.modules.tables.models.availability import AvailabilityQuery
+
+        first = AvailabilityQuery(date=date(2030, 1, 1), party_size=4)
+        second = AvailabilityQuery(date=date(2030, 1, 1), party_size=4)
+        other = AvailabilityQuery(date=date(2030, 1, 1), party_size=5)
+
+        assert cache_key("availability", first) == cache_key("availability", second)
+        assert cache_key("availability", first) != cache_key("availability", other)
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_left_out_of_the_key(self, memory_cache):
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        calls = []
+
+        @cached(ttl=60, key_prefix="test")
+        async def lookup(session, restaurant_id: str, limit: int = 10):
+            calls.append(restaurant_id)
+            return {"restaurant_id": restaurant_id, "limit": limit}
+
+        await lookup(MagicMock(spec=AsyncSession), "rest-1")
+        result = await lookup(MagicMock(spec=AsyncSession), restaurant_id="rest-1", limit=10)
+
+        assert calls == ["rest-1"]
+        assert result == {"restaurant_id": "rest-1", "limit": 10}
+        stats = memory_cache.get_stats()["test"]
+        assert (stats["hits"], stats["misses"], stats["sets"], stats["hit_ratio"]) == (1, 1, 1, 0.5)
+
+    @pytest.mark.asyncio
+    async def test_include_allow_list(self, memory_cache):
+        calls = []
+
+        @cached(ttl=60, key_prefix="test", include=["restaurant_id"])
+        async def lookup(restaurant_id: str, request_id: str):
+            calls.append(request_id)
+            return restaurant_id
+
+        await lookup("rest-1", "req-1")
+        await lookup("rest-1", "req-2")
+        await lookup("rest-2", "req-3")
+
+        assert calls == ["req-1", "req-3"]
+
+    @pytest.mark.asyncio
+    async def test_models_are_rehydrated(self, memory_cache):
+        from datetime import date, time
+        from app.modules.tables.models.availability import AvailabilityResponse, AvailabilitySlot
+
+        @cached(ttl=60, key_prefix="test", key_builder=lambda day: day.isoformat())
+        async def lookup(day):
+            return AvailabilityResponse(
+                date=day,
+                available_slots=[AvailabilitySlot(time=time(19, 0), available_tables=2, total_capacity=8)],
+            )
+
+        await lookup(date(2030, 1, 1))
+        result = await lookup(date(2030, 1, 1))
+
+        assert isinstance(result, AvailabilityResponse)
+        assert result.date == date(2030, 1, 1)
+        assert result.available_slots[0].time == time(19, 0)
+        assert memory_cache.get_stats()["test"]["hits"] == 1
+
+    def test_envelope_round_trip_for_model_lists(self):
+        from datetime import time
+        from app.modules.tables.models.availability import AvailabilitySlot
+
+        slots = [AvailabilitySlot(time=time(18, 30), available_tables=1, total_capacity=4)]
+        envelope = json.loads(json.dumps(serialize_cache_value(slots)))
+
+        assert deserialize_cache_value(envelope) == slots
+
+
+class TestCacheInvalidation:
+    """Test tag-based and pattern invalidation."""
+
+    @pytest.fixture(autouse=True)
+    def memory_cache(self):
+        """Route the decorators through a fresh in-memory cache."""
+        service = CacheService()
+        service.enabled = True
+        with patch("app.shared.cache.service.cache_service", service):
+            yield service
+
+    @pytest.mark.asyncio
+    async def test_tag_bump_only_invalidates_matching_restaurant(self):
+        calls = []
+
+        @cached(ttl=60, key_prefix="test", tags=lambda restaurant_id, **_: [cache_tag("test", restaurant_id)])
+        async def lookup(restaurant_id: str):
+            calls.append(restaurant_id)
+            return restaurant_id
+
+        @cache_invalidate_tags(lambda result, restaurant_id, **_: [cache_tag("test", restaurant_id)])
+        async def write(restaurant_id: str):
+            return True
+
+        await lookup("rest-1")
+        await lookup("rest-2")
+        await write("rest-1")
+        await lookup("rest-1")
+        await lookup("rest-2")
+
+        assert calls == ["rest-1", "rest-2", "rest-1"]
+
+    @pytest.mark.asyncio
+    async def test_bump_generations_uses_one_pipeline(self, memory_cache):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[1, 1])
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        memory_cache.redis_client = MagicMock()
+        memory_cache.redis_client.pipeline.return_value = pipe
+        memory_cache.redis_available = True
+
+        await memory_cache.bump_generations(["availability:r1", "availability:r1:2030-01-01"])
+
+        assert pipe.incr.call_count == 2
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_memory_generations_are_bounded(self, memory_cache):
+        memory_cache.memory_cache.max_entries = 2
+
+        for i in range(5):
+            await memory_cache.bump_generations([f"availability:r{i}"])
+
+        assert len(memory_cache.memory_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_evicted_generation_still_invalidates(self, memory_cache):
+        calls = []
+
+        @cached(ttl=60, key_prefix="test", tags=lambda restaurant_id, **_: [cache_tag("test", restaurant_id)])
+        async def lookup(restaurant_id: str):
+            calls.append(restaurant_id)
+            return restaurant_id
+
+        await lookup("rest-1")
+        await memory_cache.bump_generations([cache_tag("test", "rest-1")])
+        memory_cache.memory_cache.delete("cache_gen:test:rest-1")
+        await lookup("rest-1")
+
+        assert calls == ["rest-1", "rest-1"]
+
+    @pytest.mark.asyncio
+    async def test_clear_pattern_scans_instead_of_keys(self, memory_cache):
+        async def scan_iter(match, count):
+            for key in ["orders:1", "orders:2"]:
+                yield key
+
+        memory_cache.redis_client = MagicMock()
+        memory_cache.redis_client.scan_iter = scan_iter
+        memory_cache.redis_client.unlink = AsyncMock(return_value=2)
+        memory_cache.redis_available = True
+
+        await memory_cache.clear_pattern("orders:*")
+
+        memory_cache.redis_client.keys.assert_not_called()
+        memory_cache.redis_client.unlink.assert_awaited_once_with("orders:1", "orders:2")
+
+    @pytest.mark.asyncio
+    async def test_memory_clear_pattern_matches_globs(self, memory_cache):
+        await memory_cache.set("availability:1", 1, 60)
+        await memory_cache.set("public_availability:1", 2, 60)
+
+        await memory_cache.clear_pattern("availability:*")
+
+        assert await memory_cache.get("availability:1") is None
+        assert await memory_cache.get("public_availability:1") == 2
+
+
+class TestSingleFlightAndStaleWhileRevalidate:
+    """Test request coalescing and stale-while-revalidate in @cached."""
+
+    @pytest.fixture(autouse=True)
+    def memory_cache(self):
+        """Route the decorators through a fresh in-memory cache."""
+        service = CacheService()
+        service.enabled = True
+        with patch("app.shared.cache.service.cache_service", service):
+            yield service
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self):
+        calls = []
+        release = asyncio.Event()
+
+        @cached(ttl=60, key_prefix="test")
+        async def lookup(restaurant_id: str):
+            calls.append(restaurant_id)
+            await release.wait()
+            return {"restaurant_id": restaurant_id}
+
+        pending = [asyncio.create_task(lookup("rest-1")) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*pending)
+
+        assert calls == ["rest-1"]
+        assert all(result == {"restaurant_id": "rest-1"} for result in results)
+
+    @pytest.mark.asyncio
+    async def test_waiters_get_their_own_copy(self):
+        release = asyncio.Event()
+
+        @cached(ttl=60, key_prefix="test")
+        async def lookup(restaurant_id: str):
+            await release.wait()
+            return {"restaurant_id": restaurant_id, "tables": [1, 2]}
+
+        pending = [asyncio.create_task(lookup("rest-1")) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*pending)
+
+        assert results[0] == results[1] == results[2]
+        assert len({id(result) for result in results}) == 3
+        assert results[1]["tables"] is not results[2]["tables"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_loader_does_not_fail_waiters(self):
+        calls = []
+        release = asyncio.Event()
+
+        @cached(ttl=60, key_prefix="test")
+        async def lookup(restaurant_id: str):
+            calls.append(restaurant_id)
+            await release.wait()
+            return {"restaurant_id": restaurant_id}
+
+        leader = asyncio.create_task(lookup("rest-1"))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(lookup("rest-1")) for _ in range(2)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        # Let one waiter take over the load before it can finish
+        for _ in range(3):
+            await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert leader.cancelled()
+        assert results == [{"restaurant_id": "rest-1"}] * 2
+        assert calls == ["rest-1", "rest-1"]
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_raised_to_every_waiter(self):
+        release = asyncio.Event()
+
+        @cached(ttl=60, key_prefix="test")
+        async def lookup(restaurant_id: str):
+            await release.wait()
+            raise ValueError("boom")
+
+        pending = [asyncio.create_task(lookup("rest-1")) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*pending, return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_refreshing(self):
+        calls = []
+
+        @cached(ttl=60, key_prefix="test", stale_ttl=30)
+        async def lookup(restaurant_id: str):
+            calls.append(restaurant_id)
+            return len(calls)
+
+        assert await lookup("rest-1") == 1
+
+        with patch("app.shared.cache.service.clock.time", return_value=10**10):
+            # Past its fresh window: the old value comes back immediately
+            assert await lookup("rest-1") == 1
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        assert calls == ["rest-1", "rest-1"]
+        assert await lookup("rest-1") == 2
+
+
+class TestLocalCacheTier:
+    """Test the per-worker L1 in front of Redis."""
+
+    @pytest.fixture
+    def service(self):
+        service = CacheService()
+        service.enabled = True
+        service.l1_enabled = True
+        service.redis_available = True
+        service.redis_client = MagicMock()
+        service.redis_client.get = AsyncMock(return_value=service.codec.dumps({"value": 1}))
+        service.redis_client.setex = AsyncMock()
+        service.redis_client.delete = AsyncMock()
+        service.redis_client.publish = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_are_served_from_l1(self, service):
+        assert await service.get("menu:1") == {"value": 1}
+        assert await service.get("menu:1") == {"value": 1}
+
+        service.redis_client.get.assert_awaited_once_with("menu:1")
+
+    @pytest.mark.asyncio
+    async def test_delete_publishes_invalidation(self, service):
+        await service.get("menu:1")
+        await service.delete("menu:1")
+
+        assert "menu:1" not in service.local_cache
+        service.redis_client.publish.assert_awaited_once_with(
+            INVALIDATION_CHANNEL, json.dumps({"kind": "key", "values": ["menu:1"]})
+        )
+
+    @pytest.mark.asyncio
+    async def test_remote_invalidation_drops_l1_entries(self, service):
+        await service.set("menu:1", {"value": 1}, 60)
+        await service.set("menu:2", {"value": 2}, 60)
+
+        service._apply_invalidation("pattern", ["menu:*"])
+
+        assert len(service.local_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_l1_is_bypassed_without_redis(self, service):
+        service.redis_available = False
+
+        await service.set("menu:1", {"value": 1}, 60)
+
+        assert len(service.local_cache) == 0
+        assert await service.get("menu:1") == {"value": 1}
+
+
+class TestBulkOperations:
+    """Test pipelined bulk writes and request batching."""
+
+    @pytest.fixture
+    def memory_cache(self):
+        service = CacheService()
+        service.enabled = True
+        return service
+
+    @pytest.fixture
+    def redis_cache(self):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[])
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+
+        service = CacheService()
+        service.enabled = True
+        service.redis_available = True
+        service.redis_client = MagicMock()
+        service.redis_client.pipeline.return_value = pipe
+        service.redis_client.get = AsyncMock(return_value=None)
+        service.redis_client.setex = AsyncMock()
+        service.redis_client.delete = AsyncMock()
+        return service, pipe
+
+    @pytest.mark.asyncio
+    async def test_set_and_delete_many_use_one_pipeline(self, redis_cache):
+        service, pipe = redis_cache
+
+        await service.set_many({"k1": 1, "k2": 2}, ttl=30)
+        await service.delete_many(["k3", "k4"])
+
+        assert pipe.setex.call_count == 2
+        pipe.unlink.assert_called_once_with("k3", "k4")
+        assert pipe.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_flushes_all_writes_once(self, redis_cache):
+        service, pipe = redis_cache
+
+        async with service.batch():
+            await service.set("k1", {"v": 1}, ttl=30)
+            await service.delete("k2")
+            await service.delete_many(["k3"])
+            # Reads inside the batch see pending writes without Redis
+            assert await service.get("k1") == {"v": 1}
+            assert await service.get("k2") is None
+            pipe.execute.assert_not_awaited()
+
+        service.redis_client.setex.assert_not_awaited()
+        service.redis_client.delete.assert_not_awaited()
+        service.redis_client.get.assert_not_awaited()
+        pipe.setex.assert_called_once_with("k1", 30, service.codec.dumps({"v": 1}))
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_batch_flushes_when_block_raises(self, memory_cache):
+        await memory_cache.set("k1", 1, 60)
+
+        with pytest.raises(RuntimeError):
+            async with memory_cache.batch():
+                await memory_cache.delete("k1")
+                raise RuntimeError("boom")
+
+        assert await memory_cache.get("k1") is None
+
+    @pytest.mark.asyncio
+    async def test_memory_fallback_bulk_round_trip(self, memory_cache):
+        await memory_cache.set_many({"k1": 1, "k2": 2}, ttl=60)
+        assert [await memory_cache.get(key) for key in ["k1", "k2", "k3"]] == [1, 2, None]
+
+        await memory_cache.delete_many(["k1", "k2"])
+        assert [await memory_cache.get(key) for key in ["k1", "k2"]] == [None, None]
+
+
+class TestCacheCodec:
+    """Test typed, versioned cache payloads."""
+
+    @pytest.fixture(params=[JSONCodec, OrjsonCodec])
+    def codec(self, request):
+        if request.param is OrjsonCodec:
+            pytest.importorskip("orjson")
+        return request.param()
+
+    def test_scalars_keep_their_types(self, codec):
+        from datetime import date, datetime, time
+        from decimal import Decimal
+        from uuid import uuid4
+
+        value = {
+            "price": Decimal("12.50"),
+            "id": uuid4(),
+            "day": date(2030, 1, 1),
+            "at": time(19, 30),
+            "created": datetime(2030, 1, 1, 19, 30, 15),
+            "items": [Decimal("1.10"), None, "x", 3],
+        }
+
+        assert codec.loads(codec.dumps(value)) == value
+
+    def test_table_models_round_trip(self, codec):
+        from decimal import Decimal
+        from uuid import uuid4
+        import app.main  # noqa: F401  # configure ORM relationships
+        from app.modules.orders.models.order import Order, OrderType
+
+        order = Order(
+            order_number="ORD-1",
+            order_type=OrderType.DINE_IN,
+            organization_id=uuid4(),
+            restaurant_id=uuid4(),
+            subtotal=Decimal("10.00"),
+            tax_amount=Decimal("0.85"),
+            tip_amount=Decimal("0"),
+            total_amount=Decimal("10.85"),
+        )
+
+        restored = codec.loads(codec.dumps([order]))
+
+        assert isinstance(restored[0], Order)
+        assert restored[0] == order
+        assert isinstance(restored[0].total_amount, Decimal)
+
+    def test_old_format_reads_as_stale(self, codec):
+        with pytest.raises(StaleCacheEntry):
+            codec.loads(json.dumps({"value": 1}))
+
+    def test_changed_model_reads_as_stale(self):
+        from datetime import time
+        from app.modules.tables.models.availability import AvailabilitySlot
+
+        wire = serialize_cache_value(AvailabilitySlot(time=time(18, 0), available_tables=1, total_capacity=4))
+        wire["schema"] = "outdated"
+
+        with pytest.raises(StaleCacheEntry):
+            deserialize_cache_value(wire)
+
+    def test_models_outside_the_app_are_not_rebuilt(self):
+        wire = {
+            "__cache_type__": "model",
+            "model": "subprocess:Popen",
+            "schema": "x",
+            "data": {"args": ["true"]},
+        }
+
+        with pytest.raises(StaleCacheEntry):
+            deserialize_cache_value(wire)
+
+    def test_codec_requires_dumps_and_loads(self):
+        from app.shared.cache.codec import CacheCodec
+
+        with pytest.raises(TypeError):
+            CacheCodec()
+
+    @pytest.mark.asyncio
+    async def test_service_treats_stale_entries_as_misses(self):
+        service = CacheService()
+        service.enabled = True
+        service.memory_cache.set("legacy", json.dumps({"value": 1}), 60)
+
+        assert await service.get("legacy") is None
+
+
+class TestCacheMetrics:
+    """Test per-prefix counters and latency histograms."""
+
+    @pytest.fixture
+    def memory_cache(self):
+        service = CacheService()
+        service.enabled = True
+        return service
+
+    @pytest.mark.asyncio
+    async def test_counters_are_grouped_by_key_prefix(self, memory_cache):
+        await memory_cache.set("menu:1", 1, 60)
+        await memory_cache.get("menu:1")
+        await memory_cache.get("menu:2")
+        await memory_cache.get("orders:1")
+
+        stats = memory_cache.get_stats()
+        assert stats["menu"]["sets"] == 1
+        assert (stats["menu"]["hits"], stats["menu"]["misses"]) == (1, 1)
+        assert stats["menu"]["hit_ratio"] == 0.5
+        assert stats["orders"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_clear_pattern_reports_deleted_keys(self, memory_cache):
+        await memory_cache.set_many({"orders:1": 1, "orders:2": 2, "menu:1": 3}, ttl=60)
+
+        assert await memory_cache.clear_pattern("orders:*") == 2
+        stats = memory_cache.get_stats()["orders"]
+        assert (stats["invalidations"], stats["invalidated_keys"]) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_redis_clear_pattern_counts_unlinked_keys(self, memory_cache):
+        async def scan_iter(match, count):
+            for key in ["orders:1", "orders:2", "orders:3"]:
+                yield key
+
+        memory_cache.redis_client = MagicMock()
+        memory_cache.redis_client.scan_iter = scan_iter
+        memory_cache.redis_client.unlink = AsyncMock(return_value=3)
+        memory_cache.redis_available = True
+
+        assert await memory_cache.clear_pattern("orders:*") == 3
+
+    @pytest.mark.asyncio
+    async def test_tag_bumps_record_fan_out(self, memory_cache):
+        await memory_cache.bump_generations([
+            "availability:r1", "availability:r1:2030-01-01", "reservations:r1",
+        ])
+
+        stats = memory_cache.get_stats()
+        assert stats["availability"]["invalidated_keys"] == 2
+        assert stats["reservations"]["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_evictions_are_attributed_to_the_evicted_prefix(self, memory_cache):
+        memory_cache.memory_cache.max_entries = 1
+
+        await memory_cache.set("menu:1", 1, 60)
+        await memory_cache.set("orders:1", 2, 60)
+
+        assert memory_cache.get_stats()["menu"]["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_histograms_and_report(self, memory_cache):
+        await memory_cache.set("menu:1", 1, 60)
+        await memory_cache.get("menu:1")
+
+        latency = memory_cache.get_latency_stats()
+        assert latency["get"]["menu"]["count"] == 1
+        assert latency["set"]["menu"]["count"] == 1
+        assert sum(latency["get"]["menu"]["buckets"].values()) == 1
+
+        report = await memory_cache.get_metrics()
+        assert report["backend"] == "memory"
+        assert report["prefixes"]["menu"]["hits"] == 1
+
+        memory_cache.reset_stats()
+        assert memory_cache.get_stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_stale_hits_are_counted(self):
+        service = CacheService()
+        service.enabled = True
+
+        @cached(ttl=60, key_prefix="test", stale_ttl=30)
+        async def lookup(restaurant_id: str):
+            return restaurant_id
+
+        with patch("app.shared.cache.service.cache_service", service):
+            await lookup("rest-1")
+            with patch("app.shared.cache.service.clock.time", return_value=10**10):
+                await lookup("rest-1")
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+
+        assert service.get_stats()["test"]["stale_hits"] == 1
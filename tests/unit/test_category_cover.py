@@ -3,7 +3,7 @@ Unit tests for category cover image functionality.
 """
 
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 from uuid import uuid4
 
 from app.modules.menu.models.category import (
@@ -363,4 +363,59 @@ class TestCategoryCoverIntegration:
         update = MenuCategoryUpdate(description="Updated description")
         # In actual implementation, the service would preserve the existing cover_image_url
         # when it's not included in the update
-        assert update.description == "Updated description"
\ No newline at end of file
+        assert update.description == "Updated description"
+
+class TestItemImageUpload:
+    """Test that item image uploads refresh the cached public menu."""
+    
+    @pytest.fixture
+    def memory_cache(self):
+        """Route cache invalidation through a fresh in-memory cache."""
+        from app.shared.cache.service import CacheService
+        
+        service = CacheService()
+        service.enabled = True
+        with patch("app.shared.cache.service.cache_service", service):
+            yield service
+    
+    @pytest.mark.asyncio
+    async def test_upload_bumps_public_menu_tag(self, memory_cache, tmp_path):
+        """Test uploading an item image invalidates the restaurant's public menu."""
+        from io import BytesIO
+        from starlette.datastructures import Headers, UploadFile
+        from app.core.config import settings
+        from app.modules.menu.routes.items import upload_item_image
+        from app.modules.menu.services.cache_tags import public_menu_tags
+        
+        restaurant_id = str(uuid4())
+        tenant_context = Mock(organization_id=str(uuid4()), restaurant_id=restaurant_id)
+        item = Mock(image_url=None)
+        session = AsyncMock()
+        session.add = Mock()
+        image = UploadFile(
+            file=BytesIO(b"\x89PNG"),
+            filename="dish.png",
+            headers=Headers({"content-type": "image/png"}),
+        )
+        tags = public_menu_tags(restaurant_id)
+        before = await memory_cache.get_generations(tags)
+        
+        upload_settings = Mock(
+            MAX_FILE_SIZE=settings.MAX_FILE_SIZE,
+            ALLOWED_IMAGE_EXTENSIONS=settings.ALLOWED_IMAGE_EXTENSIONS,
+            upload_path=tmp_path,
+        )
+        
+        with patch("app.modules.menu.routes.items.settings", upload_settings), \
+                patch.object(MenuItemService, "get_item_by_id", AsyncMock(return_value=item)):
+            response = await upload_item_image(
+                item_id=str(uuid4()),
+                image=image,
+                tenant_context=tenant_context,
+                session=session,
+                current_user=Mock(),
+            )
+        
+        assert item.image_url == response["image_url"]
+        session.commit.assert_awaited_once()
+        assert await memory_cache.get_generations(tags) != before
@@ -3,7 +3,7 @@ Unit tests for health check endpoints.
 """
 
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from fastapi.testclient import TestClient
 from app.core.app import app
 
@@ -74,4 +74,109 @@ class TestHealthEndpoints:
             assert data["status"] == "unhealthy"
             assert data["database"] == "error"
             assert data["connection_test"] == "failed"
-            assert "error" in data
\ No newline at end of file
+            assert "error" in data
+
+class TestReadinessProbe:
+    """Test dependency checks behind the readiness probe."""
+
+    def make_checker(self, **kwargs):
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from app.core.health import HealthChecker
+
+        cache = Mock(enabled=True, redis_client=Mock(ping=AsyncMock(return_value=True)))
+        return HealthChecker(create_async_engine("sqlite+aiosqlite://"), cache, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_ready_with_latencies(self):
+        checker = self.make_checker()
+
+        report = await checker.readiness()
+
+        assert report["status"] == "ready"
+        assert report["cached"] is False
+        assert report["checks"]["database"]["status"] == "up"
+        assert report["checks"]["database"]["latency_ms"] >= 0
+        assert report["checks"]["redis"]["status"] == "up"
+        await checker.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_report_is_cached(self):
+        checker = self.make_checker(cache_ttl=60)
+
+        await checker.readiness()
+        report = await checker.readiness()
+
+        assert report["cached"] is True
+        assert checker.cache.redis_client.ping.await_count == 1
+        await checker.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_probes_share_one_check(self):
+        import asyncio
+
+        checker = self.make_checker()
+
+        reports = await asyncio.gather(*(checker.readiness() for _ in range(5)))
+
+        assert all(report["status"] == "ready" for report in reports)
+        assert checker.cache.redis_client.ping.await_count == 1
+        await checker.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_slow_database_is_down(self):
+        import asyncio
+
+        checker = self.make_checker(db_timeout=0.01)
+
+        async def hang():
+            await asyncio.sleep(1)
+
+        with patch.object(checker, "_select_one", hang):
+            report = await checker.readiness()
+
+        assert report["status"] == "not_ready"
+        assert report["checks"]["database"]["status"] == "down"
+
+    @pytest.mark.asyncio
+    async def test_exhausted_pool_is_not_ready_and_skips_database(self):
+        checker = self.make_checker()
+        stats = {"pool": "InstrumentedAsyncPool", "size": 5, "max_overflow": 5,
+                 "checked_out": 10, "saturation": 1.0, "timeouts": 3}
+
+        with patch("app.core.health.get_pool_stats", return_value=stats), \
+                patch.object(checker, "check_database", AsyncMock()) as check_database:
+            report = await checker.readiness()
+
+        assert report["status"] == "not_ready"
+        assert report["checks"]["pool"]["status"] == "exhausted"
+        assert report["checks"]["database"]["status"] == "skipped"
+        check_database.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_redis_down_is_degraded_unless_required(self):
+        checker = self.make_checker()
+        checker.cache.redis_client.ping = AsyncMock(side_effect=ConnectionError("refused"))
+
+        report = await checker.readiness()
+        assert report["status"] == "ready"
+        assert report["checks"]["redis"]["status"] == "down"
+
+        checker.redis_required = True
+        checker.invalidate()
+        assert (await checker.readiness())["status"] == "not_ready"
+        await checker.engine.dispose()
+
+    def test_readiness_endpoint_returns_503_when_not_ready(self):
+        report = {"status": "not_ready", "checks": {}, "cached": False}
+        with patch("app.modules.setup.routes.health_checker") as checker:
+            checker.readiness = AsyncMock(return_value=report)
+            response = TestClient(app).get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+
+    def test_liveness_endpoint(self):
+        response = TestClient(app).get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
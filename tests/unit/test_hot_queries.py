@@ -0,0 +1,77 @@
+"""
+Unit tests for the prebuilt hot-path statements and their bound parameters.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.modules.menu.services.item import _PUBLIC_MENU_QUERY
+from app.modules.orders.services.kitchen_service import KITCHEN_ORDERS_QUERY, KitchenService
+from app.modules.tables.services.reservation import (
+    _OVERLAPPING_RESERVATIONS_EXCLUDING_QUERY,
+    _OVERLAPPING_RESERVATIONS_QUERY,
+)
+from app.shared.auth.tenant_cache import _TENANT_RECORDS_QUERY
+
+RESTAURANT_ID = uuid4()
+
+
+def compiled(statement):
+    return statement.compile(dialect=postgresql.asyncpg.dialect())
+
+
+class TestPrebuiltQueries:
+    """The module-level statements bind per-call values as typed parameters."""
+
+    def test_kitchen_orders(self):
+        sql = str(compiled(KITCHEN_ORDERS_QUERY))
+
+        assert "orders.restaurant_id = $1::UUID" in sql
+        assert "ORDER BY orders.created_at ASC" in sql
+
+    def test_overlapping_reservations(self):
+        sql = str(compiled(_OVERLAPPING_RESERVATIONS_QUERY))
+        excluding = compiled(_OVERLAPPING_RESERVATIONS_EXCLUDING_QUERY)
+
+        assert "reservations.table_id = $1::UUID" in sql
+        assert "reservations.reservation_date = $2::DATE" in sql
+        assert "reservations.id != $3::UUID" in str(excluding)
+        assert "exclude_id" not in sql
+
+    def test_tenant_records(self):
+        sql = str(compiled(_TENANT_RECORDS_QUERY))
+
+        assert "users.id = $1::UUID" in sql
+        assert "LEFT OUTER JOIN restaurants" in sql
+
+    def test_public_menu(self):
+        sql = str(compiled(_PUBLIC_MENU_QUERY))
+
+        assert "menu_items.restaurant_id = $1::UUID" in sql
+        assert "ORDER BY menu_categories.sort_order, menu_items.name" in sql
+
+    def test_cache_key_is_built_once(self):
+        # Reusing the statement object means SQLAlchemy's cache key lookup is memoized
+        assert KITCHEN_ORDERS_QUERY._generate_cache_key() is KITCHEN_ORDERS_QUERY._generate_cache_key()
+
+
+class TestPrebuiltQueryUse:
+    """Services execute the shared statement with parameters."""
+
+    @pytest.mark.asyncio
+    async def test_kitchen_orders_binds_restaurant(self):
+        session = Mock()
+        session.exec = AsyncMock(return_value=Mock(all=Mock(return_value=[])))
+        kitchen = KitchenService(session)
+
+        with patch("app.modules.orders.services.kitchen_service.cache_service") as cache:
+            cache.get = AsyncMock(return_value=None)
+            cache.set = AsyncMock()
+            await kitchen.get_kitchen_orders(RESTAURANT_ID)
+
+        session.exec.assert_awaited_once_with(
+            KITCHEN_ORDERS_QUERY, params={"restaurant_id": RESTAURANT_ID}
+        )
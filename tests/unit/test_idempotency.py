@@ -0,0 +1,237 @@
+"""
+Unit tests for Idempotency-Key handling on retry-prone POST endpoints.
+"""
+
+import asyncio
+import pytest
+import httpx
+from unittest.mock import AsyncMock, Mock
+from fastapi import Body, FastAPI, HTTPException
+
+from app.core.idempotency import IdempotencyStore, StoredResponse, idempotent_paths
+from app.core.middleware import IdempotencyMiddleware
+
+
+class DictCache:
+    """Just enough of CacheService for the store."""
+
+    def __init__(self):
+        self.enabled = True
+        self.redis_client = None
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+
+def build_app(store, wait_timeout=2.0, handler_delay=0.0, fail=False):
+    app = FastAPI()
+    calls = []
+
+    @app.post("/api/v1/orders/", status_code=201)
+    async def create_order(payload: dict = Body(...)):
+        calls.append(payload)
+        await asyncio.sleep(handler_delay)
+        if fail:
+            raise HTTPException(status_code=503, detail="database unavailable")
+        return {"order": len(calls), **payload}
+
+    @app.post("/api/v1/qr-orders/place-order")
+    async def place_qr_order(payload: dict = Body(...)):
+        calls.append(payload)
+        return {"order": len(calls), **payload}
+
+    @app.post("/api/v1/tables/")
+    async def create_table(payload: dict = Body(...)):
+        calls.append(payload)
+        return {"table": len(calls)}
+
+    app.add_middleware(
+        IdempotencyMiddleware,
+        store=store,
+        paths=idempotent_paths("/api/v1"),
+        wait_timeout=wait_timeout,
+        poll_interval=0.01,
+    )
+    return app, calls
+
+
+def client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+class TestIdempotencyMiddleware:
+    """Test replay, conflict and concurrency behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_retry_replays_first_response(self):
+        app, calls = build_app(IdempotencyStore(DictCache()))
+        headers = {"Idempotency-Key": "abc", "Authorization": "Bearer t1"}
+
+        async with client(app) as http:
+            first = await http.post("/api/v1/orders/", json={"item": 1}, headers=headers)
+            retry = await http.post("/api/v1/orders/", json={"item": 1}, headers=headers)
+
+        assert len(calls) == 1
+        assert retry.status_code == first.status_code == 201
+        assert retry.json() == first.json() == {"order": 1, "item": 1}
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+
+    @pytest.mark.asyncio
+    async def test_key_reused_with_different_body(self):
+        app, calls = build_app(IdempotencyStore(DictCache()))
+        headers = {"Idempotency-Key": "abc", "Authorization": "Bearer t1"}
+
+        async with client(app) as http:
+            await http.post("/api/v1/orders/", json={"item": 1}, headers=headers)
+            response = await http.post("/api/v1/orders/", json={"item": 2}, headers=headers)
+
+        assert response.status_code == 422
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_are_scoped_to_the_caller(self):
+        app, calls = build_app(IdempotencyStore(DictCache()))
+
+        async with client(app) as http:
+            for token in ("t1", "t2"):
+                await http.post(
+                    "/api/v1/orders/",
+                    json={"item": 1},
+                    headers={"Idempotency-Key": "abc", "Authorization": f"Bearer {token}"},
+                )
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_anonymous_sessions_sharing_a_key_stay_apart(self):
+        app, calls = build_app(IdempotencyStore(DictCache()))
+        headers = {"Idempotency-Key": "abc"}
+
+        async with client(app) as http:
+            first = await http.post("/api/v1/qr-orders/place-order", json={"session_id": "s1"}, headers=headers)
+            second = await http.post("/api/v1/qr-orders/place-order", json={"session_id": "s2"}, headers=headers)
+            retry = await http.post("/api/v1/qr-orders/place-order", json={"session_id": "s1"}, headers=headers)
+
+        assert len(calls) == 2
+        assert first.json() == {"order": 1, "session_id": "s1"}
+        assert second.json() == {"order": 2, "session_id": "s2"}
+        assert retry.json() == first.json()
+        assert retry.headers["idempotent-replayed"] == "true"
+
+    @pytest.mark.asyncio
+    async def test_requests_without_key_or_outside_paths_pass_through(self):
+        app, calls = build_app(IdempotencyStore(DictCache()))
+
+        async with client(app) as http:
+            await http.post("/api/v1/orders/", json={"item": 1})
+            await http.post("/api/v1/orders/", json={"item": 1})
+            await http.post("/api/v1/tables/", json={}, headers={"Idempotency-Key": "abc"})
+            await http.post("/api/v1/tables/", json={}, headers={"Idempotency-Key": "abc"})
+
+        assert len(calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_server_errors_are_not_stored(self):
+        cache = DictCache()
+        app, calls = build_app(IdempotencyStore(cache), fail=True)
+
+        async with client(app) as http:
+            for _ in range(2):
+                response = await http.post("/api/v1/orders/", json={}, headers={"Idempotency-Key": "abc"})
+
+        assert response.status_code == 503
+        assert len(calls) == 2
+        assert cache.data == {}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_run_once(self):
+        app, calls = build_app(IdempotencyStore(DictCache()), handler_delay=0.05)
+        headers = {"Idempotency-Key": "abc"}
+
+        async with client(app) as http:
+            responses = await asyncio.gather(
+                *(http.post("/api/v1/orders/", json={"item": 1}, headers=headers) for _ in range(5))
+            )
+
+        assert len(calls) == 1
+        assert {response.status_code for response in responses} == {201}
+        assert all(response.json() == {"order": 1, "item": 1} for response in responses)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_gives_up_while_first_is_running(self):
+        store = IdempotencyStore(DictCache())
+        app, calls = build_app(store, wait_timeout=0.05, handler_delay=0.3)
+        headers = {"Idempotency-Key": "abc"}
+
+        async with client(app) as http:
+            first = asyncio.create_task(http.post("/api/v1/orders/", json={}, headers=headers))
+            await asyncio.sleep(0.05)
+            duplicate = await http.post("/api/v1/orders/", json={}, headers=headers)
+            await first
+
+        assert duplicate.status_code == 409
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_key(self):
+        app, calls = build_app(IdempotencyStore(DictCache()))
+
+        async with client(app) as http:
+            response = await http.post("/api/v1/orders/", json={}, headers={"Idempotency-Key": "x" * 256})
+
+        assert response.status_code == 400
+        assert calls == []
+
+    def test_paths(self):
+        paths = idempotent_paths("/api/v1")
+
+        def matches(path):
+            return any(pattern.match(path) for pattern in paths)
+
+        assert matches("/api/v1/orders/")
+        assert matches("/api/v1/qr-orders/place-order")
+        assert matches("/api/v1/payments/orders/123/pay")
+        assert matches("/api/v1/public/reservations/123/book")
+        assert not matches("/api/v1/payments/orders/123/split-pay")
+        assert not matches("/api/v1/orders/123/status")
+
+
+class TestIdempotencyStore:
+    """Test the Redis lock path."""
+
+    @pytest.mark.asyncio
+    async def test_redis_lock(self):
+        cache = DictCache()
+        cache.redis_client = Mock()
+        cache.redis_client.set = AsyncMock(side_effect=[True, None])
+        cache.redis_client.eval = AsyncMock()
+        store = IdempotencyStore(cache, lock_ttl=5)
+
+        token = await store.acquire("idempotency:k")
+        assert await store.acquire("idempotency:k") is None
+        await store.release("idempotency:k", token)
+
+        first_call = cache.redis_client.set.await_args_list[0]
+        assert first_call.args == ("idempotency_lock:idempotency:k", token)
+        assert first_call.kwargs == {"nx": True, "px": 5000}
+        assert cache.redis_client.eval.await_args.args[1:] == (1, "idempotency_lock:idempotency:k", token)
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_does_not_block_requests(self):
+        cache = DictCache()
+        cache.redis_client = Mock(set=AsyncMock(side_effect=ConnectionError("down")))
+
+        assert await IdempotencyStore(cache).acquire("idempotency:k") is not None
+
+    def test_stored_response_round_trip(self):
+        response = StoredResponse("f", 201, [(b"content-type", b"application/json")], b'{"a":1}')
+
+        restored = StoredResponse.from_dict(response.to_dict())
+
+        assert (restored.status, restored.headers, restored.body) == (201, response.headers, response.body)
@@ -299,7 +299,7 @@ class TestKitchenServiceComprehensive:
             )
             
             # Should clear kitchen-related cache
-            assert mock_cache.clear_pattern.called
+            assert mock_cache.delete_many.called
             
     @pytest.mark.asyncio
     async def test_estimated_prep_time_calculation(self):
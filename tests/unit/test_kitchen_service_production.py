@@ -221,7 +221,7 @@ class TestKitchenServiceProduction:
         """Test cache integration in kitchen operations."""
         with patch('app.modules.orders.services.kitchen_service.cache_service') as mock_cache:
             # Test cache operations
-            mock_cache.clear_pattern = AsyncMock()
+            mock_cache.delete_many = AsyncMock()
             
             # Mock order for preparation
             mock_order = Mock(spec=Order)
@@ -237,7 +237,7 @@ class TestKitchenServiceProduction:
             )
             
             # Verify cache was cleared
-            assert mock_cache.clear_pattern.called
+            assert mock_cache.delete_many.called
     
     @pytest.mark.asyncio
     async def test_prep_time_calculations(self):
@@ -0,0 +1,81 @@
+"""
+Unit tests for the bounded in-memory cache fallback.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from app.shared.cache.memory import MemoryCache
+
+
+class TestMemoryCache:
+    """Test LRU eviction, TTL expiry and pattern deletes."""
+
+    def test_get_set_and_delete(self):
+        cache = MemoryCache()
+        cache.set("orders:1", {"id": 1}, ttl=60)
+
+        assert cache.get("orders:1") == {"id": 1}
+        assert cache.delete("orders:1") is True
+        assert cache.get("orders:1") is None
+        assert cache.delete("orders:1") is False
+
+    def test_evicts_least_recently_used_over_entry_budget(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a:1", 1, ttl=60)
+        cache.set("a:2", 2, ttl=60)
+        cache.get("a:1")  # a:2 is now least recently used
+        cache.set("a:3", 3, ttl=60)
+
+        assert "a:1" in cache
+        assert "a:2" not in cache
+        assert "a:3" in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_evicts_over_byte_budget(self):
+        cache = MemoryCache(max_bytes=40)
+        cache.set("a:1", "x" * 20, ttl=60)
+        cache.set("a:2", "y" * 20, ttl=60)
+
+        assert len(cache) == 1
+        assert cache.stats()["bytes"] <= 40
+
+    def test_oversized_entry_is_not_cached(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.set("a:1", "x" * 100, ttl=60)
+
+        assert len(cache) == 0
+
+    def test_expired_entries_are_swept(self):
+        cache = MemoryCache()
+        with patch("app.shared.cache.memory.time.monotonic", return_value=1000.0):
+            cache.set("a:1", 1, ttl=5)
+            cache.set("a:2", 2, ttl=500)
+        with patch("app.shared.cache.memory.time.monotonic", return_value=1010.0):
+            assert cache.sweep_expired() == 1
+            assert cache.get("a:2") == 2
+
+        assert len(cache) == 1
+        assert cache.stats()["expirations"] == 1
+
+    def test_delete_pattern_uses_namespace_index(self):
+        cache = MemoryCache()
+        cache.set("kitchen_orders:r1", 1, ttl=60)
+        cache.set("kitchen_orders:r2", 2, ttl=60)
+        cache.set("orders:r1:o1", 3, ttl=60)
+
+        assert cache.delete_pattern("kitchen_orders:r1*") == 1
+        assert cache.delete_pattern("orders:*") == 1
+        assert cache.stats()["namespaces"] == {"kitchen_orders": 1}
+
+    @pytest.mark.asyncio
+    async def test_background_sweeper_runs_and_stops(self):
+        cache = MemoryCache(sweep_interval=0.01)
+        cache.set("a:1", 1, ttl=0)
+
+        cache.start_sweeper()
+        await asyncio.sleep(0.05)
+        await cache.stop_sweeper()
+
+        assert len(cache) == 0
@@ -0,0 +1,173 @@
+"""
+Unit tests for the Prometheus metrics endpoint and instrumentation.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import metrics
+from app.core.middleware import MetricsMiddleware
+from app.modules.orders.services.kitchen_service import KitchenService
+from app.shared.cache.metrics import CacheMetrics
+from app.shared.database.session import get_session
+
+pytestmark = pytest.mark.skipif(not metrics.PROMETHEUS_AVAILABLE, reason="prometheus_client not installed")
+
+
+def sample(name, **labels):
+    from prometheus_client import REGISTRY
+
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsMiddleware:
+    """Test HTTP request metrics."""
+
+    def test_requests_are_counted_by_route_template(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/widgets/{widget_id}")
+        async def get_widget(widget_id: int):
+            return {"id": widget_id}
+
+        before = sample("rms_http_requests_total", method="GET", route="/widgets/{widget_id}", status="200")
+        client = TestClient(app)
+        client.get("/widgets/1")
+        client.get("/widgets/2")
+
+        assert sample(
+            "rms_http_requests_total", method="GET", route="/widgets/{widget_id}", status="200"
+        ) == before + 2
+        assert sample(
+            "rms_http_request_duration_seconds_count", method="GET", route="/widgets/{widget_id}"
+        ) >= 2
+        assert sample("rms_http_requests_in_progress", method="GET") == 0
+
+    def test_unmatched_paths_share_one_label(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        before = sample("rms_http_requests_total", method="GET", route="<unmatched>", status="404")
+        TestClient(app).get("/no/such/path/123")
+
+        assert sample("rms_http_requests_total", method="GET", route="<unmatched>", status="404") == before + 1
+
+
+class TestInstrumentation:
+    """Test pool, cache and domain metrics."""
+
+    @pytest.mark.asyncio
+    async def test_pool_connections_in_use(self):
+        engine = create_async_engine(
+            "sqlite+aiosqlite://", poolclass=AsyncAdaptedQueuePool, pool_size=2, max_overflow=1
+        )
+        metrics.instrument_engine(engine, "test")
+
+        assert sample("rms_db_pool_capacity", database="test") == 3
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert sample("rms_db_pool_connections_in_use", database="test") == 1
+        assert sample("rms_db_pool_connections_in_use", database="test") == 0
+        await engine.dispose()
+
+    def test_cache_events_are_exported(self):
+        cache_metrics = CacheMetrics()
+        before = sample("rms_cache_events_total", prefix="menu_items", event="hits")
+
+        cache_metrics.increment("menu_items", "hits")
+        cache_metrics.increment("menu_items", "misses")
+
+        assert sample("rms_cache_events_total", prefix="menu_items", event="hits") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_kitchen_queue_depth_fills_missing_statuses(self):
+        session = Mock()
+        session.exec = AsyncMock(return_value=Mock(all=Mock(return_value=[("preparing", 4)])))
+
+        depth = await KitchenService(session).get_queue_depth()
+
+        assert depth == {"confirmed": 0, "preparing": 4, "ready": 0}
+
+
+class TestMetricsEndpoint:
+    """Test the /metrics exposition endpoint."""
+
+    def scrape(self, headers=None):
+        from app.core.app import app
+
+        return TestClient(app).get("/metrics", headers=headers or {})
+
+    def test_exposes_metrics(self):
+        response = self.scrape()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "rms_orders_created_total" in response.text
+
+    def test_scrape_does_not_query_the_database(self):
+        from app.core.app import app
+
+        app.dependency_overrides[get_session] = Mock(side_effect=AssertionError("scrape opened a session"))
+        try:
+            with patch("app.core.app.read_session") as read_session:
+                response = self.scrape()
+        finally:
+            app.dependency_overrides.pop(get_session, None)
+
+        assert response.status_code == 200
+        read_session.assert_not_called()
+
+    def test_token_is_required_when_configured(self):
+        with patch("app.core.app.settings") as mock_settings:
+            mock_settings.METRICS_TOKEN = "scrape-secret"
+            denied = self.scrape()
+            allowed = self.scrape({"Authorization": "Bearer scrape-secret"})
+
+        assert denied.status_code == 401
+        assert allowed.status_code == 200
+
+
+class TestKitchenQueueDepthRefresh:
+    """Test the timer that keeps the kitchen queue gauge current."""
+
+    @staticmethod
+    def sessions(session):
+        async def read_session(tenant_id=None):
+            yield session
+
+        return read_session
+
+    @pytest.mark.asyncio
+    async def test_refresh_sets_gauge_from_replica_session(self):
+        from app.core.app import refresh_kitchen_queue_depth
+
+        session = Mock()
+        session.exec = AsyncMock(return_value=Mock(all=Mock(return_value=[("confirmed", 3)])))
+
+        with patch("app.core.app.read_session", self.sessions(session)):
+            await refresh_kitchen_queue_depth()
+
+        assert sample("rms_kitchen_queue_depth", status="confirmed") == 3
+        assert sample("rms_kitchen_queue_depth", status="ready") == 0
+
+    @pytest.mark.asyncio
+    async def test_database_outage_does_not_stop_the_refresher(self):
+        import asyncio
+        from app.core.app import _refresh_kitchen_queue_depth_forever
+
+        session = Mock()
+        session.exec = AsyncMock(side_effect=ConnectionError("database down"))
+
+        with patch("app.core.app.read_session", self.sessions(session)):
+            task = asyncio.create_task(_refresh_kitchen_queue_depth_forever(0))
+            for _ in range(10):
+                await asyncio.sleep(0)
+            task.cancel()
+
+        assert session.exec.await_count > 1
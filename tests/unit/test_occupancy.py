@@ -0,0 +1,217 @@
+"""
+Unit tests for the per-day table occupancy index.
+"""
+
+import pytest
+from datetime import date, time
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+from app.modules.tables.models.table import Table
+from app.modules.tables.models.reservation import Reservation
+from app.modules.tables.models.availability import AvailabilityQuery
+from app.modules.tables.services.availability import AvailabilityService
+from app.modules.tables.services.occupancy import OccupancyIndex
+
+
+ORG_ID = uuid4()
+RESTAURANT_ID = uuid4()
+TARGET_DATE = date(2030, 6, 14)
+
+
+def make_table(number: str, capacity: int) -> Table:
+    return Table(
+        organization_id=ORG_ID,
+        restaurant_id=RESTAURANT_ID,
+        table_number=number,
+        capacity=capacity,
+    )
+
+
+def make_reservation(table: Table, start: time, duration: int = 90, status: str = "confirmed") -> Reservation:
+    return Reservation(
+        organization_id=ORG_ID,
+        restaurant_id=RESTAURANT_ID,
+        customer_name="Guest",
+        party_size=2,
+        reservation_date=TARGET_DATE,
+        reservation_time=start,
+        duration_minutes=duration,
+        status=status,
+        table_id=table.id,
+    )
+
+
+class TestOccupancyIndex:
+    """Test occupancy index lookups."""
+
+    def test_empty_index_has_no_slots(self):
+        index = OccupancyIndex([])
+        assert index.available_slots(duration_minutes=90) == []
+
+    def test_all_slots_free_without_reservations(self):
+        index = OccupancyIndex([make_table("T1", 4), make_table("T2", 2)])
+        slots = index.available_slots(duration_minutes=90, party_size=2)
+
+        # Every 30 minutes from 11:00 to 22:00
+        assert len(slots) == 23
+        assert slots[0].time == time(11, 0)
+        assert slots[-1].time == time(22, 0)
+        assert all(slot.available_tables == 2 for slot in slots)
+        assert all(slot.total_capacity == 6 for slot in slots)
+
+    def test_reservation_blocks_overlapping_slots(self):
+        table = make_table("T1", 4)
+        index = OccupancyIndex([table], [make_reservation(table, time(19, 0))])
+
+        # 17:30 + 90 ends exactly when the booking starts
+        assert index.free_tables(time(17, 30), 90) == [table]
+        assert index.free_tables(time(18, 0), 90) == []
+        assert index.free_tables(time(20, 0), 90) == []
+        # Booking ends at 20:30
+        assert index.free_tables(time(20, 30), 90) == [table]
+
+    def test_inactive_reservations_are_ignored(self):
+        table = make_table("T1", 4)
+        index = OccupancyIndex([table], [
+            make_reservation(table, time(19, 0), status="cancelled"),
+            make_reservation(table, time(12, 0), status="completed"),
+        ])
+        assert index.free_tables(time(19, 0), 90) == [table]
+        assert index.free_tables(time(12, 0), 90) == [table]
+
+    def test_party_size_filters_tables(self):
+        small = make_table("T1", 2)
+        large = make_table("T2", 6)
+        index = OccupancyIndex([large, small])
+
+        assert index.free_tables(time(19, 0), 90, party_size=4) == [large]
+        assert index.slot_availability(time(19, 0), 90, party_size=1) == {
+            "available_tables": 2,
+            "total_capacity": 8,
+        }
+
+    def test_late_reservation_does_not_wrap_past_midnight(self):
+        table = make_table("T1", 4)
+        index = OccupancyIndex([table], [make_reservation(table, time(23, 0))])
+
+        assert index.free_tables(time(22, 0), 90) == []
+        assert index.free_tables(time(11, 0), 90) == [table]
+
+    def test_vectorized_grid_matches_bitmap_path(self):
+        pytest.importorskip("numpy")
+        tables = [make_table(f"T{i}", capacity) for i, capacity in enumerate([2, 4, 4, 6, 8])]
+        reservations = [
+            make_reservation(tables[0], time(11, 15), duration=45),
+            make_reservation(tables[1], time(18, 0), duration=120),
+            make_reservation(tables[1], time(21, 45), duration=90),
+            make_reservation(tables[3], time(19, 30)),
+            make_reservation(tables[4], time(12, 0), status="cancelled"),
+        ]
+        index = OccupancyIndex(tables, reservations)
+
+        for party_size in (1, 4, 7):
+            for duration in (60, 90, 150):
+                assert index.available_slots(
+                    duration, party_size, vectorized=True
+                ) == index.available_slots(duration, party_size, vectorized=False)
+
+
+class TestAvailabilityFromIndex:
+    """Test building availability responses from an index."""
+
+    def test_recommendations_sorted_by_proximity(self):
+        table = make_table("T1", 4)
+        index = OccupancyIndex([table], [make_reservation(table, time(19, 0))])
+        query = AvailabilityQuery(
+            date=TARGET_DATE,
+            party_size=2,
+            time_preference=time(20, 0),
+            duration_minutes=90,
+        )
+
+        availability = AvailabilityService.availability_from_index(index, query)
+
+        available_times = [slot.time for slot in availability.available_slots]
+        assert time(19, 0) not in available_times
+        assert [slot.time for slot in availability.recommendations] == [time(20, 30), time(21, 0)]
+        assert availability.is_fully_booked is False
+
+    def test_fully_booked_without_tables(self):
+        query = AvailabilityQuery(date=TARGET_DATE, party_size=2)
+        availability = AvailabilityService.availability_from_index(OccupancyIndex([]), query)
+
+        assert availability.is_fully_booked is True
+        assert availability.recommendations == []
+
+
+class TestMonthlyAvailability:
+    """Test the batched month calendar."""
+
+    @pytest.fixture
+    def mock_session(self):
+        """Mock session returning tables, then the month's reservations."""
+        table = make_table("T1", 4)
+        booked_day = make_reservation(table, time(11, 0), duration=12 * 60)
+
+        tables_result = Mock()
+        tables_result.all.return_value = [table]
+        reservations_result = Mock()
+        reservations_result.all.return_value = [booked_day]
+
+        session = Mock()
+        session.exec = AsyncMock(side_effect=[tables_result, reservations_result])
+        return session
+
+    @pytest.mark.asyncio
+    async def test_month_calendar_uses_two_queries(self, mock_session):
+        calendar = await AvailabilityService.get_monthly_availability.__wrapped__(
+            session=mock_session,
+            organization_id=str(ORG_ID),
+            restaurant_id=str(RESTAURANT_ID),
+            year=TARGET_DATE.year,
+            month=TARGET_DATE.month,
+        )
+
+        assert mock_session.exec.await_count == 2
+        assert len(calendar.days) == 30
+
+        booked = next(day for day in calendar.days if day.date == TARGET_DATE)
+        assert booked.is_open is False
+        assert booked.slots == []
+        assert all(len(day.slots) == 23 for day in calendar.days if day.date != TARGET_DATE)
+
+
+class TestAlternativeSlots:
+    """Test the batched alternative-slot search."""
+
+    @pytest.mark.asyncio
+    async def test_alternatives_use_one_window_query(self):
+        table = make_table("T1", 4)
+        # Preferred 19:00 is taken; the next day is free
+        taken = make_reservation(table, time(18, 30), duration=120)
+
+        tables_result = Mock()
+        tables_result.all.return_value = [table]
+        reservations_result = Mock()
+        reservations_result.all.return_value = [taken]
+        session = Mock()
+        session.exec = AsyncMock(side_effect=[tables_result, reservations_result])
+
+        alternatives = await AvailabilityService.find_alternative_slots.__wrapped__(
+            session=session,
+            organization_id=str(ORG_ID),
+            restaurant_id=str(RESTAURANT_ID),
+            preferred_date=TARGET_DATE,
+            preferred_time=time(19, 0),
+            party_size=2,
+        )
+
+        assert session.exec.await_count == 2
+        # Same time on the neighbouring days ranks first, nearest date first
+        assert [(slot.slot_date, slot.time) for slot in alternatives[:2]] == [
+            (date(2030, 6, 13), time(19, 0)),
+            (date(2030, 6, 15), time(19, 0)),
+        ]
+        assert all(slot.slot_date is not None for slot in alternatives)
+        assert len(alternatives) == 5
@@ -0,0 +1,124 @@
+"""
+Unit tests for per-restaurant, per-day order number allocation.
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from datetime import date
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.modules.orders.models.order import OrderNumberSequence
+from app.modules.orders.services.order_numbers import OrderNumberAllocator, format_order_number
+from app.modules.orders.services.order_service import OrderService
+
+TODAY = date(2025, 8, 18)
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    # A file database so concurrent allocations use separate connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'orders.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(OrderNumberSequence.__table__.create)
+    yield engine
+    await engine.dispose()
+
+
+class TestOrderNumberAllocator:
+    """Test the counter-row sequence allocator."""
+
+    @pytest.mark.asyncio
+    async def test_sequence_per_restaurant_and_day(self, engine):
+        allocator = OrderNumberAllocator()
+        restaurant, other = uuid4(), uuid4()
+
+        values = [await allocator.next_value(engine, restaurant, TODAY) for _ in range(3)]
+        other_value = await allocator.next_value(engine, other, TODAY)
+        next_day = await allocator.next_value(engine, restaurant, date(2025, 8, 19))
+
+        assert values == [1, 2, 3]
+        assert other_value == 1
+        assert next_day == 1
+
+    @pytest.mark.asyncio
+    async def test_workers_share_the_counter(self, engine):
+        restaurant = uuid4()
+        first, second = OrderNumberAllocator(), OrderNumberAllocator()
+
+        values = [
+            await first.next_value(engine, restaurant, TODAY),
+            await second.next_value(engine, restaurant, TODAY),
+            await first.next_value(engine, restaurant, TODAY),
+        ]
+
+        assert values == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_blocks_reserve_once_per_block(self, engine):
+        allocator = OrderNumberAllocator(block_size=5)
+        restaurant = uuid4()
+
+        with patch.object(allocator, "reserve", wraps=allocator.reserve) as reserve:
+            values = [await allocator.next_value(engine, restaurant, TODAY) for _ in range(7)]
+
+        assert values == [1, 2, 3, 4, 5, 6, 7]
+        assert reserve.await_count == 2
+        # Another worker continues after this worker's reserved block
+        assert await OrderNumberAllocator().next_value(engine, restaurant, TODAY) == 11
+
+    @pytest.mark.asyncio
+    async def test_next_values_reserves_a_run(self, engine):
+        allocator = OrderNumberAllocator(block_size=5)
+        restaurant = uuid4()
+
+        first = await allocator.next_value(engine, restaurant, TODAY)
+        run = await allocator.next_values(engine, restaurant, TODAY, 3)
+
+        assert first == 1
+        assert run == [6, 7, 8]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_allocation_is_unique(self, engine):
+        allocator = OrderNumberAllocator()
+        restaurant = uuid4()
+
+        values = await asyncio.gather(
+            *(allocator.next_value(engine, restaurant, TODAY) for _ in range(20))
+        )
+
+        assert sorted(values) == list(range(1, 21))
+
+    @pytest.mark.asyncio
+    async def test_previous_days_blocks_are_dropped(self, engine):
+        allocator = OrderNumberAllocator(block_size=10)
+        restaurant = uuid4()
+
+        await allocator.next_value(engine, restaurant, TODAY)
+        await allocator.next_value(engine, restaurant, date(2025, 8, 19))
+
+        assert list(allocator._blocks) == [(restaurant, date(2025, 8, 19))]
+
+    def test_format(self):
+        assert format_order_number(TODAY, 42) == "ORD-20250818-0042"
+        assert format_order_number(TODAY, 12345) == "ORD-20250818-12345"
+
+
+class TestOrderServiceNumbers:
+    """Test OrderService uses the allocator on the session's engine."""
+
+    @pytest.mark.asyncio
+    async def test_generate_order_number(self):
+        session = Mock(bind=Mock())
+        restaurant_id = uuid4()
+
+        with patch("app.modules.orders.services.order_service.order_number_allocator") as allocator:
+            allocator.next_value = AsyncMock(return_value=7)
+            number = await OrderService(session)._generate_order_number(restaurant_id)
+
+        assert number.startswith("ORD-") and number.endswith("-0007")
+        assert allocator.next_value.await_args.args[:2] == (session.bind, restaurant_id)
+        session.exec.assert_not_called()
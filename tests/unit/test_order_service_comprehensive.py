@@ -38,16 +38,15 @@ class TestOrderServiceComprehensive:
     @pytest.mark.asyncio
     async def test_generate_order_number_uniqueness(self):
         """Test order number generation produces unique values"""
-        # Mock database response for order count
-        mock_result = Mock()
-        mock_result.first.return_value = 5  # 5 orders today
-        self.mock_session.exec.return_value = mock_result
-        
-        # Generate multiple order numbers
-        numbers = []
-        for _ in range(10):
-            number = await self.order_service._generate_order_number(self.restaurant_id)
-            numbers.append(number)
+        # Mock the per-day sequence allocator
+        with patch("app.modules.orders.services.order_service.order_number_allocator") as allocator:
+            allocator.next_value = AsyncMock(side_effect=range(1, 11))
+            
+            # Generate multiple order numbers
+            numbers = []
+            for _ in range(10):
+                number = await self.order_service._generate_order_number(self.restaurant_id)
+                numbers.append(number)
             
         # Verify all numbers are unique
         assert len(set(numbers)) == len(numbers)
@@ -55,7 +54,7 @@ class TestOrderServiceComprehensive:
         # Verify format
         for number in numbers:
             assert number.startswith("ORD-")
-            assert len(number.split("-")) == 4  # ORD-YYYYMMDD-NNNN-RRRR
+            assert len(number.split("-")) == 3  # ORD-YYYYMMDD-NNNN
             
     @pytest.mark.asyncio
     async def test_calculate_order_pricing_basic(self):
@@ -157,7 +156,7 @@ class TestOrderServiceComprehensive:
             
             # Verify
             assert self.mock_session.add.called
-            assert self.mock_session.commit.call_count == 2  # Order + items
+            assert self.mock_session.commit.call_count == 1  # Order, items and modifiers together
             assert mock_clear_cache.called
             
     @pytest.mark.asyncio
@@ -351,17 +350,16 @@ class TestOrderServiceComprehensive:
     async def test_cache_clearing_patterns(self):
         """Test cache clearing with correct patterns"""
         with patch('app.modules.orders.services.order_service.cache_service') as mock_cache:
-            order_id = str(uuid4())
+            mock_cache.delete = AsyncMock()
+            mock_cache.clear_pattern = AsyncMock()
             
-            await self.order_service._clear_order_cache(self.restaurant_id, order_id)
+            await self.order_service._clear_order_cache(self.restaurant_id)
             
-            # Verify cache clearing was called
-            assert mock_cache.clear_pattern.call_count >= 3
+            # The exact key is deleted directly, each glob is scanned once
+            mock_cache.delete.assert_awaited_once_with(f"kitchen_orders:{self.restaurant_id}")
             
-            # Check that specific order cache was cleared
             call_args = [call[0][0] for call in mock_cache.clear_pattern.call_args_list]
-            order_specific_pattern = f"order:{self.restaurant_id}:{order_id}"
-            assert order_specific_pattern in call_args
+            assert call_args == [f"order:{self.restaurant_id}:*", f"orders:{self.restaurant_id}:*"]
             
     def test_order_service_error_handling(self):
         """Test error handling in order service"""
@@ -386,10 +384,11 @@ class TestOrderServiceComprehensive:
         
         # Mock menu item
         mock_item = Mock()
+        mock_item.id = items_data[0].menu_item_id
         mock_item.price = Decimal("10.00")
         
         mock_result = Mock()
-        mock_result.first.return_value = mock_item
+        mock_result.all.return_value = [mock_item]
         self.mock_session.exec.return_value = mock_result
         
         subtotal, items_with_pricing = await self.order_service._calculate_order_pricing(
@@ -407,9 +406,9 @@ class TestOrderServiceComprehensive:
         with patch.object(self.order_service, '_generate_order_number') as mock_gen:
             # Simulate different order numbers for concurrent requests
             mock_gen.side_effect = [
-                "ORD-20250818-0001-12345",
-                "ORD-20250818-0002-12346",
-                "ORD-20250818-0003-12347"
+                "ORD-20250818-0001",
+                "ORD-20250818-0002",
+                "ORD-20250818-0003"
             ]
             
             # Multiple calls should get different numbers
@@ -439,12 +438,11 @@ class TestOrderServiceComprehensive:
             ) for _ in range(50)  # 50 items
         ]
         
-        # Mock responses for all items
-        mock_item = Mock()
-        mock_item.price = Decimal("5.00")
+        # One batched lookup returns every item
+        mock_items = [Mock(id=item.menu_item_id, price=Decimal("5.00")) for item in large_items_data]
         
         mock_result = Mock()
-        mock_result.first.return_value = mock_item
+        mock_result.all.return_value = mock_items
         self.mock_session.exec.return_value = mock_result
         
         # This should handle large orders efficiently
@@ -454,6 +452,7 @@ class TestOrderServiceComprehensive:
         
         assert subtotal == Decimal("250.00")  # 50 * 5.00
         assert len(items_with_pricing) == 50
+        assert self.mock_session.exec.await_count == 1
 
 
 def test_order_service_integration_points():
@@ -51,21 +51,19 @@ class TestOrderServiceProduction:
     @pytest.mark.asyncio
     async def test_order_number_format_validation(self):
         """Test order number follows correct format."""
-        # Mock the database call for order count
-        mock_result = Mock()
-        mock_result.first.return_value = 42
-        self.mock_session.exec.return_value = mock_result
-        
-        # Generate order number
-        order_number = await self.order_service._generate_order_number(self.restaurant_id)
+        # Mock the per-day sequence allocator
+        with patch("app.modules.orders.services.order_service.order_number_allocator") as allocator:
+            allocator.next_value = AsyncMock(return_value=42)
+            
+            # Generate order number
+            order_number = await self.order_service._generate_order_number(self.restaurant_id)
         
-        # Validate format: ORD-YYYYMMDD-NNNN-RRRR
+        # Validate format: ORD-YYYYMMDD-NNNN
         parts = order_number.split("-")
-        assert len(parts) == 4
+        assert len(parts) == 3
         assert parts[0] == "ORD"
         assert len(parts[1]) == 8  # YYYYMMDD
-        assert len(parts[2]) == 4  # Order count padded
-        assert len(parts[3]) == 5  # Microseconds + random
+        assert parts[2] == "0042"  # Daily sequence padded
         
         # Validate date format
         date_part = parts[1]
@@ -84,15 +82,10 @@ class TestOrderServiceProduction:
         mock_menu_item.price = Decimal("15.99")
         
         mock_menu_result = Mock()
-        mock_menu_result.first.return_value = mock_menu_item
-        
-        # Mock order count for number generation
-        mock_count_result = Mock()
-        mock_count_result.first.return_value = 1
+        mock_menu_result.all.return_value = [mock_menu_item]
         
         # Configure session exec to return appropriate results
         self.mock_session.exec.side_effect = [
-            mock_count_result,  # For order number generation
             mock_menu_result,   # For menu item lookup
         ]
         
@@ -102,8 +95,11 @@ class TestOrderServiceProduction:
         self.mock_session.refresh = AsyncMock()
         
         # Create order
-        with patch('app.modules.orders.services.order_service.cache_service') as mock_cache:
+        with patch('app.modules.orders.services.order_service.cache_service') as mock_cache, \
+             patch('app.modules.orders.services.order_service.order_number_allocator') as allocator:
             mock_cache.clear_pattern = AsyncMock()
+            mock_cache.delete = AsyncMock()
+            allocator.next_value = AsyncMock(return_value=1)
             
             order = await self.order_service.create_order(
                 order_data=self.sample_order_data,
@@ -116,6 +112,68 @@ class TestOrderServiceProduction:
         assert self.mock_session.add.called
         assert self.mock_session.commit.called
         
+    @pytest.mark.asyncio
+    async def test_order_is_created_in_one_commit(self):
+        """Test the order, its items and modifiers are committed together."""
+        items = [
+            OrderItemCreate(
+                menu_item_id=uuid4(),
+                modifiers=[OrderItemModifierCreate(modifier_id=uuid4()) for _ in range(2)],
+            )
+            for _ in range(5)
+        ]
+        pricing = [
+            {
+                "menu_item": Mock(id=item.menu_item_id, name="Burger", description=None),
+                "quantity": 1,
+                "unit_price": Decimal("10.00"),
+                "total_price": Decimal("12.00"),
+                "special_instructions": None,
+                "modifiers": [
+                    {"modifier": Mock(id=m.modifier_id, name="Cheese", price=Decimal("1.00")),
+                     "quantity": 1, "total_price": Decimal("1.00")}
+                    for m in item.modifiers
+                ],
+            }
+            for item in items
+        ]
+        self.mock_session.add = Mock()
+        
+        with patch.object(self.order_service, '_generate_order_number', AsyncMock(return_value="ORD-1")), \
+                patch.object(self.order_service, '_calculate_order_pricing', AsyncMock(return_value=(Decimal("60.00"), pricing))), \
+                patch.object(self.order_service, '_clear_order_cache', AsyncMock()):
+            order = await self.order_service.create_order(
+                order_data=self.sample_order_data,
+                items_data=items,
+                restaurant_id=self.restaurant_id,
+                organization_id=self.organization_id,
+            )
+        
+        added = [call.args[0] for call in self.mock_session.add.call_args_list]
+        assert added[0] is order
+        assert len(added) == 1 + 5 + 10
+        assert all(obj.order_id == order.id for obj in added[1:] if hasattr(obj, "order_id"))
+        self.mock_session.commit.assert_awaited_once()
+        self.mock_session.refresh.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_failed_order_commit_rolls_back(self):
+        """Test a failed commit leaves no partial order behind."""
+        self.mock_session.add = Mock()
+        self.mock_session.commit.side_effect = RuntimeError("connection lost")
+        
+        with patch.object(self.order_service, '_generate_order_number', AsyncMock(return_value="ORD-1")), \
+                patch.object(self.order_service, '_calculate_order_pricing', AsyncMock(return_value=(Decimal("0"), []))):
+            with pytest.raises(RuntimeError):
+                await self.order_service.create_order(
+                    order_data=self.sample_order_data,
+                    items_data=[],
+                    restaurant_id=self.restaurant_id,
+                    organization_id=self.organization_id,
+                )
+        
+        self.mock_session.rollback.assert_awaited_once()
+    
     @pytest.mark.asyncio
     async def test_pricing_calculation_basic(self):
         """Test basic pricing calculation."""
@@ -125,7 +183,7 @@ class TestOrderServiceProduction:
         mock_menu_item.price = Decimal("10.00")
         
         mock_result = Mock()
-        mock_result.first.return_value = mock_menu_item
+        mock_result.all.return_value = [mock_menu_item]
         self.mock_session.exec.return_value = mock_result
         
         # Calculate pricing
@@ -139,6 +197,50 @@ class TestOrderServiceProduction:
         assert len(items_with_pricing) == 1
         assert items_with_pricing[0]["total_price"] == expected_subtotal
     
+    @pytest.mark.asyncio
+    async def test_pricing_batches_items_and_modifiers(self):
+        """Test pricing uses one query per entity regardless of order size."""
+        cheese, bacon = uuid4(), uuid4()
+        items = [
+            OrderItemCreate(
+                menu_item_id=uuid4(),
+                quantity=1,
+                modifiers=[OrderItemModifierCreate(modifier_id=cheese), OrderItemModifierCreate(modifier_id=bacon, quantity=2)],
+            )
+            for _ in range(12)
+        ]
+        menu_items = [Mock(id=item.menu_item_id, price=Decimal("10.00")) for item in items]
+        modifiers = [Mock(id=cheese, price=Decimal("1.00")), Mock(id=bacon, price=Decimal("1.50"))]
+        self.mock_session.exec.side_effect = [
+            Mock(all=Mock(return_value=menu_items)),
+            Mock(all=Mock(return_value=modifiers)),
+        ]
+        
+        subtotal, items_with_pricing = await self.order_service._calculate_order_pricing(
+            items, self.restaurant_id
+        )
+        
+        assert self.mock_session.exec.await_count == 2
+        modifier_params = self.mock_session.exec.await_args_list[1].kwargs["params"]
+        assert sorted(modifier_params["ids"]) == sorted([cheese, bacon])
+        assert items_with_pricing[0]["modifier_total"] == Decimal("4.00")
+        assert subtotal == Decimal("14.00") * 12
+    
+    @pytest.mark.asyncio
+    async def test_pricing_rejects_unknown_modifier(self):
+        """Test pricing fails on modifiers not on this restaurant's menu."""
+        item = OrderItemCreate(
+            menu_item_id=uuid4(),
+            modifiers=[OrderItemModifierCreate(modifier_id=uuid4())],
+        )
+        self.mock_session.exec.side_effect = [
+            Mock(all=Mock(return_value=[Mock(id=item.menu_item_id, price=Decimal("10.00"))])),
+            Mock(all=Mock(return_value=[])),
+        ]
+        
+        with pytest.raises(ValueError, match="Modifier .* not found"):
+            await self.order_service._calculate_order_pricing([item], self.restaurant_id)
+    
     @pytest.mark.asyncio
     async def test_order_status_updates(self):
         """Test order status update functionality."""
@@ -151,6 +253,7 @@ class TestOrderServiceProduction:
         with patch.object(self.order_service, 'get_order', return_value=mock_order):
             with patch('app.modules.orders.services.order_service.cache_service') as mock_cache:
                 mock_cache.clear_pattern = AsyncMock()
+                mock_cache.delete_many = AsyncMock()
                 
                 # Update to ready status
                 updated_order = await self.order_service.update_order_status(
@@ -247,7 +350,7 @@ class TestOrderServiceProduction:
         """Test error handling for invalid menu items."""
         # Mock empty menu item result
         mock_result = Mock()
-        mock_result.first.return_value = None
+        mock_result.all.return_value = []
         self.mock_session.exec.return_value = mock_result
         
         # Should raise ValueError for invalid menu item
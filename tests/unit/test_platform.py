@@ -409,4 +409,39 @@ class TestApplicationWorkflow:
         finally:
             # Restore original methods
             PlatformApplicationService.reject_application = original_reject
-            PlatformApplicationService.get_application_by_id = original_get
\ No newline at end of file
+            PlatformApplicationService.get_application_by_id = original_get
+
+class TestCacheMetricsEndpoint:
+    """Test the platform cache metrics endpoint."""
+
+    def test_metrics_require_platform_admin(self):
+        from fastapi.testclient import TestClient
+        from app.core.app import app
+
+        response = TestClient(app).get("/api/v1/platform/cache/metrics")
+
+        assert response.status_code in (401, 403)
+
+    def test_metrics_report_per_prefix_counters(self):
+        from fastapi.testclient import TestClient
+        from app.core.app import app
+        from app.modules.platform.routes.applications import verify_platform_admin
+        from app.shared.cache import cache_service
+
+        cache_service.reset_stats()
+        cache_service.metrics.increment("availability", "misses", 3)
+        app.dependency_overrides[verify_platform_admin] = lambda: Mock(role="platform_admin")
+        try:
+            client = TestClient(app)
+            response = client.get("/api/v1/platform/cache/metrics")
+            reset = client.post("/api/v1/platform/cache/metrics/reset")
+        finally:
+            app.dependency_overrides.pop(verify_platform_admin, None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["prefixes"]["availability"]["misses"] == 3
+        assert data["prefixes"]["availability"]["hit_ratio"] == 0.0
+        assert "latency" in data
+        assert reset.status_code == 200
+        assert cache_service.get_stats() == {}
@@ -0,0 +1,146 @@
+"""
+Unit tests for request latency profiling and slow request sampling.
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.middleware import ProfilingMiddleware
+from app.core.profiling import IDLE_STACK, RouteLatency, SlowRequestSampler
+from app.shared.cache.metrics import CacheMetrics
+
+
+class TestRouteLatency:
+    """Test per-route latency histograms."""
+
+    def test_handler_time_is_what_db_and_cache_leave(self):
+        latency = RouteLatency()
+
+        latency.observe("GET", "/orders/{order_id}", total_ms=40.0, db_ms=25.0, cache_ms=5.0)
+
+        route = latency.snapshot()["GET /orders/{order_id}"]
+        assert route["total"]["count"] == 1
+        assert route["db"]["avg_ms"] == 25.0
+        assert route["cache"]["avg_ms"] == 5.0
+        assert route["handler"]["avg_ms"] == 10.0
+
+
+class TestSlowRequestSampler:
+    """Test stack sampling and the ring buffer."""
+
+    def make_sampler(self, **kwargs):
+        sampler = SlowRequestSampler(**kwargs)
+        # Sample this thread as if it were the event loop, without the background thread
+        sampler._thread = Mock(is_alive=Mock(return_value=True))
+        sampler._loop_thread_id = threading.get_ident()
+        return sampler
+
+    def test_slow_request_stacks_are_sampled(self):
+        sampler = self.make_sampler(slow_ms=10)
+        request = sampler.start("GET", "/api/v1/kitchen/orders")
+        request.started -= 1
+
+        sampler.sample()
+        sampler.finish(request, "/api/v1/kitchen/orders", {"total_ms": 1000.0})
+
+        profile = sampler.recent()[0]
+        assert profile["route"] == "/api/v1/kitchen/orders"
+        assert profile["samples"] == 1
+        assert "test_slow_request_stacks_are_sampled" in profile["stacks"][0]["stack"]
+
+    def test_fast_requests_are_not_sampled_or_kept(self):
+        sampler = self.make_sampler(slow_ms=1000)
+        request = sampler.start("GET", "/health")
+
+        sampler.sample()
+        sampler.finish(request, "/health", {"total_ms": 2.0})
+
+        assert request.stacks == {}
+        assert sampler.recent() == []
+
+    def test_ring_buffer_keeps_newest_profiles(self):
+        sampler = self.make_sampler(slow_ms=0, max_profiles=2)
+        for path in ("/a", "/b", "/c"):
+            sampler.finish(sampler.start("GET", path), path, {"total_ms": 5.0})
+
+        assert [profile["path"] for profile in sampler.recent()] == ["/c", "/b"]
+
+    def test_idle_loop_is_labelled(self):
+        sampler = SlowRequestSampler()
+        frame = Mock(f_code=Mock(co_name="select"), f_globals={"__name__": "selectors"}, f_lineno=1, f_back=None)
+
+        assert sampler._collapse(frame) == IDLE_STACK
+
+
+class TestProfilingMiddleware:
+    """Test per-request DB/cache/handler split."""
+
+    def test_route_latency_is_split(self):
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        cache_metrics = CacheMetrics()
+        latency = RouteLatency()
+        sampler = SlowRequestSampler(slow_ms=0)
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware, latency=latency, sampler=sampler)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT :id"), {"id": item_id})
+            cache_metrics.observe_latency("get", "items", 3.0)
+            return {"id": item_id}
+
+        response = TestClient(app).get("/items/7")
+
+        assert response.status_code == 200
+        route = latency.snapshot()["GET /items/{item_id}"]
+        assert route["total"]["count"] == 1
+        assert route["db"]["max_ms"] > 0
+        assert route["cache"]["max_ms"] == 3.0
+        profile = sampler.recent()[0]
+        assert profile["route"] == "/items/{item_id}"
+        assert profile["db_queries"] == 1
+        engine.dispose()
+
+
+class TestProfilingEndpoints:
+    """Test the platform profiling endpoints."""
+
+    def test_requires_platform_admin(self):
+        from app.core.app import app
+
+        response = TestClient(app).get("/api/v1/platform/profiling/slow-requests")
+
+        assert response.status_code in (401, 403)
+
+    def test_slow_requests_are_listed(self):
+        from app.core.app import app
+        from app.core.profiling import slow_request_sampler
+        from app.modules.platform.routes.applications import verify_platform_admin
+
+        slow_request_sampler.reset()
+        slow_request_sampler.profiles.append({"path": "/api/v1/orders", "total_ms": 900.0})
+        app.dependency_overrides[verify_platform_admin] = lambda: Mock(role="platform_admin")
+        try:
+            client = TestClient(app)
+            slow = client.get("/api/v1/platform/profiling/slow-requests")
+            routes = client.get("/api/v1/platform/profiling/routes")
+            reset = client.post("/api/v1/platform/profiling/reset")
+        finally:
+            app.dependency_overrides.pop(verify_platform_admin, None)
+
+        assert slow.status_code == 200
+        assert slow.json() == [{"path": "/api/v1/orders", "total_ms": 900.0}]
+        assert routes.status_code == 200
+        assert "routes" in routes.json()
+        assert reset.status_code == 200
+        assert slow_request_sampler.recent() == []
@@ -0,0 +1,117 @@
+"""
+Unit tests for per-request query counting and N+1 detection.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.middleware import QueryStatsMiddleware
+from app.shared.database.query_stats import (
+    QueryBudgetExceeded,
+    fingerprint,
+    track_queries,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (id, name) VALUES (1, 'a'), (2, 'b'), (3, 'c')"))
+    yield engine
+    engine.dispose()
+
+
+def select_items_one_by_one(engine, ids):
+    with engine.connect() as conn:
+        for item_id in ids:
+            conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": item_id})
+
+
+class TestQueryStats:
+    """Test statement counting and fingerprinting."""
+
+    def test_counts_statements_and_repeats(self, engine):
+        with track_queries() as stats:
+            select_items_one_by_one(engine, [1, 2, 3])
+            with engine.connect() as conn:
+                conn.execute(text("SELECT count(*) FROM items"))
+
+        assert stats.count == 4
+        assert stats.total_ms > 0
+        assert stats.max_repeats == 3
+        assert stats.repeated(3) == [("SELECT name FROM items WHERE id = ?", 3)]
+
+    def test_statements_outside_tracking_are_not_counted(self, engine):
+        with track_queries() as stats:
+            pass
+        select_items_one_by_one(engine, [1])
+
+        assert stats.count == 0
+
+    def test_fingerprint_folds_whitespace_and_bind_lists(self):
+        assert fingerprint("SELECT *\n  FROM items WHERE id IN (?, ?, ?)") == (
+            "SELECT * FROM items WHERE id IN (?)"
+        )
+        assert fingerprint("SELECT * FROM items WHERE id IN ($1, $2)") == (
+            "SELECT * FROM items WHERE id IN (?)"
+        )
+
+
+class TestQueryBudget:
+    """Test the query_budget fixture."""
+
+    def test_within_budget(self, engine, query_budget):
+        with query_budget(3, max_repeats=3) as stats:
+            select_items_one_by_one(engine, [1, 2, 3])
+
+        assert stats.count == 3
+
+    def test_over_budget_reports_repeated_statements(self, engine, query_budget):
+        with pytest.raises(QueryBudgetExceeded) as exc_info:
+            with query_budget(2):
+                select_items_one_by_one(engine, [1, 2, 3])
+
+        assert "3 queries executed, budget is 2" in str(exc_info.value)
+        assert "3x SELECT name FROM items WHERE id = ?" in str(exc_info.value)
+
+    def test_repeat_limit_catches_n_plus_one(self, engine, query_budget):
+        with pytest.raises(QueryBudgetExceeded, match="ran 3 times"):
+            with query_budget(10, max_repeats=1):
+                select_items_one_by_one(engine, [1, 2, 3])
+
+
+class TestQueryStatsMiddleware:
+    """Test per-request headers and N+1 logging."""
+
+    @pytest.fixture
+    def client(self, engine):
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=3)
+
+        @app.get("/items")
+        async def list_items():
+            select_items_one_by_one(engine, [1, 2, 3])
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_headers_report_queries(self, client):
+        response = client.get("/items")
+
+        assert response.status_code == 200
+        assert response.headers["X-DB-Query-Count"] == "3"
+        assert response.headers["X-DB-Max-Repeats"] == "3"
+        assert float(response.headers["X-DB-Query-Time-Ms"]) > 0
+
+    def test_n_plus_one_is_logged(self, client, caplog):
+        with caplog.at_level("WARNING", logger="app.core.middleware"):
+            client.get("/items")
+
+        assert "possible N+1: 3x SELECT name FROM items WHERE id = ?" in caplog.text
@@ -0,0 +1,144 @@
+"""
+Unit tests for read-replica routing.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+from app.shared.database.replica import (
+    ReadRouter,
+    WRITTEN_TENANTS_KEY,
+    _collect_written_tenants,
+    _discard_written_tenants,
+    _pin_written_tenants,
+    read_router,
+)
+
+
+def make_replica_engine(lag=0.0, error=None):
+    """Mock async engine whose connection returns the given replay lag."""
+    conn = AsyncMock()
+    if error is not None:
+        conn.execute.side_effect = error
+    else:
+        result = Mock()
+        result.scalar.return_value = lag
+        conn.execute.return_value = result
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__.return_value = conn
+    return engine
+
+
+class TestReadRouter:
+    """Test the replica routing policy."""
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_primary_without_replica(self):
+        router = ReadRouter()
+
+        assert await router.use_replica("restaurant-1") is False
+        assert router.primary_reads == 1
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica_when_caught_up(self):
+        router = ReadRouter(max_lag_seconds=5.0)
+        router.replica_engine = make_replica_engine(lag=0.5)
+
+        assert await router.use_replica("restaurant-1") is True
+        assert router.stats()["replica_lag_seconds"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_falls_back_to_primary(self):
+        router = ReadRouter(max_lag_seconds=5.0)
+        router.replica_engine = make_replica_engine(lag=12.0)
+
+        assert await router.use_replica("restaurant-1") is False
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_falls_back_to_primary(self):
+        router = ReadRouter()
+        router.replica_engine = make_replica_engine(error=OSError("connection refused"))
+
+        assert await router.use_replica("restaurant-1") is False
+
+    @pytest.mark.asyncio
+    async def test_lag_is_probed_once_per_interval(self):
+        router = ReadRouter(lag_check_interval=60.0)
+        router.replica_engine = make_replica_engine(lag=0.1)
+
+        await router.use_replica("restaurant-1")
+        await router.use_replica("restaurant-2")
+
+        assert router.replica_engine.connect.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_recent_writer_is_pinned_to_primary(self):
+        router = ReadRouter(pin_seconds=5.0)
+        router.replica_engine = make_replica_engine(lag=0.1)
+
+        router.record_writes(["restaurant-1"])
+
+        assert await router.use_replica("restaurant-1") is False
+        assert await router.use_replica("restaurant-2") is True
+        assert router.stats()["pinned_tenants"] == 1
+
+    def test_pin_expires(self):
+        router = ReadRouter(pin_seconds=0.0)
+
+        router.record_writes(["restaurant-1"])
+
+        assert router.is_pinned("restaurant-1") is False
+
+
+class TestWriteTracking:
+    """Test that committed writes pin their tenants."""
+
+    def test_commit_pins_tenants_of_flushed_rows(self):
+        session = Mock(info={})
+        session.new = [Mock(restaurant_id="restaurant-a")]
+        session.dirty = [Mock(spec=[])]
+        session.deleted = []
+
+        _collect_written_tenants(session, None)
+        _pin_written_tenants(session)
+
+        assert read_router.is_pinned("restaurant-a")
+        assert WRITTEN_TENANTS_KEY not in session.info
+
+    def test_rollback_discards_tenants(self):
+        session = Mock(info={WRITTEN_TENANTS_KEY: {"restaurant-b"}})
+
+        _discard_written_tenants(session)
+        _pin_written_tenants(session)
+
+        assert not read_router.is_pinned("restaurant-b")
+
+
+class TestReadSession:
+    """Test how an authenticated read is attributed to a tenant."""
+
+    @pytest.mark.asyncio
+    async def test_tenant_comes_from_current_user(self, monkeypatch):
+        from app.shared.auth.deps import get_read_session
+
+        use_replica = AsyncMock(return_value=False)
+        monkeypatch.setattr(read_router, "use_replica", use_replica)
+        sessions = get_read_session(Mock(restaurant_id="r-1"))
+
+        await sessions.__anext__()
+        await sessions.aclose()
+
+        use_replica.assert_awaited_once_with("r-1")
+
+    @pytest.mark.asyncio
+    async def test_organization_user_has_no_tenant(self, monkeypatch):
+        from app.shared.auth.deps import get_read_session
+
+        use_replica = AsyncMock(return_value=False)
+        monkeypatch.setattr(read_router, "use_replica", use_replica)
+        sessions = get_read_session(Mock(restaurant_id=None))
+
+        await sessions.__anext__()
+        await sessions.aclose()
+
+        use_replica.assert_awaited_once_with(None)
@@ -205,4 +205,213 @@ class TestUserTokens:
         assert payload is not None
         
         # Check that expiry is set (though we can't test exact value due to timing)
-        assert "exp" in payload
\ No newline at end of file
+        assert "exp" in payload
+
+class TestVerifiedTokenCache:
+    """Test the verified-token fast path."""
+
+    def test_repeat_decode_skips_verification(self):
+        """A verified token is served from the cache."""
+        from unittest.mock import patch
+        from app.shared.auth import security
+
+        token = create_user_access_token(
+            user_id="user-cached", email="test@example.com", organization_id="org123"
+        )
+        security.verified_tokens.clear()
+
+        with patch.object(security.jwt_backend, "decode", wraps=security.jwt_backend.decode) as decode:
+            first = decode_user_token(token)
+            second = decode_user_token(token)
+
+        assert first["user_id"] == "user-cached"
+        assert second is first
+        assert decode.call_count == 1
+
+    def test_invalid_token_is_not_cached(self):
+        """Failed verifications are never remembered."""
+        from app.shared.auth import security
+
+        security.verified_tokens.clear()
+
+        assert decode_user_token("invalid.token.here") is None
+        assert len(security.verified_tokens) == 0
+
+    def test_entry_expires_with_token(self):
+        """Cache lifetime is capped by the token's exp claim."""
+        import time
+        from app.shared.auth.tokens import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(max_ttl=300)
+        cache.set("expired-token", {"user_id": "u", "exp": time.time() - 1})
+        cache.set("live-token", {"user_id": "u", "exp": time.time() + 60})
+
+        assert cache.get("expired-token") is None
+        assert cache.get("live-token") == {"user_id": "u", "exp": pytest.approx(time.time() + 60, abs=5)}
+
+    def test_zero_ttl_disables_cache(self):
+        """JWT_CACHE_TTL=0 always verifies."""
+        from app.shared.auth.tokens import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(max_ttl=0)
+        cache.set("token", {"user_id": "u"})
+
+        assert cache.get("token") is None
+
+
+class TestJWTBackends:
+    """Test pluggable JWT backends."""
+
+    def test_jose_backend_round_trip(self):
+        """Tokens encoded by a backend verify with the same backend."""
+        from app.shared.auth.tokens import JoseBackend
+
+        backend = JoseBackend("secret", "HS256")
+        token = backend.encode({"user_id": "u1"})
+
+        assert backend.decode(token) == {"user_id": "u1"}
+
+    def test_bad_signature_raises_invalid_token(self):
+        """Tokens signed with another key are rejected."""
+        from app.shared.auth.tokens import InvalidToken, JoseBackend
+
+        token = JoseBackend("other-secret", "HS256").encode({"user_id": "u1"})
+
+        with pytest.raises(InvalidToken):
+            JoseBackend("secret", "HS256").decode(token)
+
+    def test_unknown_backend(self):
+        """Unknown backend names are rejected."""
+        from app.shared.auth.tokens import get_jwt_backend
+
+        with pytest.raises(ValueError):
+            get_jwt_backend("nope", "secret", "HS256")
+
+    def test_backend_must_implement_encode_and_decode(self):
+        """The base backend cannot be used on its own."""
+        from app.shared.auth.tokens import JWTBackend
+
+        with pytest.raises(TypeError):
+            JWTBackend("secret", "HS256")
+
+
+class TestPasswordHasher:
+    """Test bcrypt offloading, admission limits and rehash on login."""
+
+    @staticmethod
+    def cheap_hash(password: str) -> str:
+        """bcrypt hash at the minimum cost, i.e. outdated parameters."""
+        from passlib.hash import bcrypt
+
+        return bcrypt.using(rounds=4).hash(password)
+
+    @pytest.mark.asyncio
+    async def test_verify_runs_on_hashing_pool(self):
+        """Verification happens off the event loop thread."""
+        import threading
+        from unittest.mock import patch
+        from app.shared.auth.passwords import PasswordHasher
+
+        hasher = PasswordHasher(max_workers=1)
+        threads = []
+
+        def verify(password, password_hash):
+            threads.append(threading.current_thread().name)
+            return True
+
+        with patch("app.shared.auth.passwords.pwd_context") as mock_context:
+            mock_context.verify = verify
+            assert await hasher.verify("pw", "hash") is True
+
+        assert threads[0].startswith("password-hash")
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self):
+        """Logins beyond the running and queued limits fail fast."""
+        import asyncio
+        import threading
+        from app.shared.auth.passwords import PasswordHasher, PasswordHashingBusy
+
+        hasher = PasswordHasher(max_workers=1, max_queue=0)
+        release = threading.Event()
+        running = asyncio.ensure_future(hasher._run(release.wait))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(PasswordHashingBusy):
+            await hasher.verify("pw", "hash")
+
+        release.set()
+        await running
+        assert hasher.stats()["rejected"] == 1
+        hasher.shutdown()
+
+    def test_busy_pool_is_served_as_503(self):
+        """A saturated hashing pool becomes a retryable 503 on any route."""
+        from unittest.mock import AsyncMock, Mock, patch
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.shared.auth.passwords import PasswordHashingBusy
+        from app.shared.database.session import get_session
+
+        session = AsyncMock()
+        session.exec.return_value = Mock(first=Mock(return_value=Mock(password_hash="hash")))
+        app.dependency_overrides[get_session] = lambda: session
+        busy = AsyncMock(side_effect=PasswordHashingBusy("busy"))
+        try:
+            with patch("app.modules.auth.service.password_hasher.verify_and_update", busy):
+                response = TestClient(app).post(
+                    "/api/v1/auth/login",
+                    json={"email": "user@example.com", "password": "secret"},
+                )
+        finally:
+            app.dependency_overrides.pop(get_session, None)
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_outdated_hash_is_upgraded(self):
+        """A hash with a different bcrypt cost is re-hashed on successful verification."""
+        from app.shared.auth.passwords import PasswordHasher
+
+        hasher = PasswordHasher()
+        verified, new_hash = await hasher.verify_and_update("secret", self.cheap_hash("secret"))
+
+        assert verified is True
+        assert new_hash is not None and new_hash.startswith("$2b$12$")
+        hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_login_rehashes_stored_password(self):
+        """authenticate_user stores the upgraded hash."""
+        from unittest.mock import AsyncMock, Mock
+        from app.modules.auth.service import AuthService
+
+        user = Mock(password_hash=self.cheap_hash("secret"))
+        session = AsyncMock()
+        session.add = Mock()
+        session.exec.return_value = Mock(first=Mock(return_value=user))
+
+        result = await AuthService.authenticate_user(session, "user@example.com", "secret")
+
+        assert result is user
+        assert user.password_hash.startswith("$2b$12$")
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_login_with_wrong_password(self):
+        """Wrong passwords are rejected without touching the stored hash."""
+        from unittest.mock import AsyncMock, Mock
+        from app.modules.auth.service import AuthService
+
+        stored_hash = self.cheap_hash("secret")
+        user = Mock(password_hash=stored_hash)
+        session = AsyncMock()
+        session.exec.return_value = Mock(first=Mock(return_value=user))
+
+        result = await AuthService.authenticate_user(session, "user@example.com", "wrong")
+
+        assert result is None
+        assert user.password_hash == stored_hash
+        session.commit.assert_not_awaited()